@@ -0,0 +1,339 @@
+"""In-memory stand-in for the Mem0 REST API used by the benchmark harness.
+
+Only the endpoints the MCP server calls are implemented. Latency, error rate and memory size
+are configurable so benchmarks can model a slow or flaky upstream without a live account.
+`/_bench/stats` reports request counts and the time spent serving them, and `/_bench/ids`
+lists seeded memory ids.
+
+Run standalone with `python benchmarks/fake_mem0.py --port 8765 --latency-ms 50`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+# shared with the server; imported as a plain module so the fake never loads the server package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "mem0_mcp_server"))
+from scopes import SCOPE_FIELDS
+
+WORDS = [
+    "coffee", "tea", "travel", "paris", "tokyo", "python", "rust", "music", "jazz", "running",
+    "cycling", "pizza", "sushi", "dogs", "cats", "books", "chess", "hiking", "piano", "garden",
+    "movies", "beach", "winter", "summer", "family", "work", "meeting",
+]
+
+
+@dataclass
+class FakeSettings:
+    latency_ms: float = 20.0
+    jitter_ms: float = 5.0
+    error_rate: float = 0.0
+    payload_chars: int = 200
+    seed_memories: int = 500
+    seed_user: str = "bench-user"
+
+
+@dataclass
+class FakeStats:
+    requests: int = 0
+    errors: int = 0
+    service_seconds: float = 0.0
+    by_endpoint: Dict[str, int] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "service_seconds": self.service_seconds,
+                "by_endpoint": dict(self.by_endpoint),
+            }
+
+
+class FakeMem0:
+    def __init__(self, settings: FakeSettings, seed: int = 7) -> None:
+        self.settings = settings
+        self.stats = FakeStats()
+        self.memories: Dict[str, Dict[str, Any]] = {}
+        self._random = random.Random(seed)
+        for index in range(settings.seed_memories):
+            self._store(self._sentence(index), {"user_id": settings.seed_user})
+
+    # -- data -------------------------------------------------------------------------------
+
+    def _sentence(self, index: int) -> str:
+        words = [WORDS[(index * 7 + offset * 3) % len(WORDS)] for offset in range(6)]
+        text = f"memory {index}: " + " ".join(words)
+        if len(text) < self.settings.payload_chars:
+            filler = " ".join(self._random.choice(WORDS) for _ in range(self.settings.payload_chars))
+            text = (text + " " + filler)[: self.settings.payload_chars]
+        return text
+
+    def _store(self, text: str, scope: Dict[str, Any], metadata: Any = None) -> Dict[str, Any]:
+        memory_id = str(uuid.uuid4())
+        now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        memory = {
+            "id": memory_id,
+            "memory": text,
+            **{name: scope.get(name) for name in SCOPE_FIELDS},
+            "metadata": metadata,
+            "categories": ["benchmark"],
+            "hash": uuid.uuid4().hex,
+            "immutable": False,
+            "expiration_date": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.memories[memory_id] = memory
+        return memory
+
+    @staticmethod
+    def _matches(memory: Dict[str, Any], filters: Any) -> bool:
+        if not isinstance(filters, dict):
+            return True
+        for key, value in filters.items():
+            if key == "AND":
+                if not all(FakeMem0._matches(memory, clause) for clause in value):
+                    return False
+            elif key == "OR":
+                if not any(FakeMem0._matches(memory, clause) for clause in value):
+                    return False
+            elif key == "NOT":
+                if any(FakeMem0._matches(memory, clause) for clause in value):
+                    return False
+            elif key in SCOPE_FIELDS:
+                if value == "*":
+                    if memory.get(key) is None:
+                        return False
+                elif isinstance(value, dict) and "in" in value:
+                    if memory.get(key) not in value["in"]:
+                        return False
+                elif memory.get(key) != value:
+                    return False
+        return True
+
+    # -- request handling -------------------------------------------------------------------
+
+    async def _serve(self, request: Request, endpoint: str, handler) -> JSONResponse:
+        started = time.perf_counter()
+        settings = self.settings
+        delay = max(0.0, settings.latency_ms + self._random.uniform(-1, 1) * settings.jitter_ms)
+        await asyncio.sleep(delay / 1000)
+        failed = endpoint != "ping" and self._random.random() < settings.error_rate
+        if failed:
+            status = self._random.choice((429, 500, 503))
+            response = JSONResponse({"detail": "injected failure"}, status_code=status)
+        else:
+            body = await request.json() if request.method in ("POST", "PUT") else {}
+            response = await handler(request, body)
+        with self.stats.lock:
+            self.stats.requests += 1
+            self.stats.errors += int(failed)
+            self.stats.service_seconds += time.perf_counter() - started
+            self.stats.by_endpoint[endpoint] = self.stats.by_endpoint.get(endpoint, 0) + 1
+        return response
+
+    async def ping(self, request: Request, body: Any) -> JSONResponse:
+        return JSONResponse({"org_id": "bench-org", "project_id": "bench-project", "user_email": None})
+
+    async def add(self, request: Request, body: Dict[str, Any]) -> JSONResponse:
+        events = []
+        for message in body.get("messages", []):
+            memory = self._store(message.get("content", ""), body, body.get("metadata"))
+            events.append({"id": memory["id"], "event": "ADD", "memory": memory["memory"]})
+        return JSONResponse({"results": events})
+
+    async def search(self, request: Request, body: Dict[str, Any]) -> JSONResponse:
+        terms = set(str(body.get("query", "")).lower().split())
+        hits = []
+        for memory in self.memories.values():
+            if not self._matches(memory, body.get("filters")):
+                continue
+            overlap = len(terms & set(memory["memory"].lower().split()))
+            if overlap:
+                hits.append({**memory, "score": round(min(1.0, 0.3 + 0.1 * overlap), 4)})
+        hits.sort(key=lambda hit: -hit["score"])
+        return JSONResponse(hits[: int(body.get("limit") or 10)])
+
+    async def get_all(self, request: Request, body: Dict[str, Any]) -> JSONResponse:
+        matched = [m for m in self.memories.values() if self._matches(m, body.get("filters"))]
+        page = int(request.query_params.get("page", 1))
+        size = int(request.query_params.get("page_size", 100))
+        start = (page - 1) * size
+        return JSONResponse(
+            {
+                "count": len(matched),
+                "next": f"?page={page + 1}" if start + size < len(matched) else None,
+                "previous": None,
+                "results": matched[start : start + size],
+            }
+        )
+
+    async def memory(self, request: Request, body: Dict[str, Any]) -> JSONResponse:
+        memory_id = request.path_params["memory_id"]
+        memory = self.memories.get(memory_id)
+        if request.method == "DELETE":
+            self.memories.pop(memory_id, None)
+            return JSONResponse({"message": "Memory deleted successfully!"})
+        if memory is None:
+            return JSONResponse({"detail": "Memory not found"}, status_code=404)
+        if request.method == "PUT":
+            memory["memory"] = body.get("text", memory["memory"])
+            memory["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        return JSONResponse(memory)
+
+    async def delete_all(self, request: Request, body: Any) -> JSONResponse:
+        scope = {k: v for k, v in request.query_params.items() if k in SCOPE_FIELDS}
+        doomed = [
+            memory_id
+            for memory_id, memory in self.memories.items()
+            if scope and all(memory.get(k) == v for k, v in scope.items())
+        ]
+        for memory_id in doomed:
+            del self.memories[memory_id]
+        return JSONResponse({"message": "Memories deleted successfully!"})
+
+    async def entities(self, request: Request, body: Any) -> JSONResponse:
+        counts: Dict[tuple, int] = {}
+        for memory in self.memories.values():
+            for name in SCOPE_FIELDS:
+                if memory.get(name):
+                    key = (name[:-3], memory[name])
+                    counts[key] = counts.get(key, 0) + 1
+        return JSONResponse(
+            {
+                "results": [
+                    {"type": kind, "name": name, "total_memories": total}
+                    for (kind, name), total in sorted(counts.items())
+                ]
+            }
+        )
+
+    async def delete_entity(self, request: Request, body: Any) -> JSONResponse:
+        field_name = request.path_params["kind"] + "_id"
+        name = request.path_params["name"]
+        for memory_id in [k for k, m in self.memories.items() if m.get(field_name) == name]:
+            del self.memories[memory_id]
+        return JSONResponse({"message": "Entity deleted successfully."})
+
+    async def bench_stats(self, request: Request) -> JSONResponse:
+        return JSONResponse(self.stats.snapshot())
+
+    async def bench_ids(self, request: Request) -> JSONResponse:
+        user = request.query_params.get("user_id", self.settings.seed_user)
+        limit = int(request.query_params.get("limit", 1000))
+        ids = [k for k, m in self.memories.items() if m.get("user_id") == user][:limit]
+        return JSONResponse(ids)
+
+    def app(self) -> Starlette:
+        def route(path: str, endpoint: str, handler, methods: List[str]) -> Route:
+            async def serve(request: Request) -> JSONResponse:
+                return await self._serve(request, endpoint, handler)
+
+            return Route(path, serve, methods=methods)
+
+        return Starlette(
+            routes=[
+                route("/v1/ping/", "ping", self.ping, ["GET"]),
+                route("/v1/memories/", "add", self.add, ["POST"]),
+                route("/v1/memories/", "delete_all", self.delete_all, ["DELETE"]),
+                route("/v2/memories/search/", "search", self.search, ["POST"]),
+                route("/v2/memories/", "get_all", self.get_all, ["POST"]),
+                route(
+                    "/v1/memories/{memory_id}/", "memory", self.memory, ["GET", "PUT", "DELETE"]
+                ),
+                route("/v1/entities/", "entities", self.entities, ["GET"]),
+                route(
+                    "/v2/entities/{kind}/{name}/", "delete_entity", self.delete_entity, ["DELETE"]
+                ),
+                Route("/_bench/stats", self.bench_stats, methods=["GET"]),
+                Route("/_bench/ids", self.bench_ids, methods=["GET"]),
+            ]
+        )
+
+
+class FakeMem0Server:
+    """Run the fake in its own process so it does not compete with the client for the GIL."""
+
+    def __init__(self, settings: FakeSettings, host: str = "127.0.0.1") -> None:
+        self.settings = settings
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            port = sock.getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        self._args = [sys.executable, str(Path(__file__).resolve()), "--host", host]
+        self._args += ["--port", str(port)]
+        for name, value in asdict(settings).items():
+            self._args += [f"--{name.replace('_', '-')}", str(value)]
+        self._process: Optional[subprocess.Popen] = None
+
+    def start(self) -> FakeMem0Server:
+        self._process = subprocess.Popen(self._args)
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                httpx.get(f"{self.url}/_bench/stats").raise_for_status()
+                return self
+            except httpx.TransportError:
+                if time.monotonic() > deadline or self._process.poll() is not None:
+                    raise RuntimeError("fake Mem0 server did not start") from None
+                time.sleep(0.05)
+
+    async def stats(self) -> Dict[str, Any]:
+        async with httpx.AsyncClient() as client:
+            return (await client.get(f"{self.url}/_bench/stats")).json()
+
+    def memory_ids(self, limit: int = 1000) -> List[str]:
+        return httpx.get(f"{self.url}/_bench/ids", params={"limit": limit}).json()
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=FakeSettings.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=FakeSettings.jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=FakeSettings.error_rate)
+    parser.add_argument("--payload-chars", type=int, default=FakeSettings.payload_chars)
+    parser.add_argument("--seed-memories", type=int, default=FakeSettings.seed_memories)
+    parser.add_argument("--seed-user", default=FakeSettings.seed_user)
+    args = parser.parse_args()
+    fake = FakeMem0(
+        FakeSettings(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            payload_chars=args.payload_chars,
+            seed_memories=args.seed_memories,
+            seed_user=args.seed_user,
+        )
+    )
+    uvicorn.run(fake.app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
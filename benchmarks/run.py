@@ -0,0 +1,430 @@
+"""Benchmark every MCP tool against the fake Mem0 service over stdio and streamable-http.
+
+Examples:
+
+    python benchmarks/run.py
+    python benchmarks/run.py --transport http --concurrency 1 16 64 --requests 400
+    python benchmarks/run.py --latency-ms 80 --error-rate 0.05 --server-env MEM0_CACHE_TTL=0
+    python benchmarks/run.py --save benchmarks/baselines/local.json
+    python benchmarks/run.py --compare benchmarks/baselines/local.json --fail-on-regression
+
+For each transport, tool and concurrency level the harness reports throughput, p50/p95/p99
+latency and the mean local overhead per call: client-observed latency minus the time the fake
+spent serving that call's upstream requests (MCP transport, validation, caching, serialization).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
+
+import httpx
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from fake_mem0 import WORDS, FakeMem0Server, FakeSettings
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRATCH_USER = "bench-scratch"
+IMPORT_RECORDS = 10  # memories per import_memories file
+
+ArgsFactory = Callable[[int], Dict[str, Any]]
+
+# tools that only do real work under extra server settings; they run against a second server
+# started with these (before any --server-env overrides)
+TOOL_ENV: Dict[str, List[str]] = {"get_add_status": ["MEM0_ASYNC_WRITES=true"]}
+
+
+@dataclass
+class Result:
+    transport: str
+    tool: str
+    concurrency: int
+    calls: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    overhead_ms: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.transport}/{self.tool}/c{self.concurrency}"
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _query(i: int) -> str:
+    return f"{WORDS[i % len(WORDS)]} {WORDS[(i * 5 + 3) % len(WORDS)]}"
+
+
+def scenarios(ids: List[str], jobs: List[str], repeat_queries: bool) -> Dict[str, ArgsFactory]:
+    """Arguments for one call of each tool; `i` varies queries so the result cache is cold.
+
+    `jobs` is filled by `prepare` with the job ids of queued adds before get_add_status runs.
+    """
+
+    def q(i: int) -> str:
+        return _query(0 if repeat_queries else i)
+
+    def scratch(i: int) -> Dict[str, Any]:
+        return {"user_id": f"{SCRATCH_USER}-{i}"}
+
+    return {
+        "add_memory": lambda i: {"text": f"benchmark note {i} about {q(i)}"},
+        "add_memories": lambda i: {
+            "items": [{"text": f"batch note {i}.{j} about {q(i + j)}"} for j in range(10)]
+        },
+        "get_add_status": lambda i: {"job_id": jobs[i % len(jobs)]},
+        "search_memories": lambda i: {"query": q(i), "limit": 10},
+        "search_memories_batch": lambda i: {
+            "queries": [q(i), q(i + 1), q(i + 2)],
+            "limit": 10,
+        },
+        "get_memories": lambda i: {"page": 1 + i % 5, "page_size": 50},
+        "get_memory": lambda i: {"memory_id": ids[i % len(ids)]},
+        "update_memory": lambda i: {"memory_id": ids[i % len(ids)], "text": f"updated {i}"},
+        "update_memories": lambda i: {
+            "updates": [
+                {"memory_id": ids[(i * 10 + j) % len(ids)], "text": f"updated {i}.{j}"}
+                for j in range(10)
+            ]
+        },
+        "list_entities": lambda i: {},
+        "delete_memory": lambda i: {"memory_id": f"deleted-{i}"},
+        "delete_memories": lambda i: {"memory_ids": [f"deleted-{i}.{j}" for j in range(10)]},
+        "delete_all_memories": scratch,
+        "delete_entities": scratch,
+        # one file per call: concurrent transfers of the same file would share a checkpoint
+        "export_memories": lambda i: {"file_name": f"export-{i}.ndjson", "resume": False},
+        "import_memories": lambda i: {"file_name": f"import-{i}.ndjson", "resume": False},
+        "list_sessions": lambda i: {},
+    }
+
+
+def write_import_files(directory: Path, count: int) -> None:
+    """Write the NDJSON files the import_memories scenario reads, in export_memories' format."""
+
+    for i in range(count):
+        records = [
+            {
+                "id": f"import-{i}.{j}",
+                "memory": f"imported note {i}.{j} about {_query(i + j)}",
+                "user_id": f"{SCRATCH_USER}-import",
+                "created_at": "2024-01-01T00:00:00Z",
+            }
+            for j in range(IMPORT_RECORDS)
+        ]
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        (directory / f"import-{i}.ndjson").write_text(lines, encoding="utf-8")
+
+
+async def prepare(session: ClientSession, tools: List[str], requests: int, jobs: List[str]) -> None:
+    """Create what the selected tools look up: queued adds for get_add_status."""
+
+    if "get_add_status" not in tools:
+        return
+    results = await asyncio.gather(
+        *(session.call_tool("add_memory", {"text": f"queued note {i}"}) for i in range(requests))
+    )
+    jobs[:] = [
+        job_id
+        for result in results
+        if result.content and (job_id := json.loads(result.content[0].text).get("job_id"))
+    ]
+    if not jobs:
+        raise RuntimeError("add_memory queued nothing; get_add_status needs MEM0_ASYNC_WRITES")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _server_env(fake_url: str, transfer_dir: Path, extra: List[str]) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        {
+            "MEM0_API_KEY": "bench-key",
+            "MEM0_API_HOST": fake_url,
+            "MEM0_DEFAULT_USER_ID": "bench-user",
+            "MEM0_TELEMETRY": "False",
+            # the http transport waits for /metrics to answer before connecting
+            "MEM0_METRICS_ENABLED": "true",
+            "MEM0_TRANSFER_DIR": str(transfer_dir),
+            "PYTHONPATH": os.pathsep.join(
+                filter(None, [str(ROOT / "src"), env.get("PYTHONPATH")])
+            ),
+        }
+    )
+    for item in extra:
+        name, _, value = item.partition("=")
+        env[name] = value
+    return env
+
+
+@asynccontextmanager
+async def stdio_session(env: Dict[str, str]) -> AsyncIterator[ClientSession]:
+    params = StdioServerParameters(
+        command=sys.executable, args=["-m", "mem0_mcp_server.server"], env=env
+    )
+    with await asyncio.to_thread(open, os.devnull, "w") as devnull:
+        async with (
+            stdio_client(params, errlog=devnull) as (read, write),
+            ClientSession(read, write) as session,
+        ):
+            await session.initialize()
+            yield session
+
+
+@asynccontextmanager
+async def http_session(env: Dict[str, str]) -> AsyncIterator[ClientSession]:
+    port = _free_port()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "mem0_mcp_server.http_entry",
+        env={**env, "HOST": "127.0.0.1", "PORT": str(port)},
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        base = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 30
+        async with httpx.AsyncClient() as probe:
+            while True:
+                try:
+                    if (await probe.get(f"{base}/metrics")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline or process.returncode is not None:
+                    raise RuntimeError("streamable-http server did not come up")
+                await asyncio.sleep(0.1)
+        async with (
+            streamablehttp_client(f"{base}/mcp") as (read, write, _),
+            ClientSession(read, write) as session,
+        ):
+            await session.initialize()
+            yield session
+    finally:
+        if process.returncode is None:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=10)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+
+
+async def drive(
+    session: ClientSession,
+    fake: FakeMem0Server,
+    transport: str,
+    tool: str,
+    make_args: ArgsFactory,
+    concurrency: int,
+    requests: int,
+) -> Result:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            result = await session.call_tool(tool, make_args(i))
+            latencies.append(time.perf_counter() - started)
+            text = result.content[0].text if result.content else ""
+            if result.isError or text.startswith('{"error"'):
+                errors += 1
+
+    before = (await fake.stats())["service_seconds"]
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    upstream = (await fake.stats())["service_seconds"] - before
+    mean_latency = statistics.fmean(latencies)
+    return Result(
+        transport=transport,
+        tool=tool,
+        concurrency=concurrency,
+        calls=requests,
+        errors=errors,
+        throughput=round(requests / elapsed, 2),
+        p50_ms=round(_percentile(latencies, 50) * 1000, 3),
+        p95_ms=round(_percentile(latencies, 95) * 1000, 3),
+        p99_ms=round(_percentile(latencies, 99) * 1000, 3),
+        overhead_ms=round(max(0.0, mean_latency - upstream / requests) * 1000, 3),
+    )
+
+
+async def run(args: argparse.Namespace) -> List[Result]:
+    fake = FakeMem0Server(
+        FakeSettings(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            payload_chars=args.payload_chars,
+            seed_memories=args.seed_memories,
+        )
+    ).start()
+    results: List[Result] = []
+    transfer_dir = Path(tempfile.mkdtemp(prefix="mem0-bench-"))
+    try:
+        write_import_files(transfer_dir, args.requests)
+        jobs: List[str] = []
+        tools = scenarios(fake.memory_ids(), jobs, args.repeat_queries)
+        selected = args.tools or list(tools)
+        groups: Dict[Tuple[str, ...], List[str]] = {}
+        for tool in selected:
+            groups.setdefault(tuple(TOOL_ENV.get(tool, ())), []).append(tool)
+        sessions = {"stdio": stdio_session, "http": http_session}
+        for transport in args.transport:
+            for tool_env, group in groups.items():
+                env = _server_env(fake.url, transfer_dir, [*tool_env, *args.server_env])
+                async with sessions[transport](env) as session:
+                    await prepare(session, group, args.requests, jobs)
+                    for tool in group:
+                        for concurrency in args.concurrency:
+                            result = await drive(
+                                session,
+                                fake,
+                                transport,
+                                tool,
+                                tools[tool],
+                                concurrency,
+                                args.requests,
+                            )
+                            results.append(result)
+                            print(_row(result), flush=True)
+    finally:
+        fake.stop()
+        shutil.rmtree(transfer_dir, ignore_errors=True)
+    return results
+
+
+HEADER = (
+    f"{'transport':<9} {'tool':<22} {'conc':>4} {'calls':>5} {'err':>4} {'rps':>9} "
+    f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'local ms':>9}"
+)
+
+
+def _row(r: Result) -> str:
+    return (
+        f"{r.transport:<9} {r.tool:<22} {r.concurrency:>4} {r.calls:>5} {r.errors:>4} "
+        f"{r.throughput:>9.1f} {r.p50_ms:>9.2f} {r.p95_ms:>9.2f} {r.p99_ms:>9.2f} "
+        f"{r.overhead_ms:>9.2f}"
+    )
+
+
+# latency metrics regress upwards; throughput is checked separately and regresses downwards
+_LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "overhead_ms")
+_NOISE_MS = 0.5
+
+
+def compare(
+    results: List[Result], baseline: Dict[str, Any], threshold: float
+) -> List[Tuple[str, str, float, float]]:
+    """Return (key, metric, baseline, current) for every metric worse than the threshold."""
+
+    previous = baseline.get("results", {})
+    regressions = []
+    for result in results:
+        old = previous.get(result.key)
+        if old is None:
+            continue
+        current = asdict(result)
+        for metric in _LOWER_IS_BETTER:
+            worse = current[metric] - old[metric]
+            if current[metric] > old[metric] * (1 + threshold) and worse > _NOISE_MS:
+                regressions.append((result.key, metric, old[metric], current[metric]))
+        if current["throughput"] < old["throughput"] * (1 - threshold):
+            regressions.append((result.key, "throughput", old["throughput"], current["throughput"]))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0], formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--transport", nargs="+", choices=("stdio", "http"), default=["stdio", "http"]
+    )
+    parser.add_argument("--tools", nargs="+", help="Only benchmark these tools.")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=100, help="Calls per tool and level.")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--payload-chars", type=int, default=200)
+    parser.add_argument("--seed-memories", type=int, default=500)
+    parser.add_argument(
+        "--repeat-queries", action="store_true", help="Reuse one query so reads hit the cache."
+    )
+    parser.add_argument(
+        "--server-env", nargs="*", default=[], metavar="NAME=VALUE", help="Extra server env."
+    )
+    parser.add_argument("--save", type=Path, help="Write results to this baseline file.")
+    parser.add_argument("--compare", type=Path, help="Compare against this baseline file.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression ratio.")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    print(HEADER)
+    results = asyncio.run(run(args))
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "error_rate": args.error_rate,
+                "payload_chars": args.payload_chars,
+                "requests": args.requests,
+                "server_env": args.server_env,
+            },
+            "results": {result.key: asdict(result) for result in results},
+        }
+        args.save.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if not regressions:
+            print(f"\nNo regressions beyond {args.threshold:.0%} against {args.compare}")
+        else:
+            print(f"\nRegressions beyond {args.threshold:.0%} against {args.compare}:")
+            for key, metric, old, new in regressions:
+                print(f"  {key:<40} {metric:<12} {old:>10.2f} -> {new:>10.2f}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Measure the server's cold start over stdio: time to `initialize`, to `tools/list` and peak RSS.
+
+Examples:
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 20 --server-env MEM0_LOCAL_STORE=:memory:
+    python benchmarks/startup.py --save benchmarks/baselines/startup.json
+    python benchmarks/startup.py --compare benchmarks/baselines/startup.json --fail-on-regression
+
+Each run starts a fresh `python -m mem0_mcp_server.server` process and speaks JSON-RPC to it
+directly, so the client's own imports are not part of the measurement. No Mem0 request is made:
+the server must answer both calls before any tenant client exists.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+PROTOCOL_VERSION = "2025-06-18"
+
+# metric -> unit, all lower-is-better
+METRICS = {"initialize_ms": "ms", "list_tools_ms": "ms", "peak_rss_mb": "MB"}
+_NOISE = {"initialize_ms": 20.0, "list_tools_ms": 20.0, "peak_rss_mb": 2.0}
+
+
+def _server_env(extra: List[str]) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        {
+            "MEM0_API_KEY": "bench-key",
+            "MEM0_API_HOST": "http://127.0.0.1:9",  # never contacted
+            "MEM0_TELEMETRY": "False",
+            "PYTHONPATH": os.pathsep.join(
+                filter(None, [str(ROOT / "src"), env.get("PYTHONPATH")])
+            ),
+        }
+    )
+    for item in extra:
+        name, _, value = item.partition("=")
+        env[name] = value
+    return env
+
+
+def _send(process: subprocess.Popen, message: Dict[str, Any]) -> None:
+    assert process.stdin is not None
+    process.stdin.write((json.dumps(message) + "\n").encode())
+    process.stdin.flush()
+
+
+def _reply(process: subprocess.Popen, request_id: int) -> Dict[str, Any]:
+    assert process.stdout is not None
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("server exited before replying")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            if "error" in message:
+                raise RuntimeError(f"server returned an error: {message['error']}")
+            return message
+
+
+def measure(env: Dict[str, str]) -> Tuple[float, float, float, int]:
+    """One cold start: (ms to initialize, ms to tools/list, peak RSS in MB, tool count)."""
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "mem0_mcp_server.server"],
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _send(
+            process,
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": "startup-bench", "version": "0"},
+                },
+            },
+        )
+        _reply(process, 1)
+        initialized = time.perf_counter()
+        _send(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        _send(process, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools = _reply(process, 2)["result"]["tools"]
+        listed = time.perf_counter()
+    finally:
+        assert process.stdin is not None and process.stdout is not None
+        process.stdin.close()  # EOF on stdin stops the stdio server
+        process.stdout.close()
+        # wait4 rather than wait() to get the child's resource usage
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return (initialized - started) * 1000, (listed - started) * 1000, rss, len(tools)
+
+
+def summarize(samples: List[Tuple[float, float, float, int]]) -> Dict[str, Any]:
+    columns = list(zip(*samples))
+    summary: Dict[str, Any] = {"runs": len(samples), "tools": columns[3][0]}
+    for index, metric in enumerate(METRICS):
+        values = sorted(columns[index])
+        summary[metric] = {
+            "median": round(statistics.median(values), 2),
+            "min": round(values[0], 2),
+            "max": round(values[-1], 2),
+        }
+    return summary
+
+
+def compare(
+    summary: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[Tuple[str, float, float]]:
+    """Return (metric, baseline, current) for every median worse than the threshold."""
+
+    previous = baseline.get("results", {})
+    regressions = []
+    for metric in METRICS:
+        if metric not in previous:
+            continue
+        old, new = previous[metric]["median"], summary[metric]["median"]
+        if new > old * (1 + threshold) and new - old > _NOISE[metric]:
+            regressions.append((metric, old, new))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0], formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=10, help="Cold starts to measure.")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured starts first.")
+    parser.add_argument(
+        "--server-env", nargs="*", default=[], metavar="NAME=VALUE", help="Extra server env."
+    )
+    parser.add_argument("--save", type=Path, help="Write results to this baseline file.")
+    parser.add_argument("--compare", type=Path, help="Compare against this baseline file.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression ratio.")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    env = _server_env(args.server_env)
+    for _ in range(args.warmup):  # fills the OS page cache and __pycache__
+        measure(env)
+    samples = []
+    for run in range(1, args.runs + 1):
+        sample = measure(env)
+        samples.append(sample)
+        print(
+            f"run {run:>3}: initialize {sample[0]:8.1f} ms  list_tools {sample[1]:8.1f} ms  "
+            f"peak rss {sample[2]:6.1f} MB",
+            flush=True,
+        )
+    summary = summarize(samples)
+    print(f"\n{'metric':<14} {'median':>9} {'min':>9} {'max':>9}")
+    for metric, unit in METRICS.items():
+        values = summary[metric]
+        print(
+            f"{metric:<14} {values['median']:>9.1f} {values['min']:>9.1f} "
+            f"{values['max']:>9.1f} {unit}"
+        )
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "runs": args.runs,
+                "server_env": args.server_env,
+            },
+            "results": summary,
+        }
+        args.save.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        regressions = compare(summary, json.loads(args.compare.read_text()), args.threshold)
+        if not regressions:
+            print(f"\nNo regressions beyond {args.threshold:.0%} against {args.compare}")
+        else:
+            print(f"\nRegressions beyond {args.threshold:.0%} against {args.compare}:")
+            for metric, old, new in regressions:
+                print(f"  {metric:<14} {old:>10.1f} -> {new:>10.1f}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,8 +16,8 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 from pydantic_ai import Agent
-from pydantic_ai.messages import ModelMessage
 from pydantic_ai.mcp import MCPServerStdio, load_mcp_servers
+from pydantic_ai.messages import ModelMessage
 
 EXAMPLE_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = EXAMPLE_DIR.parent
@@ -113,7 +113,7 @@ def build_agent(server: MCPServerStdio) -> tuple[Agent, str]:
         "  1) Treat every new preference/fact/personal detail as durable—call add_memory right away (even if they never say “remember”) unless they opt out. "
         "When a new detail replaces an older one, summarize both so the latest truth is clear (e.g., “was planning Berlin; now relocating to San Francisco”).\n"
         "  2) Only run the search → list IDs → confirm → update/delete flow when the user references an existing memory or ambiguity would be risky.\n"
-        "  3) For get/show/list requests, use a single get_memories or search_memories call and expand synonyms yourself.\n"
+        "  3) For get/show/list requests, use a single get_memories call, or expand synonyms yourself and pass them together to search_memories_batch.\n"
         "  4) For destructive bulk actions (delete_all_memories, delete_entities) ask for scope once; if the user immediately confirms, execute without re-asking.\n"
         "  5) Keep graph opt-in only.\n"
         "Act decisively: remember the latest confirmation context so you can honor a follow-up “yes/confirm” without repeating questions, run the best-fit tool, mention what you ran, summarize the outcome naturally, and suggest one concise next step. "
@@ -134,23 +134,22 @@ async def chat_loop(agent: Agent, server: MCPServerStdio, model_name: str) -> No
     """Interactive REPL that streams requests through the agent."""
 
     message_history: list[ModelMessage] = []
-    async with server:
-        async with agent:
-            _print_banner(model_name)
-            while True:
-                try:
-                    user_input = input("You> ").strip()
-                except (EOFError, KeyboardInterrupt):
-                    print("\nBye!")
-                    return
-                if not user_input:
-                    continue
-                if user_input.lower() in {"exit", "quit"}:
-                    print("Bye!")
-                    return
-                result = await agent.run(user_input, message_history=message_history)
-                message_history.extend(result.new_messages())
-                print(f"\nAgent> {result.output}\n")
+    async with server, agent:
+        _print_banner(model_name)
+        while True:
+            try:
+                user_input = input("You> ").strip()
+            except (EOFError, KeyboardInterrupt):
+                print("\nBye!")
+                return
+            if not user_input:
+                continue
+            if user_input.lower() in {"exit", "quit"}:
+                print("Bye!")
+                return
+            result = await agent.run(user_input, message_history=message_history)
+            message_history.extend(result.new_messages())
+            print(f"\nAgent> {result.output}\n")
 
 
 async def main() -> None:
@@ -0,0 +1,249 @@
+"""Per-tenant admission control: token-bucket rate limits, concurrency caps and a fair queue."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+# call classes, cheapest first; a freed slot goes to the tenant's cheapest waiting call
+READ, WRITE, EXPENSIVE = 0, 1, 2
+
+_SWEEP_INTERVAL = 60.0
+
+
+@dataclass(frozen=True)
+class Limits:
+    """Admission limits applied to each tenant; zero disables a limit."""
+
+    rate: float = 0.0  # tokens refilled per second
+    burst: float = 0.0  # bucket size; defaults to one second of `rate` (at least 1 token)
+    concurrency: int = 0  # calls running at once
+    max_queue: int = 100  # calls waiting for a slot before new ones are refused
+    max_wait: float = 10.0  # seconds a call may wait for a slot
+
+    @property
+    def active(self) -> bool:
+        return self.rate > 0 or self.concurrency > 0
+
+    @property
+    def bucket(self) -> float:
+        return self.burst if self.burst > 0 else max(1.0, self.rate)
+
+    def tightened(self, **overrides: Optional[float]) -> Limits:
+        """Apply per-session overrides, which may only lower the configured limits."""
+
+        changes: Dict[str, Any] = {}
+        for name, value in overrides.items():
+            if value is None or value <= 0:
+                continue
+            current = getattr(self, name)
+            changes[name] = type(current)(value if current <= 0 else min(current, value))
+        return replace(self, **changes) if changes else self
+
+
+class Throttled(Exception):
+    """A call refused by admission control; `retry_after` is a hint in seconds."""
+
+    def __init__(self, reason: str, retry_after: float, detail: str) -> None:
+        super().__init__(detail)
+        self.reason = reason
+        self.retry_after = retry_after
+        self.detail = detail
+
+    def body(self) -> Dict[str, Any]:
+        return {
+            "error": "throttled",
+            "reason": self.reason,
+            "retry_after": round(self.retry_after, 2),
+            "detail": self.detail,
+        }
+
+
+@dataclass
+class _Tenant:
+    limits: Limits
+    tokens: float
+    updated: float
+    running: int = 0
+    waiters: List[Tuple[int, int, asyncio.Future[None]]] = field(default_factory=list)
+
+
+def _refill(state: _Tenant) -> float:
+    limits = state.limits
+    return limits.bucket / limits.rate if limits.rate > 0 else 0.0
+
+
+class AdmissionController:
+    """Admits tool calls per tenant.
+
+    A call first takes `cost` tokens from its tenant's bucket or is refused with the time
+    until enough have refilled. It then needs a slot: at most `limits.concurrency` calls per
+    tenant and `max_concurrent` calls overall run at once. Calls that find no slot wait in
+    their tenant's queue ordered by call class (reads before writes before adds and graph
+    calls), and tenants with waiting calls are served round-robin so a busy tenant cannot
+    starve the others. Single event loop only.
+    """
+
+    def __init__(self, limits: Limits, max_concurrent: int = 0) -> None:
+        self.limits = limits
+        self.max_concurrent = max_concurrent
+        self.admitted = 0
+        self.throttled = 0
+        self.queued = 0
+        self._tenants: Dict[str, _Tenant] = {}
+        self._turns: Deque[str] = deque()  # tenants with waiting calls, in serving order
+        self._running = 0
+        self._seq = itertools.count()
+        self._next_sweep = 0.0
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        tenant: str,
+        cost: float = 1.0,
+        priority: int = READ,
+        limits: Optional[Limits] = None,
+    ) -> AsyncIterator[None]:
+        limits = limits or self.limits
+        state = self._take_tokens(tenant, cost, limits)
+        if state.running >= limits.concurrency > 0 or not self._global_slot() or state.waiters:
+            await self._wait(tenant, state, priority, cost, limits)
+        else:
+            self._start(state)
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            state.running -= 1
+            self._running -= 1
+            self._dispatch()
+
+    def _take_tokens(self, tenant: str, cost: float, limits: Limits) -> _Tenant:
+        now = time.monotonic()
+        self._sweep(now)
+        state = self._tenants.get(tenant)
+        if state is None:
+            state = self._tenants[tenant] = _Tenant(limits, tokens=limits.bucket, updated=now)
+        state.limits = limits
+        if limits.rate <= 0:
+            return state
+        bucket = limits.bucket
+        cost = min(cost, bucket)
+        state.tokens = min(bucket, state.tokens + (now - state.updated) * limits.rate)
+        state.updated = now
+        if state.tokens < cost:
+            self.throttled += 1
+            raise Throttled(
+                "rate_limited",
+                (cost - state.tokens) / limits.rate,
+                f"Rate limit of {limits.rate:g} calls/s exceeded for this API key.",
+            )
+        state.tokens -= cost
+        return state
+
+    def _refund(self, state: _Tenant, cost: float, limits: Limits) -> None:
+        if limits.rate > 0:
+            state.tokens = min(limits.bucket, state.tokens + cost)
+
+    def _global_slot(self) -> bool:
+        return self.max_concurrent <= 0 or self._running < self.max_concurrent
+
+    def _start(self, state: _Tenant) -> None:
+        state.running += 1
+        self._running += 1
+
+    async def _wait(
+        self, tenant: str, state: _Tenant, priority: int, cost: float, limits: Limits
+    ) -> None:
+        if len(state.waiters) >= limits.max_queue:
+            self._refund(state, cost, limits)
+            self.throttled += 1
+            raise Throttled(
+                "queue_full",
+                1.0,
+                f"{len(state.waiters)} calls for this API key are already waiting.",
+            )
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._seq), future)
+        heapq.heappush(state.waiters, entry)
+        if tenant not in self._turns:
+            self._turns.append(tenant)
+        self.queued += 1
+        self._dispatch()  # a slot may be free behind waiters that already gave up
+        try:
+            await asyncio.wait_for(asyncio.shield(future), limits.max_wait)
+        except BaseException as exc:
+            if future.done() and not future.cancelled():
+                if isinstance(exc, asyncio.TimeoutError):
+                    return  # granted at the deadline; keep the slot
+                # granted while the caller was cancelled: hand the slot on
+                state.running -= 1
+                self._running -= 1
+                self._dispatch()
+                raise
+            future.cancel()
+            state.waiters.remove(entry)
+            heapq.heapify(state.waiters)
+            self._refund(state, cost, limits)
+            if isinstance(exc, asyncio.TimeoutError):
+                self.throttled += 1
+                raise Throttled(
+                    "queue_timeout",
+                    limits.max_wait,
+                    f"No free slot for this API key within {limits.max_wait:g}s.",
+                ) from None
+            raise
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiting calls, one per tenant per turn."""
+
+        idle_turns = 0
+        while self._turns and self._global_slot() and idle_turns < len(self._turns):
+            tenant = self._turns.popleft()
+            state = self._tenants.get(tenant)
+            if state is None:
+                continue
+            while state.waiters and state.waiters[0][2].done():
+                heapq.heappop(state.waiters)  # cancelled or timed out
+            if not state.waiters:
+                idle_turns = 0
+                continue
+            if state.running >= state.limits.concurrency > 0:
+                self._turns.append(tenant)
+                idle_turns += 1
+                continue
+            _, _, future = heapq.heappop(state.waiters)
+            self._start(state)
+            future.set_result(None)
+            idle_turns = 0
+            if state.waiters:
+                self._turns.append(tenant)
+
+    def _sweep(self, now: float) -> None:
+        # forget tenants with nothing running or queued and a refilled bucket
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + _SWEEP_INTERVAL
+        idle = [
+            tenant
+            for tenant, state in self._tenants.items()
+            if not state.running and not state.waiters and now - state.updated >= _refill(state)
+        ]
+        for tenant in idle:
+            del self._tenants[tenant]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tenants": len(self._tenants),
+            "running": self._running,
+            "waiting": sum(len(state.waiters) for state in self._tenants.values()),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "throttled": self.throttled,
+        }
@@ -0,0 +1,187 @@
+"""In-process LRU+TTL cache for read tool results with scope-aware invalidation."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+try:
+    from .scopes import ANY_SCOPE, SCOPE_FIELDS, Scope, fingerprint, tenant_of
+except ImportError:  # pragma: no cover - script execution
+    from scopes import ANY_SCOPE, SCOPE_FIELDS, Scope, fingerprint, tenant_of
+
+# Entries whose filters cannot be pinned to concrete scopes (wildcards, NOT clauses, ...) are
+# tagged with ANY_SCOPE and are invalidated by every write for the tenant.
+
+
+def scopes_from_filters(filters: Any, negated: bool = False) -> FrozenSet[Scope]:
+    """Collect the user/agent/app/run values a filter tree reads from."""
+
+    scopes: set[Scope] = set()
+    if isinstance(filters, list):
+        for item in filters:
+            scopes |= scopes_from_filters(item, negated)
+        return frozenset(scopes)
+    if not isinstance(filters, dict):
+        return frozenset()
+    for key, value in filters.items():
+        if key in ("AND", "OR"):
+            scopes |= scopes_from_filters(value, negated)
+        elif key == "NOT":
+            scopes |= scopes_from_filters(value, True)
+        elif key in SCOPE_FIELDS:
+            if negated:
+                scopes.add(ANY_SCOPE)
+            elif isinstance(value, str) and value != "*":
+                scopes.add((key, value))
+            elif isinstance(value, dict) and isinstance(value.get("in"), list) and len(value) == 1:
+                scopes.update((key, str(item)) for item in value["in"])
+            else:
+                scopes.add(ANY_SCOPE)
+    return frozenset(scopes)
+
+
+def scopes_from_ids(**ids: Optional[str]) -> FrozenSet[Scope]:
+    """Scopes touched by a write addressed with explicit user/agent/app/run ids."""
+
+    return frozenset((key, value) for key, value in ids.items() if key in SCOPE_FIELDS and value)
+
+
+def memories_in_result(result: Any) -> Iterable[Dict[str, Any]]:
+    items = result.get("results") if isinstance(result, dict) else result
+    if not isinstance(items, list):
+        return []
+    return [item for item in items if isinstance(item, dict) and item.get("id")]
+
+
+@dataclass
+class _Entry:
+    tenant: str
+    value: Any
+    expires_at: float
+    scopes: FrozenSet[Scope] = field(default_factory=frozenset)
+
+
+class ResultCache:
+    """LRU+TTL cache of upstream read results, keyed per tenant and canonical arguments.
+
+    Cached results are shared between callers and must be treated as read-only.
+
+    Every tenant carries a generation counter that is bumped on invalidation so a read that was
+    already in flight when a write landed does not repopulate the cache with stale data.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._memory_scopes: OrderedDict[Tuple[str, str], FrozenSet[Scope]] = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def make_key(self, api_key: str, tool: str, payload: Dict[str, Any]) -> str:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return f"{tenant_of(api_key)}:{tool}:{fingerprint(canonical)}"
+
+    def generation(self, api_key: str) -> int:
+        return self._generations.get(tenant_of(api_key), 0)
+
+    def get(self, key: str) -> Any:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(
+        self,
+        api_key: str,
+        key: str,
+        value: Any,
+        scopes: FrozenSet[Scope],
+        generation: Optional[int] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        tenant = tenant_of(api_key)
+        with self._lock:
+            if generation is not None and generation != self._generations.get(tenant, 0):
+                return
+            self._entries[key] = _Entry(tenant, value, time.monotonic() + self.ttl, scopes)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            for memory in memories_in_result(value):
+                memory_scopes = scopes_from_ids(**{f: memory.get(f) for f in SCOPE_FIELDS})
+                self._memory_scopes[(tenant, str(memory["id"]))] = memory_scopes
+                self._memory_scopes.move_to_end((tenant, str(memory["id"])))
+            while len(self._memory_scopes) > self.max_entries * 4:
+                self._memory_scopes.popitem(last=False)
+
+    def invalidate(self, api_key: str, scopes: Optional[FrozenSet[Scope]] = None) -> int:
+        """Drop entries for the tenant that read any of `scopes` (all entries when None)."""
+
+        tenant = tenant_of(api_key)
+        with self._lock:
+            self._generations[tenant] = self._generations.get(tenant, 0) + 1
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if entry.tenant == tenant
+                and (scopes is None or ANY_SCOPE in entry.scopes or entry.scopes & scopes)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def scopes_of(self, api_key: str, memory_id: str) -> Optional[FrozenSet[Scope]]:
+        """Scopes of a memory seen in a cached read, if any."""
+
+        with self._lock:
+            return self._memory_scopes.get((tenant_of(api_key), memory_id))
+
+    def invalidate_memory(self, api_key: str, memory_id: str) -> int:
+        """Drop entries affected by a write to one memory; unknown ids clear the tenant."""
+
+        with self._lock:
+            scopes = self._memory_scopes.pop((tenant_of(api_key), memory_id), None)
+        return self.invalidate(api_key, scopes or None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._memory_scopes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
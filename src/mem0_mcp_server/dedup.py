@@ -0,0 +1,149 @@
+"""Near-duplicate suppression for memory writes, over a bounded per-scope index of recent texts."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+try:
+    from .scopes import ScopeIndex, ScopeKey
+except ImportError:  # pragma: no cover - script execution
+    from scopes import ScopeIndex, ScopeKey
+
+SHINGLE = 5  # characters per shingle
+SKETCH = 128  # smallest shingle hashes kept per text (bottom-k MinHash)
+_PREVIEW = 200
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    """Casefold, drop punctuation and collapse whitespace."""
+
+    return _SPACE.sub(" ", _PUNCTUATION.sub(" ", text.casefold())).strip()
+
+
+def sketch(text: str) -> Tuple[FrozenSet[int], int]:
+    """Bottom-k MinHash sketch of a normalized text's character shingles, and the shingle count."""
+
+    if len(text) <= SHINGLE:
+        shingles = {hash(text)}
+    else:
+        shingles = {hash(text[i : i + SHINGLE]) for i in range(len(text) - SHINGLE + 1)}
+    if len(shingles) > SKETCH:
+        return frozenset(heapq.nsmallest(SKETCH, shingles)), len(shingles)
+    return frozenset(shingles), len(shingles)
+
+
+def similarity(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    """Jaccard similarity of two texts from their sketches; exact while both are complete."""
+
+    if len(a) < SKETCH and len(b) < SKETCH:
+        shared = len(a & b)
+        return shared / (len(a) + len(b) - shared)
+    # the k smallest hashes of the union are a uniform sample of it
+    union = heapq.nsmallest(SKETCH, a | b)
+    return sum(1 for h in union if h in a and h in b) / len(union)
+
+
+@dataclass
+class _Entry:
+    sketch: FrozenSet[int]
+    size: int
+    text: str
+    added: float
+
+
+@dataclass(frozen=True)
+class Duplicate:
+    """An earlier write in the same scope that a new one matched."""
+
+    similarity: float
+    text: str
+    age: float
+
+    def body(self) -> Dict[str, Any]:
+        return {
+            "status": "deduplicated",
+            "similarity": round(self.similarity, 3),
+            "duplicate_of": self.text,
+            "detail": f"Skipped: a near-identical memory was stored for this scope "
+            f"{self.age:.0f}s ago.",
+        }
+
+
+class DedupIndex(ScopeIndex[OrderedDict[int, _Entry]]):
+    """Recent write texts per tenant and scope, checked before each add.
+
+    A text whose estimated Jaccard similarity (over character shingles) to a text written in the
+    same scope within `window` seconds reaches `threshold` is reported as a duplicate; anything
+    else is recorded. Each scope keeps at most `max_entries` texts and at most `max_scopes`
+    scopes are kept, both evicting the least recently used. Single event loop only.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        window: float = 3600.0,
+        max_entries: int = 256,
+        max_scopes: int = 1024,
+    ) -> None:
+        super().__init__(max_scopes)
+        self.threshold = threshold
+        self.window = window
+        self.max_entries = max_entries
+        self.checked = 0
+        self.duplicates = 0
+        self._ids = itertools.count()
+
+    def check(
+        self, tenant: str, scope: ScopeKey, text: str
+    ) -> Tuple[Optional[Duplicate], Optional[int]]:
+        """Return the duplicate `text` matches, or record it and return its entry id."""
+
+        self.checked += 1
+        now = time.monotonic()
+        entries = self._get_or_create(tenant, scope, OrderedDict)
+        normalized = normalize(text)
+        signature, size = sketch(normalized)
+        best: Optional[Tuple[float, _Entry]] = None
+        for entry_id, entry in list(entries.items()):
+            if now - entry.added > self.window:
+                del entries[entry_id]
+                continue
+            # Jaccard can never exceed the ratio of the two shingle counts
+            if min(size, entry.size) < self.threshold * max(size, entry.size):
+                continue
+            score = similarity(signature, entry.sketch)
+            if score >= self.threshold and (best is None or score > best[0]):
+                best = (score, entry)
+        if best is not None:
+            self.duplicates += 1
+            score, entry = best
+            return Duplicate(score, entry.text, now - entry.added), None
+        entry_id = next(self._ids)
+        entries[entry_id] = _Entry(signature, size, text[:_PREVIEW], now)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return None, entry_id
+
+    def discard(self, tenant: str, scope: ScopeKey, entry_id: int) -> None:
+        """Forget a recorded text whose write did not go through."""
+
+        entries = self._scopes.get((tenant, scope))
+        if entries is not None:
+            entries.pop(entry_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scopes": len(self._scopes),
+            "entries": sum(len(entries) for entries in self._scopes.values()),
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+        }
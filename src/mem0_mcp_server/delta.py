@@ -0,0 +1,80 @@
+"""Delta ingestion for conversation histories: forward only the turns not ingested before."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from itertools import pairwise
+from typing import Any, Dict, List, Sequence
+
+try:
+    from .scopes import ScopeIndex, ScopeKey
+except ImportError:  # pragma: no cover - script execution
+    from scopes import ScopeIndex, ScopeKey
+
+_DIGEST = 16
+
+
+def turn_hashes(messages: Sequence[Dict[str, Any]]) -> List[bytes]:
+    """Rolling hash of every prefix: entry i covers messages[0..i]."""
+
+    hashes: List[bytes] = []
+    previous = b""
+    for message in messages:
+        turn = f"{message.get('role', '')}\0{message.get('content', '')}".encode()
+        previous = hashlib.blake2b(previous + turn, digest_size=_DIGEST).digest()
+        hashes.append(previous)
+    return hashes
+
+
+def chunked(turns: List[Dict[str, Any]], size: int) -> List[List[Dict[str, Any]]]:
+    """Split `turns` into the fewest chunks of at most `size`, as even as possible."""
+
+    if size <= 0 or len(turns) <= size:
+        return [turns]
+    count = -(-len(turns) // size)
+    bounds = [len(turns) * index // count for index in range(count + 1)]
+    return [turns[start:end] for start, end in pairwise(bounds)]
+
+
+class DeltaIndex(ScopeIndex[OrderedDict[bytes, int]]):
+    """Prefix hashes of the conversations already ingested, per tenant and scope.
+
+    `skip` returns how many leading turns of a history were ingested before: the longest prefix
+    whose rolling hash was recorded for that scope. Appending turns to a history therefore only
+    sends the new ones, and a history that diverges (an edited or dropped turn) is resent from
+    the first difference. Each scope keeps the hashes of its last `max_turns` ingested turns and
+    at most `max_scopes` scopes are kept, both evicting the oldest. Single event loop only.
+    """
+
+    def __init__(self, max_turns: int = 1000, max_scopes: int = 1024) -> None:
+        super().__init__(max_scopes)
+        self.max_turns = max_turns
+        self.skipped = 0
+
+    def skip(self, tenant: str, scope: ScopeKey, hashes: Sequence[bytes]) -> int:
+        known = self._get(tenant, scope)
+        if not known:
+            return 0
+        for length in range(len(hashes), 0, -1):
+            if known.get(hashes[length - 1]) == length:
+                self.skipped += length
+                return length
+        return 0
+
+    def record(self, tenant: str, scope: ScopeKey, hashes: Sequence[bytes]) -> None:
+        """Remember every prefix in `hashes` as ingested."""
+
+        known = self._get_or_create(tenant, scope, OrderedDict)
+        for length, digest in enumerate(hashes, 1):
+            known.pop(digest, None)
+            known[digest] = length
+        while len(known) > self.max_turns:
+            known.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scopes": len(self._scopes),
+            "turns": sum(len(known) for known in self._scopes.values()),
+            "skipped": self.skipped,
+        }
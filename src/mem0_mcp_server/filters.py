@@ -0,0 +1,207 @@
+"""Compiled Mem0 filters: parse, validate, scope and canonicalize AND/OR/NOT trees once.
+
+`compile_filters` turns a caller's filter dict into a `CompiledFilters`, the canonical dict sent
+to Mem0 that also carries a stable digest and the user/agent/app/run scopes it reads. Repeated
+filter shapes are served from a small LRU memo, so a hot filter is parsed only once.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
+
+try:
+    from .scopes import ANY_SCOPE, SCOPE_FIELDS, Scope, fingerprint
+    from .shaping import dumps
+except ImportError:  # pragma: no cover - script execution
+    from scopes import ANY_SCOPE, SCOPE_FIELDS, Scope, fingerprint
+    from shaping import dumps
+
+LOGICAL = ("AND", "OR", "NOT")
+OPERATORS = frozenset({"eq", "ne", "gt", "gte", "lt", "lte", "in", "nin", "contains", "icontains"})
+_LIST_OPERATORS = frozenset({"in", "nin"})
+_RANGE_OPERATORS = frozenset({"gt", "gte", "lt", "lte"})
+_TEXT_OPERATORS = frozenset({"contains", "icontains"})
+# fields whose object values are matched as-is instead of being read as operators
+_OPAQUE_FIELDS = frozenset({"metadata"})
+
+_MEMO_SIZE = 512
+
+
+class FilterError(ValueError):
+    """A filter Mem0 would reject, caught before any request is sent."""
+
+
+@dataclass(frozen=True)
+class Condition:
+    field: str
+    op: str
+    value: Any
+
+
+@dataclass(frozen=True)
+class Group:
+    op: str  # AND, OR or NOT
+    children: Tuple[Node, ...]
+
+
+Node = Union[Condition, Group]
+
+
+class CompiledFilters(Dict[str, Any]):
+    """Canonical filter dict as sent to Mem0, plus its digest and scopes. Treat as read-only."""
+
+    __slots__ = ("canonical", "digest", "scopes", "tree")
+
+    def __init__(self, tree: Group, canonical: str, scopes: FrozenSet[Scope]) -> None:
+        super().__init__(_render(tree))
+        self.tree = tree
+        self.canonical = canonical
+        self.digest = fingerprint(canonical)
+        self.scopes = scopes
+
+
+def _parse(value: Any, path: str) -> Node:
+    if not isinstance(value, dict) or not value:
+        raise FilterError(f"{path} must be a non-empty object.")
+    parts: List[Node] = []
+    for key, item in value.items():
+        if key in LOGICAL:
+            parts.append(_parse_group(key, item, f"{path}.{key}"))
+        else:
+            parts.extend(_parse_field(key, item, f"{path}.{key}"))
+    # sibling keys of one object are an implicit AND
+    return parts[0] if len(parts) == 1 else Group("AND", tuple(parts))
+
+
+def _parse_group(op: str, items: Any, path: str) -> Group:
+    if op == "NOT" and isinstance(items, dict):
+        items = [items]
+    if not isinstance(items, list) or not items:
+        raise FilterError(f"{path} must be a non-empty list of filters.")
+    return Group(op, tuple(_parse(item, f"{path}[{i}]") for i, item in enumerate(items)))
+
+
+def _parse_field(field: str, value: Any, path: str) -> List[Condition]:
+    if isinstance(value, dict) and field not in _OPAQUE_FIELDS:
+        if not value:
+            raise FilterError(f"{path} names no operator.")
+        return [_condition(field, op, operand, f"{path}.{op}") for op, operand in value.items()]
+    return [_condition(field, "eq", value, path)]
+
+
+def _condition(field: str, op: str, operand: Any, path: str) -> Condition:
+    if op not in OPERATORS:
+        raise FilterError(f"Unknown operator {op!r} at {path}; use one of {sorted(OPERATORS)}.")
+    if op in _LIST_OPERATORS and not isinstance(operand, list):
+        raise FilterError(f"{path} expects a list of values.")
+    if op in _RANGE_OPERATORS and (operand is None or isinstance(operand, (bool, dict, list))):
+        raise FilterError(f"{path} expects a number or a date string.")
+    if op in _TEXT_OPERATORS and not isinstance(operand, str):
+        raise FilterError(f"{path} expects a string.")
+    return Condition(field, op, operand)
+
+
+def _render(node: Node) -> Dict[str, Any]:
+    if isinstance(node, Group):
+        return {node.op: [_render(child) for child in node.children]}
+    if node.op == "eq" and not (isinstance(node.value, dict) and node.field not in _OPAQUE_FIELDS):
+        return {node.field: node.value}
+    return {node.field: {node.op: node.value}}
+
+
+def _canonical(group: Group) -> Tuple[Group, str, Dict[str, Node]]:
+    """Flatten nested AND/OR groups and order (and deduplicate) their children.
+
+    Returns the group, its canonical JSON text and its children keyed by their own text.
+    """
+
+    ordered: Dict[str, Node] = {}
+    for child in group.children:
+        if isinstance(child, Group):
+            child, text, grandchildren = _canonical(child)
+            if group.op != "NOT" and child.op == group.op:
+                ordered.update(grandchildren)
+                continue
+            ordered[text] = child
+        else:
+            ordered[dumps(_render(child), sort_keys=True)] = child
+    texts = sorted(ordered)
+    canonical = '{"' + group.op + '":[' + ",".join(texts) + "]}"
+    return Group(group.op, tuple(ordered[text] for text in texts)), canonical, ordered
+
+
+def _scoped_by(node: Node, field: str) -> bool:
+    """Whether `field` appears in the tree outside of any NOT."""
+
+    if isinstance(node, Condition):
+        return node.field == field
+    return node.op != "NOT" and any(_scoped_by(child, field) for child in node.children)
+
+
+def _scopes(node: Node, negated: bool = False) -> FrozenSet[Scope]:
+    """User/agent/app/run values a tree reads from; anything unpinnable is ANY_SCOPE."""
+
+    if isinstance(node, Group):
+        scopes: FrozenSet[Scope] = frozenset()
+        for child in node.children:
+            scopes |= _scopes(child, negated or node.op == "NOT")
+        return scopes
+    if node.field not in SCOPE_FIELDS:
+        return frozenset()
+    if negated:
+        return frozenset({ANY_SCOPE})
+    if node.op == "eq" and isinstance(node.value, str) and node.value != "*":
+        return frozenset({(node.field, node.value)})
+    if node.op == "in":
+        return frozenset(zip(repeat(node.field), map(str, node.value)))
+    return frozenset({ANY_SCOPE})
+
+
+_MEMO: OrderedDict[Tuple[str, str], CompiledFilters] = OrderedDict()
+_MEMO_LOCK = threading.Lock()
+
+
+def _compile(filters: Optional[Dict[str, Any]], default_user_id: str) -> CompiledFilters:
+    tree = _parse(filters, "filters") if filters else None
+    if tree is None or not _scoped_by(tree, "user_id"):
+        scope = Condition("user_id", "eq", default_user_id)
+        tree = scope if tree is None else Group("AND", (scope, tree))
+    if not (isinstance(tree, Group) and tree.op == "AND"):
+        tree = Group("AND", (tree,))
+    tree, canonical, _ = _canonical(tree)
+    return CompiledFilters(tree, canonical, _scopes(tree))
+
+
+def compile_filters(filters: Optional[Dict[str, Any]], default_user_id: str) -> CompiledFilters:
+    """Validate `filters`, add the default user_id unless the tree names one, and canonicalize.
+
+    Raises FilterError for malformed trees or unknown operators.
+    """
+
+    if isinstance(filters, CompiledFilters):
+        return filters
+    key = (dumps(filters, sort_keys=True) if filters else "", default_user_id)
+    with _MEMO_LOCK:
+        compiled = _MEMO.get(key)
+        if compiled is not None:
+            _MEMO.move_to_end(key)
+            return compiled
+    compiled = _compile(filters, default_user_id)
+    with _MEMO_LOCK:
+        _MEMO[key] = compiled
+        while len(_MEMO) > _MEMO_SIZE:
+            _MEMO.popitem(last=False)
+    return compiled
+
+
+def keyable(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """`payload` with compiled filters replaced by their digest, for building cache keys."""
+
+    filters = payload.get("filters")
+    if isinstance(filters, CompiledFilters):
+        return {**payload, "filters": filters.digest}
+    return payload
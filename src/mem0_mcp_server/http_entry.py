@@ -4,7 +4,28 @@ from __future__ import annotations
 
 import os
 
-from .server import create_server
+import anyio
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from .metrics import REGISTRY
+from .server import create_server, describe_sessions, serve
+
+# Prometheus scrape endpoint (unauthenticated, so off by default); labels carry tool/method/status
+# only, never API keys or user ids
+ENV_METRICS_ENABLED = os.getenv("MEM0_METRICS_ENABLED", "false").lower() in {"1", "true", "yes"}
+# per-session usage of every tenant (tenant fingerprints, never keys or user ids); off by default
+ENV_SESSIONS_ENDPOINT = os.getenv("MEM0_SESSIONS_ENDPOINT", "false").lower() in {"1", "true", "yes"}
+
+
+async def metrics(request: Request) -> Response:
+    # collectors read the local store, whose lock must not be taken on the event loop
+    body = await anyio.to_thread.run_sync(REGISTRY.render)
+    return Response(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+async def sessions(request: Request) -> Response:
+    return JSONResponse({"sessions": describe_sessions()})
 
 
 def main() -> None:
@@ -12,7 +33,11 @@ def main() -> None:
     # Ensure runtime overrides are respected if Smithery injects a different port/host.
     server.settings.host = os.getenv("HOST", server.settings.host)
     server.settings.port = int(os.getenv("PORT", server.settings.port))
-    server.run(transport="streamable-http")
+    if ENV_METRICS_ENABLED:
+        server.custom_route("/metrics", methods=["GET"])(metrics)
+    if ENV_SESSIONS_ENDPOINT:
+        server.custom_route("/debug/sessions", methods=["GET"])(sessions)
+    anyio.run(serve, server, "streamable-http")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,312 @@
+"""Write-behind ingestion queue so add_memory can return before Mem0 finishes extraction."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+try:
+    from .scopes import fingerprint, tenant_of
+except ImportError:  # pragma: no cover - script execution
+    from scopes import fingerprint, tenant_of
+
+logger = logging.getLogger("mem0_mcp_server.ingest")
+
+Submit = Callable[[str, List[Dict[str, Any]], Dict[str, Any]], Awaitable[Any]]
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the queue stays full past the enqueue timeout."""
+
+
+@dataclass
+class IngestJob:
+    id: str
+    tenant: str
+    group: str
+    conversation: List[Dict[str, Any]]
+    payload: Dict[str, Any]
+    status: str = "queued"
+    attempts: int = 0
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    coalesced_with: int = 0
+    result: Any = None
+    error: Any = None
+    _api_key: str = field(default="", repr=False)
+    _on_success: Optional[Callable[[], None]] = field(default=None, repr=False)
+    _on_failure: Optional[Callable[[], None]] = field(default=None, repr=False)
+
+    def describe(self) -> Dict[str, Any]:
+        body: Dict[str, Any] = {
+            "job_id": self.id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+        if self.coalesced_with:
+            body["coalesced_with"] = self.coalesced_with
+        if self.result is not None:
+            body["result"] = self.result
+        if self.error is not None:
+            body["error"] = self.error
+        return body
+
+
+class IngestQueue:
+    """Bounded queue of add requests flushed by background workers.
+
+    Jobs that share a tenant and an identical add payload (same scope ids, metadata and
+    flags) form a group; a worker sends up to `coalesce_max` queued jobs from one group as a
+    single `add` call. A group is only ever handled by one worker at a time so writes to a
+    scope keep their order. Transient failures are retried with jittered exponential backoff.
+    A job runs the `on_success` or `on_failure` callback it was queued with once it is settled.
+    """
+
+    def __init__(
+        self,
+        submit: Submit,
+        max_size: int = 1000,
+        workers: int = 4,
+        coalesce_max: int = 20,
+        max_attempts: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        enqueue_timeout: float = 5.0,
+        retryable: Callable[[BaseException], bool] = lambda exc: False,
+        error_body: Callable[[BaseException], Any] = str,
+        keep_finished: int = 10000,
+    ) -> None:
+        self.max_size = max_size
+        self.workers = workers
+        self.coalesce_max = max(1, coalesce_max)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.enqueue_timeout = enqueue_timeout
+        self._submit = submit
+        self._retryable = retryable
+        self._error_body = error_body
+        self._keep_finished = keep_finished
+        self._groups: OrderedDict[str, Deque[IngestJob]] = OrderedDict()
+        self._busy_groups: Set[str] = set()
+        self._jobs: OrderedDict[str, IngestJob] = OrderedDict()
+        self._size = 0
+        self._in_flight = 0
+        self._cond: Optional[asyncio.Condition] = None
+        self._tasks: List[asyncio.Task[None]] = []
+        self._closing = False
+        self.enqueued = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def _ensure_workers(self) -> None:
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker(), name="mem0-ingest"))
+
+    async def enqueue(
+        self,
+        api_key: str,
+        conversation: List[Dict[str, Any]],
+        payload: Dict[str, Any],
+        on_success: Optional[Callable[[], None]] = None,
+        on_failure: Optional[Callable[[], None]] = None,
+    ) -> IngestJob:
+        """Queue an add, waiting up to `enqueue_timeout` for room before raising QueueFullError."""
+
+        if self._closing:
+            raise QueueFullError("ingestion queue is shutting down")
+        tenant = tenant_of(api_key)
+        group = tenant + ":" + fingerprint(json.dumps(payload, sort_keys=True, default=str))
+        job = IngestJob(
+            id=uuid.uuid4().hex,
+            tenant=tenant,
+            group=group,
+            conversation=list(conversation),
+            payload=dict(payload),
+            _api_key=api_key,
+            _on_success=on_success,
+            _on_failure=on_failure,
+        )
+        cond = self._condition()
+        async with cond:
+            try:
+                await asyncio.wait_for(
+                    cond.wait_for(lambda: self._size < self.max_size or self._closing),
+                    timeout=self.enqueue_timeout,
+                )
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise QueueFullError(
+                    f"ingestion queue is full ({self.max_size} pending writes)"
+                ) from None
+            if self._closing:
+                raise QueueFullError("ingestion queue is shutting down")
+            self._groups.setdefault(group, deque()).append(job)
+            self._size += 1
+            self.enqueued += 1
+            self._remember(job)
+            cond.notify_all()
+        self._ensure_workers()
+        return job
+
+    def job(self, api_key: str, job_id: str) -> Optional[IngestJob]:
+        """Look up a job; jobs are only visible to the tenant that queued them."""
+
+        job = self._jobs.get(job_id)
+        if job is None or job.tenant != tenant_of(api_key):
+            return None
+        return job
+
+    def _remember(self, job: IngestJob) -> None:
+        self._jobs[job.id] = job
+        while len(self._jobs) > self._keep_finished + self.max_size:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.finished_at is None:
+                break
+            del self._jobs[oldest_id]
+
+    def _take_batch(self) -> Optional[List[IngestJob]]:
+        for group, jobs in self._groups.items():
+            if group in self._busy_groups:
+                continue
+            batch = [jobs.popleft() for _ in range(min(len(jobs), self.coalesce_max))]
+            if jobs:
+                self._groups.move_to_end(group)
+            else:
+                del self._groups[group]
+            self._busy_groups.add(group)
+            self._size -= len(batch)
+            self._in_flight += len(batch)
+            return batch
+        return None
+
+    async def _worker(self) -> None:
+        cond = self._condition()
+        while True:
+            async with cond:
+                batch = self._take_batch()
+                while batch is None:
+                    if self._closing and not self._groups:
+                        return
+                    await cond.wait()
+                    batch = self._take_batch()
+                cond.notify_all()  # room freed for blocked producers
+            try:
+                await self._flush(batch)
+            finally:
+                async with cond:
+                    self._busy_groups.discard(batch[0].group)
+                    self._in_flight -= len(batch)
+                    cond.notify_all()
+
+    async def _flush(self, batch: List[IngestJob]) -> None:
+        head = batch[0]
+        conversation = [message for job in batch for message in job.conversation]
+        for job in batch:
+            job.status = "running"
+            job.coalesced_with = len(batch) - 1
+        if len(batch) > 1:
+            self.coalesced += len(batch) - 1
+        attempt = 0
+        while True:
+            attempt += 1
+            for job in batch:
+                job.attempts = attempt
+            try:
+                result = await self._submit(head._api_key, conversation, head.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - any failure fails or retries the batch
+                if attempt < self.max_attempts and self._retryable(exc):
+                    self.retries += 1
+                    delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                    logger.warning(
+                        "Queued add failed (attempt %d/%d), retrying within %.2fs: %s",
+                        attempt,
+                        self.max_attempts,
+                        delay,
+                        exc,
+                    )
+                    await asyncio.sleep(random.uniform(0, delay))
+                    continue
+                for job in batch:
+                    if job._on_failure is not None:
+                        job._on_failure()
+                self._finish(batch, "failed", error=self._error_body(exc))
+                self.failed += len(batch)
+                return
+            for job in batch:
+                if job._on_success is not None:
+                    job._on_success()
+            self._finish(batch, "succeeded", result=result)
+            self.completed += len(batch)
+            return
+
+    @staticmethod
+    def _finish(batch: List[IngestJob], status: str, result: Any = None, error: Any = None) -> None:
+        finished = time.time()
+        for job in batch:
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = finished
+            job.conversation = []
+            job._api_key = ""
+            job._on_success = job._on_failure = None
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting jobs, flush what is queued and stop the workers.
+
+        Returns False when the timeout expired with writes still pending.
+        """
+
+        self._closing = True
+        if self._cond is None:
+            return True
+        cond = self._cond
+        async with cond:
+            cond.notify_all()
+        if self._groups:
+            self._ensure_workers()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*self._tasks, return_exceptions=True), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error("Ingestion queue drain timed out with %d writes pending", self._size)
+            for task in self._tasks:
+                task.cancel()
+            return False
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._size,
+            "in_flight": self._in_flight,
+            "max_size": self.max_size,
+            "workers": len([task for task in self._tasks if not task.done()]),
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,364 @@
+"""Prometheus text-format metrics for tool calls and upstream Mem0 requests.
+
+Labels are limited to tool names, client method names and HTTP status codes, so nothing
+tenant-specific (API keys, user ids) ever reaches the exposition.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+Labels = Tuple[str, ...]
+M = TypeVar("M", bound="_Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, values: Sequence[str]) -> Labels:
+        if len(values) != len(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(values)}")
+        return tuple(str(value) for value in values)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: bucket counts (non-cumulative, last slot is +Inf), sum
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(c), t[0])) for key, (c, t) in self._values.items())
+        lines = self.header()
+        for key, (counts, total) in items:
+            labels = _format_labels(self.labels, key)
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {running}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {running}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Dict[str, Tuple[str, float]]]] = []
+
+    def register(self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collect: Callable[[], Dict[str, Tuple[str, float]]]) -> None:
+        """Register a callback returning `{name: (help, value)}` gauges read at scrape time."""
+
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            for name, (help, value) in sorted(collect().items()):
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+TOOL_REQUESTS = REGISTRY.register(
+    Counter("mem0_mcp_tool_requests_total", "Tool calls by outcome.", ("tool", "outcome"))
+)
+TOOL_DURATION = REGISTRY.register(
+    Histogram("mem0_mcp_tool_duration_seconds", "Wall time of a tool call.", ("tool",))
+)
+TOOL_LOCAL_DURATION = REGISTRY.register(
+    Histogram(
+        "mem0_mcp_tool_local_seconds",
+        "Part of a tool call spent outside upstream Mem0 requests (validation, filter "
+        "rewriting, caching, serialization).",
+        ("tool",),
+    )
+)
+TOOL_IN_FLIGHT = REGISTRY.register(
+    Gauge("mem0_mcp_tool_in_flight", "Tool calls currently running.", ("tool",))
+)
+RESPONSE_BYTES = REGISTRY.register(
+    Histogram(
+        "mem0_mcp_response_bytes", "Size of tool responses in bytes.", ("tool",), SIZE_BUCKETS
+    )
+)
+UPSTREAM_DURATION = REGISTRY.register(
+    Histogram(
+        "mem0_mcp_upstream_duration_seconds",
+        "Latency of upstream Mem0 requests.",
+        ("tool", "method"),
+    )
+)
+UPSTREAM_IN_FLIGHT = REGISTRY.register(
+    Gauge("mem0_mcp_upstream_in_flight", "Upstream Mem0 requests in flight.", ("method",))
+)
+COALESCED_REQUESTS = REGISTRY.register(
+    Counter(
+        "mem0_mcp_coalesced_requests_total",
+        "Reads that joined an identical in-flight upstream request instead of sending their own.",
+        ("tool", "method"),
+    )
+)
+UPSTREAM_RETRIES = REGISTRY.register(
+    Counter(
+        "mem0_mcp_upstream_retries_total",
+        "Upstream reads retried after a transient failure.",
+        ("tool", "method"),
+    )
+)
+HEDGED_REQUESTS = REGISTRY.register(
+    Counter(
+        "mem0_mcp_hedged_requests_total",
+        "Second copies of slow upstream reads sent to cut tail latency.",
+        ("tool", "method"),
+    )
+)
+BREAKER_REJECTIONS = REGISTRY.register(
+    Counter(
+        "mem0_mcp_breaker_rejections_total",
+        "Upstream requests refused locally because the tenant's circuit breaker was open.",
+        ("tool",),
+    )
+)
+DEDUPLICATED_WRITES = REGISTRY.register(
+    Counter(
+        "mem0_mcp_deduplicated_writes_total",
+        "Adds skipped as near-duplicates of a recent write to the same scope.",
+        ("tool",),
+    )
+)
+UPSTREAM_ERRORS = REGISTRY.register(
+    Counter(
+        "mem0_mcp_upstream_errors_total",
+        "Failed upstream Mem0 requests by HTTP status (`network` when none was received).",
+        ("tool", "status"),
+    )
+)
+
+
+class _Call:
+    """Per-tool-call bookkeeping of the wall time during which upstream requests were open."""
+
+    def __init__(self, tool: str) -> None:
+        self.tool = tool
+        self.upstream = 0.0
+        self.outcome = "ok"
+        self.finished = False
+        self._open = 0
+        self._since = 0.0
+
+    def enter(self) -> None:
+        if self._open == 0:
+            self._since = time.perf_counter()
+        self._open += 1
+
+    def leave(self) -> None:
+        self._open -= 1
+        if self._open == 0 and not self.finished:
+            self.upstream += time.perf_counter() - self._since
+
+
+_CURRENT: contextvars.ContextVar[Optional[_Call]] = contextvars.ContextVar(
+    "mem0_mcp_call", default=None
+)
+
+
+def current_tool() -> str:
+    call = _CURRENT.get()
+    return call.tool if call is not None else "none"
+
+
+def set_outcome(outcome: str) -> None:
+    """Record how the current tool call ended when it answers without raising (`ok` otherwise)."""
+
+    call = _CURRENT.get()
+    if call is not None:
+        call.outcome = outcome
+
+
+@contextmanager
+def tool_call(tool: str) -> Iterator[_Call]:
+    """Time a tool call; upstream requests made inside it are attributed to `tool`."""
+
+    call = _Call(tool)
+    token = _CURRENT.set(call)
+    TOOL_IN_FLIGHT.inc(tool)
+    started = time.perf_counter()
+    outcome = "exception"
+    try:
+        yield call
+        outcome = call.outcome
+    finally:
+        elapsed = time.perf_counter() - started
+        if call._open:  # requests still open (e.g. prefetch) count as upstream until now
+            call.upstream += time.perf_counter() - call._since
+        call.finished = True
+        _CURRENT.reset(token)
+        TOOL_IN_FLIGHT.dec(tool)
+        TOOL_REQUESTS.inc(tool, outcome)
+        TOOL_DURATION.observe(tool, value=elapsed)
+        TOOL_LOCAL_DURATION.observe(tool, value=max(0.0, elapsed - call.upstream))
+
+
+@contextmanager
+def background(task: str) -> Iterator[None]:
+    """Attribute upstream requests made by background work (queues, reconciliation) to `task`."""
+
+    token = _CURRENT.set(_Call(task))
+    try:
+        yield
+    finally:
+        _CURRENT.reset(token)
+
+
+@contextmanager
+def upstream_request(method: str) -> Iterator[None]:
+    call = _CURRENT.get()
+    tool = call.tool if call is not None else "none"
+    if call is not None:
+        call.enter()
+    UPSTREAM_IN_FLIGHT.inc(method)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        UPSTREAM_DURATION.observe(tool, method, value=time.perf_counter() - started)
+        UPSTREAM_IN_FLIGHT.dec(method)
+        if call is not None:
+            call.leave()
+
+
+def record_error(status: Optional[int]) -> None:
+    UPSTREAM_ERRORS.inc(current_tool(), str(status) if status else "network")
+
+
+@contextmanager
+def coalesced_request(method: str) -> Iterator[None]:
+    """Wait on a read another call sent; the shared request's time counts as upstream time."""
+
+    COALESCED_REQUESTS.inc(current_tool(), method)
+    call = _CURRENT.get()
+    if call is not None:
+        call.enter()
+    try:
+        yield
+    finally:
+        if call is not None:
+            call.leave()
+
+
+def record_retry(method: str) -> None:
+    UPSTREAM_RETRIES.inc(current_tool(), method)
+
+
+def record_hedge(method: str) -> None:
+    HEDGED_REQUESTS.inc(current_tool(), method)
+
+
+def record_rejected() -> None:
+    BREAKER_REJECTIONS.inc(current_tool())
+
+
+def record_deduplicated() -> None:
+    DEDUPLICATED_WRITES.inc(current_tool())
+
+
+def record_response(tool: str, body: str) -> None:
+    RESPONSE_BYTES.observe(tool, value=len(body.encode("utf-8")))
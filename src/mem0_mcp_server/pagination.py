@@ -0,0 +1,177 @@
+"""Cursor-based pagination with background page prefetch for get_memories."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    from .scopes import tenant_of
+except ImportError:  # pragma: no cover - script execution
+    from scopes import tenant_of
+
+FetchPage = Callable[[int], Awaitable[Any]]
+
+
+def _items(result: Any) -> List[Any]:
+    items = result.get("results") if isinstance(result, dict) else result
+    return items if isinstance(items, list) else []
+
+
+def has_more(result: Any, page: int, page_size: int) -> bool:
+    """Whether another page follows, using `next`/`count` when Mem0 returns them."""
+
+    if isinstance(result, dict):
+        if "next" in result:
+            return bool(result["next"])
+        count = result.get("count")
+        if isinstance(count, int):
+            return page * page_size < count
+    return len(_items(result)) >= page_size
+
+
+def _silence(task: asyncio.Task[Any]) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+@dataclass
+class PageStream:
+    id: str
+    tenant: str
+    request: Dict[str, Any]
+    fetch: FetchPage
+    pages: Dict[int, asyncio.Task[Any]] = field(default_factory=dict)
+    touched: float = field(default_factory=time.monotonic)
+
+    def cancel(self) -> None:
+        for task in self.pages.values():
+            task.cancel()
+        self.pages.clear()
+
+
+class PageCursors:
+    """Opaque cursors over a fixed get_memories request, prefetching the next pages.
+
+    A cursor names a stream, a page and optionally how many leading items of that page were
+    already returned (`<stream>.<page>[.<skip>]`), so replaying one is idempotent.
+    At most `max_streams` streams are kept (LRU, `ttl` seconds idle) and each holds at most
+    `depth` prefetched pages, which bounds memory regardless of the scope size.
+    """
+
+    def __init__(self, max_streams: int = 256, ttl: float = 300.0, depth: int = 1) -> None:
+        self.max_streams = max_streams
+        self.ttl = ttl
+        self.depth = depth
+        self.prefetched = 0
+        self.prefetch_hits = 0
+        self._streams: OrderedDict[str, PageStream] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, api_key: str, request: Dict[str, Any], fetch: FetchPage) -> PageStream:
+        stream = PageStream(secrets.token_urlsafe(12), tenant_of(api_key), dict(request), fetch)
+        with self._lock:
+            self._expire()
+            self._streams[stream.id] = stream
+            while len(self._streams) > self.max_streams:
+                _, evicted = self._streams.popitem(last=False)
+                evicted.cancel()
+        return stream
+
+    def resolve(self, api_key: str, cursor: str) -> Optional[Tuple[PageStream, int, int]]:
+        """Map a cursor to (stream, page, skip); None when unknown, expired or foreign."""
+
+        parts = cursor.split(".")
+        if len(parts) not in (2, 3) or not all(part.isdigit() for part in parts[1:]):
+            return None
+        stream_id, page = parts[0], parts[1]
+        skip = int(parts[2]) if len(parts) == 3 else 0
+        with self._lock:
+            self._expire()
+            stream = self._streams.get(stream_id)
+            if stream is None or stream.tenant != tenant_of(api_key):
+                return None
+            self._streams.move_to_end(stream_id)
+            stream.touched = time.monotonic()
+        return stream, int(page), skip
+
+    @staticmethod
+    def cursor(stream_id: str, page: int, skip: int = 0) -> str:
+        return f"{stream_id}.{page}.{skip}" if skip else f"{stream_id}.{page}"
+
+    async def page(self, stream: PageStream, page: int) -> Any:
+        """Return a page, from the prefetch buffer when it was already requested."""
+
+        task = stream.pages.pop(page, None)
+        if task is not None:
+            self.prefetch_hits += 1
+            return await task
+        return await stream.fetch(page)
+
+    def prefetch(self, stream: PageStream, after_page: int) -> None:
+        """Start fetching the `depth` pages after `after_page` in the background."""
+
+        for stale in [p for p in stream.pages if p <= after_page]:
+            stream.pages.pop(stale).cancel()
+        for page in range(after_page + 1, after_page + 1 + self.depth):
+            if page not in stream.pages:
+                task = asyncio.ensure_future(stream.fetch(page))
+                task.add_done_callback(_silence)
+                stream.pages[page] = task
+                self.prefetched += 1
+
+    def _expire(self) -> None:
+        # caller holds the lock
+        cutoff = time.monotonic() - self.ttl
+        while self._streams:
+            stream_id, stream = next(iter(self._streams.items()))
+            if stream.touched >= cutoff:
+                break
+            del self._streams[stream_id]
+            stream.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "streams": len(self._streams),
+            "buffered_pages": sum(len(s.pages) for s in self._streams.values()),
+            "prefetched": self.prefetched,
+            "prefetch_hits": self.prefetch_hits,
+        }
+
+
+async def collect_pages(
+    fetch: FetchPage,
+    page_size: int,
+    max_items: int,
+    concurrency: int = 4,
+    start_page: int = 1,
+) -> AsyncGenerator[Tuple[int, Any], None]:
+    """Yield `(page, result)` in page order until `max_items` are covered or pages run out.
+
+    The first page is fetched alone to learn `count`; later pages are fetched `concurrency` at a
+    time, so at most that many pages are held in memory beyond what the caller keeps.
+    """
+
+    first = await fetch(start_page)
+    yield start_page, first
+    if not has_more(first, start_page, page_size):
+        return
+    last_page = start_page + math.ceil(max_items / page_size) - 1
+    count = first.get("count") if isinstance(first, dict) else None
+    if isinstance(count, int):
+        last_page = min(last_page, math.ceil(count / page_size))
+    page = start_page + 1
+    while page <= last_page:
+        window = list(range(page, min(page + concurrency, last_page + 1)))
+        results = await asyncio.gather(*(fetch(p) for p in window))
+        for window_page, result in zip(window, results):
+            yield window_page, result
+            if not has_more(result, window_page, page_size):
+                return
+        page = window[-1] + 1
@@ -0,0 +1,178 @@
+"""Merging and re-ranking helpers for search results."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+FUSION_METHODS = ("rrf", "max")
+RRF_K = 60
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN = re.compile(r"\w+")
+
+
+def result_items(result: Any) -> List[Dict[str, Any]]:
+    """Return the memory dicts from a search/get_all response (list or {"results": [...]})."""
+
+    items = result.get("results") if isinstance(result, dict) else result
+    if not isinstance(items, list):
+        return []
+    return [item for item in items if isinstance(item, dict)]
+
+
+def _memory_key(item: Dict[str, Any]) -> str:
+    return str(item.get("id") or item.get("memory") or json.dumps(item, sort_keys=True))
+
+
+def fuse_results(
+    ranked: Sequence[Sequence[Dict[str, Any]]],
+    queries: Sequence[str],
+    method: str = "rrf",
+    limit: int | None = None,
+    rrf_k: int = RRF_K,
+) -> List[Dict[str, Any]]:
+    """Merge per-query hit lists by memory id into one ranked list.
+
+    `rrf` sums 1 / (rrf_k + rank) over the queries that returned a memory, so memories found by
+    several phrasings float up. `max` keeps each memory's best upstream score. The fused value
+    replaces `score` and the originating queries are listed in `matched_queries`.
+    """
+
+    if method not in FUSION_METHODS:
+        raise ValueError(f"fusion must be one of {FUSION_METHODS}, got {method!r}")
+    merged: Dict[str, Dict[str, Any]] = {}
+    fused: Dict[str, float] = {}
+    first_seen: Dict[str, int] = {}
+    for query, items in zip(queries, ranked):
+        for rank, item in enumerate(items, start=1):
+            key = _memory_key(item)
+            if key not in merged:
+                merged[key] = {**item, "matched_queries": []}
+                first_seen[key] = len(first_seen)
+                fused[key] = 0.0
+            merged[key]["matched_queries"].append(query)
+            if method == "rrf":
+                fused[key] += 1.0 / (rrf_k + rank)
+            else:
+                score = item.get("score")
+                fused[key] = max(fused[key], float(score) if score is not None else 0.0)
+    order = sorted(merged, key=lambda key: (-fused[key], first_seen[key]))
+    if limit is not None:
+        order = order[:limit]
+    return [{**merged[key], "score": round(fused[key], 6)} for key in order]
+
+
+def merge_relations(results: Sequence[Any]) -> List[Any]:
+    """Union graph relations from several responses, dropping exact duplicates."""
+
+    seen: set[str] = set()
+    relations: List[Any] = []
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        for relation in result.get("relations") or []:
+            key = json.dumps(relation, sort_keys=True, default=str)
+            if key not in seen:
+                seen.add(key)
+                relations.append(relation)
+    return relations
+
+
+def _tokens(text: Any) -> List[str]:
+    return _TOKEN.findall(str(text or "").casefold())
+
+
+def _term_counts(docs: List[List[str]]) -> tuple[np.ndarray, Dict[str, int]]:
+    """Document-term count matrix over the documents' own vocabulary."""
+
+    import numpy as np
+
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    for row, tokens in enumerate(docs):
+        for token in tokens:
+            rows.append(row)
+            cols.append(vocabulary.setdefault(token, len(vocabulary)))
+    counts = np.zeros((len(docs), max(1, len(vocabulary))))
+    np.add.at(counts, (rows, cols), 1.0)
+    return counts, vocabulary
+
+
+def _bm25(counts: np.ndarray, vocabulary: Dict[str, int], query: List[str]) -> np.ndarray:
+    """BM25 of every document for `query`, using the candidates themselves as the corpus."""
+
+    import numpy as np
+
+    columns = [vocabulary[term] for term in dict.fromkeys(query) if term in vocabulary]
+    if not columns:
+        return np.zeros(counts.shape[0])
+    tf = counts[:, columns]
+    lengths = counts.sum(axis=1, keepdims=True)
+    avg_length = max(float(lengths.mean()), 1.0)
+    df = (tf > 0).sum(axis=0)
+    idf = np.log1p((len(counts) - df + 0.5) / (df + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / avg_length)
+    scores: np.ndarray = (idf * tf * (BM25_K1 + 1) / (tf + norm)).sum(axis=1)
+    return scores
+
+
+def _unit(values: np.ndarray) -> np.ndarray:
+    """Scale to [0, 1] by the maximum; all-equal or all-zero inputs become zeros or ones."""
+
+    import numpy as np
+
+    low, high = float(values.min()), float(values.max())
+    if high - low < 1e-12:
+        return np.ones_like(values) if high > 0 else np.zeros_like(values)
+    return (values - low) / (high - low)
+
+
+def rerank(
+    query: str,
+    items: Sequence[Dict[str, Any]],
+    limit: int,
+    lexical_weight: float = 0.3,
+    diversity: float = 0.3,
+) -> List[Dict[str, Any]]:
+    """Re-score search hits with BM25 over their texts and pick `limit` of them by MMR.
+
+    Relevance blends the upstream vector score with the BM25 score of `query` over the
+    candidates' texts (both scaled to [0, 1]; `lexical_weight` is BM25's share). Results are
+    then chosen greedily by maximal marginal relevance: relevance minus `diversity` times the
+    highest cosine similarity (over term counts) to a result already chosen, so near-identical
+    memories do not crowd out the rest. The blended relevance replaces `score`.
+    """
+
+    import numpy as np
+
+    if not items or limit <= 0:
+        return []
+    docs = [_tokens(item.get("memory")) for item in items]
+    counts, vocabulary = _term_counts(docs)
+    upstream = np.array([float(item.get("score") or 0.0) for item in items])
+    lexical = _unit(_bm25(counts, vocabulary, _tokens(query)))
+    relevance = (1 - lexical_weight) * _unit(upstream) + lexical_weight * lexical
+
+    norms = np.linalg.norm(counts, axis=1, keepdims=True)
+    vectors = counts / np.where(norms > 0, norms, 1.0)
+    similarity = vectors @ vectors.T
+
+    chosen: List[int] = []
+    closest = np.zeros(len(items))  # highest similarity to any chosen result
+    available = np.ones(len(items), dtype=bool)
+    for _ in range(min(limit, len(items))):
+        marginal = (1 - diversity) * relevance - diversity * closest
+        best = int(np.argmax(np.where(available, marginal, -np.inf)))
+        chosen.append(best)
+        available[best] = False
+        closest = np.maximum(closest, similarity[best])
+    return [{**items[index], "score": round(float(relevance[index]), 6)} for index in chosen]
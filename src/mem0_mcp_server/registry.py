@@ -0,0 +1,252 @@
+"""Bounded registry of per-tenant Mem0 clients with pooled HTTP connections."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+try:
+    from .scopes import tenant_of
+except ImportError:  # pragma: no cover - script execution
+    from scopes import tenant_of
+
+if TYPE_CHECKING:  # importing mem0 is slow; build_client does it on the first client
+    from mem0 import AsyncMemoryClient
+
+logger = logging.getLogger("mem0_mcp_server.registry")
+
+
+@dataclass
+class PoolSettings:
+    """HTTP pool configuration applied to every tenant's client."""
+
+    max_connections: int = 100
+    max_keepalive: int = 20
+    keepalive_expiry: float = 30.0
+    timeout: float = 300.0
+    host: Optional[str] = None  # Mem0 API base URL; the client default when None
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+def build_client(api_key: str, pool: PoolSettings) -> AsyncMemoryClient:
+    """Construct a tenant client. Blocking: AsyncMemoryClient pings the API synchronously."""
+
+    from mem0 import AsyncMemoryClient
+
+    http_client = httpx.AsyncClient(limits=pool.limits(), timeout=pool.timeout)
+    return AsyncMemoryClient(api_key=api_key, host=pool.host, client=http_client)
+
+
+@dataclass
+class _Entry:
+    client: Optional[AsyncMemoryClient] = None
+    ready: Optional[asyncio.Future[AsyncMemoryClient]] = None
+    last_used: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    retired: bool = False
+    closed: bool = False
+
+
+class ClientRegistry:
+    """LRU + idle-time bounded map from API key to a shared AsyncMemoryClient.
+
+    Keys are stored as fingerprints, never raw. Each key is built at most once even when the
+    first calls race; evicted clients are closed as soon as their last in-flight lease ends.
+    """
+
+    def __init__(
+        self,
+        run_blocking: Callable[..., Awaitable[Any]],
+        pool: Optional[PoolSettings] = None,
+        max_clients: int = 256,
+        idle_ttl: float = 900.0,
+        factory: Callable[[str, PoolSettings], AsyncMemoryClient] = build_client,
+    ) -> None:
+        self.pool = pool or PoolSettings()
+        self.max_clients = max_clients
+        self.idle_ttl = idle_ttl
+        self._run_blocking = run_blocking
+        self._factory = factory
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._retiring: List[_Entry] = []
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+        self.builds = 0
+        self.build_failures = 0
+        self.evictions = 0
+
+    async def _acquire(self, api_key: str) -> _Entry:
+        """Return the tenant's entry with a lease taken, constructing the client once if needed."""
+
+        key = tenant_of(api_key)
+        while True:
+            to_close = self._sweep()
+            with self._lock:
+                entry = self._entries.get(key)
+                owner = entry is None
+                if entry is None:
+                    entry = _Entry(ready=asyncio.get_running_loop().create_future())
+                    self._entries[key] = entry
+                    to_close.extend(self._evict_overflow())
+                else:
+                    self._entries.move_to_end(key)
+                entry.last_used = time.monotonic()
+                if entry.client is not None:
+                    entry.in_flight += 1
+            await self._close_all(to_close)
+            if entry.client is not None:
+                return entry
+            assert entry.ready is not None
+            if owner:
+                break
+            await asyncio.shield(entry.ready)
+            with self._lock:
+                if not entry.closed:
+                    entry.in_flight += 1
+                    return entry
+            # evicted and closed before this waiter resumed; look the key up again
+
+        try:
+            client = await self._run_blocking(self._factory, api_key, self.pool)
+        except BaseException as exc:
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                if entry in self._retiring:
+                    self._retiring.remove(entry)
+                self.build_failures += 1
+            if isinstance(exc, asyncio.CancelledError):
+                entry.ready.cancel()
+            else:
+                entry.ready.set_exception(exc)
+                entry.ready.exception()  # mark retrieved when nobody else was waiting
+            raise
+        with self._lock:
+            entry.client = client
+            entry.in_flight += 1
+            self.builds += 1
+        entry.ready.set_result(client)
+        return entry
+
+    async def _release(self, entry: _Entry) -> None:
+        with self._lock:
+            entry.in_flight -= 1
+            entry.last_used = time.monotonic()
+        await self._close_all(self._drain_retiring())
+
+    @asynccontextmanager
+    async def lease(self, api_key: str) -> AsyncIterator[AsyncMemoryClient]:
+        """Borrow the tenant's client; eviction waits for outstanding leases before closing."""
+
+        entry = await self._acquire(api_key)
+        assert entry.client is not None
+        try:
+            yield entry.client
+        finally:
+            await self._release(entry)
+
+    def _retire(self, entry: _Entry) -> None:
+        entry.retired = True
+        self.evictions += 1
+        self._retiring.append(entry)
+
+    def _evict_overflow(self) -> List[_Entry]:
+        # caller holds the lock
+        while len(self._entries) > self.max_clients:
+            _, entry = self._entries.popitem(last=False)
+            self._retire(entry)
+        return self._drain_retiring(locked=True)
+
+    def _sweep(self) -> List[_Entry]:
+        now = time.monotonic()
+        if self.idle_ttl <= 0 or now < self._next_sweep:
+            return []
+        self._next_sweep = now + min(self.idle_ttl, 1.0)
+        cutoff = now - self.idle_ttl
+        with self._lock:
+            idle = [
+                key
+                for key, entry in self._entries.items()
+                if entry.client is not None and entry.in_flight == 0 and entry.last_used < cutoff
+            ]
+            for key in idle:
+                self._retire(self._entries.pop(key))
+            return self._drain_retiring(locked=True)
+
+    def _drain_retiring(self, locked: bool = False) -> List[_Entry]:
+        if not locked:
+            with self._lock:
+                return self._drain_retiring(locked=True)
+        closable = [e for e in self._retiring if e.client is not None and e.in_flight == 0]
+        self._retiring = [e for e in self._retiring if e not in closable]
+        for entry in closable:
+            entry.closed = True
+        return closable
+
+    async def _close_all(self, entries: List[_Entry]) -> None:
+        for entry in entries:
+            assert entry.client is not None
+            try:
+                await entry.client.async_client.aclose()
+            except Exception as exc:  # noqa: BLE001  # pragma: no cover - best effort cleanup
+                logger.warning("Failed to close evicted Mem0 client: %s", exc)
+
+    async def aclose(self) -> None:
+        """Close every client, e.g. on server shutdown."""
+
+        with self._lock:
+            entries = [e for e in self._entries.values() if e.client is not None]
+            entries.extend(e for e in self._retiring if e.client is not None)
+            self._entries.clear()
+            self._retiring.clear()
+            for entry in entries:
+                entry.closed = True
+        await self._close_all(entries)
+
+    @staticmethod
+    def _pool_usage(client: AsyncMemoryClient) -> tuple[int, int]:
+        pool = getattr(getattr(client.async_client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return len(connections), idle
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            live = [e for e in self._entries.values() if e.client is not None]
+            pending = len(self._entries) - len(live)
+            retiring = len(self._retiring)
+            in_flight = sum(e.in_flight for e in self._entries.values())
+        connections = idle = 0
+        for entry in live:
+            assert entry.client is not None
+            total, free = self._pool_usage(entry.client)
+            connections += total
+            idle += free
+        return {
+            "live_clients": len(live),
+            "pending_clients": pending,
+            "retiring_clients": retiring,
+            "max_clients": self.max_clients,
+            "builds": self.builds,
+            "build_failures": self.build_failures,
+            "evictions": self.evictions,
+            "in_flight": in_flight,
+            "pool_connections": connections,
+            "pool_idle_connections": idle,
+            "pool_active_connections": connections - idle,
+            "pool_max_connections_per_client": self.pool.max_connections,
+        }
@@ -0,0 +1,206 @@
+"""Upstream resilience: attempt timeouts, jittered retries, per-tenant breakers and hedged reads."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+
+logger = logging.getLogger("mem0_mcp_server.resilience")
+
+T = TypeVar("T")
+Call = Callable[[], Awaitable[T]]
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of calling Mem0 while the tenant's circuit breaker is open.
+
+    A transport error, so callers treat it like Mem0 being unreachable.
+    """
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(
+            f"Mem0 keeps failing for this API key; calls paused for {retry_after:.1f}s."
+        )
+        self.status: Optional[int] = None
+        self.payload = {"error": "circuit_open", "retry_after": round(retry_after, 1)}
+
+
+def parse_timeouts(text: str) -> Dict[str, float]:
+    """Parse `tool=seconds` pairs separated by commas, e.g. `search_memories=5,get_memories=15`."""
+
+    timeouts: Dict[str, float] = {}
+    for pair in text.split(","):
+        if not pair.strip():
+            continue
+        name, sep, seconds = pair.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Expected tool=seconds, got {pair.strip()!r}")
+        timeouts[name.strip()] = float(seconds)
+    return timeouts
+
+
+async def with_timeout(call: Awaitable[T], timeout: Optional[float]) -> T:
+    """Await `call`, turning an expired `timeout` into an httpx timeout like the client's own."""
+
+    if not timeout or timeout <= 0:
+        return await call
+    try:
+        return await asyncio.wait_for(call, timeout)
+    except asyncio.TimeoutError:
+        raise httpx.TimeoutException(f"No response from Mem0 within {timeout:g}s") from None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """`attempts` tries in total, sleeping a full-jitter exponential backoff in between."""
+
+    attempts: int = 1
+    backoff: float = 0.2
+    max_backoff: float = 2.0
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+
+async def retrying(
+    call: Call[T],
+    policy: RetryPolicy,
+    retryable: Callable[[BaseException], bool],
+    on_retry: Optional[Callable[[int, float, BaseException], None]] = None,
+) -> T:
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return await call()
+        except Exception as exc:
+            if attempt >= policy.attempts or not retryable(exc):
+                raise
+            delay = policy.delay(attempt)
+            if on_retry is not None:
+                on_retry(attempt, delay, exc)
+            await asyncio.sleep(delay)
+
+
+async def hedged(call: Call[T], after: float, on_hedge: Optional[Callable[[], None]] = None) -> T:
+    """Run `call`; if it has not finished after `after` seconds, race a second copy of it.
+
+    The first copy to succeed wins and the other is cancelled. When both fail, the error of the
+    last one to fail is raised.
+    """
+
+    first = asyncio.ensure_future(call())
+    try:
+        return await asyncio.wait_for(asyncio.shield(first), after)
+    except asyncio.TimeoutError:
+        pass
+    except BaseException:
+        first.cancel()
+        raise
+    if on_hedge is not None:
+        on_hedge()
+    pending = {first, asyncio.ensure_future(call())}
+    try:
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    return task.result()
+                if not pending:
+                    raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+@dataclass
+class _Breaker:
+    failures: int = 0
+    opened_at: Optional[float] = None
+    probe_since: Optional[float] = None
+
+
+class CircuitBreakers:
+    """Per-tenant circuit breakers over upstream attempts.
+
+    `threshold` consecutive transient failures open a tenant's breaker: its calls then fail
+    fast with CircuitOpenError for `cooldown` seconds. After that a single probe is let
+    through (half-open); its success closes the breaker and its failure re-opens it. A probe
+    that never reports back is replaced after another cooldown. A threshold of 0 disables the
+    breakers.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.opened = 0
+        self.rejected = 0
+        self._breakers: Dict[str, _Breaker] = {}
+        self._lock = threading.Lock()
+
+    def check(self, tenant: str) -> None:
+        """Raise CircuitOpenError unless a request for `tenant` may go out now."""
+
+        if self.threshold <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            breaker = self._breakers.get(tenant)
+            if breaker is None or breaker.opened_at is None:
+                return
+            waited = now - breaker.opened_at
+            probe_stale = breaker.probe_since is None or now - breaker.probe_since >= self.cooldown
+            if waited >= self.cooldown and probe_stale:
+                breaker.probe_since = now
+                return
+            self.rejected += 1
+            retry_after = max(0.0, self.cooldown - waited)
+        raise CircuitOpenError(retry_after)
+
+    def record(self, tenant: str, ok: bool) -> None:
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            breaker = self._breakers.get(tenant)
+            if ok:
+                if breaker is not None:
+                    if breaker.opened_at is not None:
+                        logger.info("Circuit for tenant %s closed", tenant[:8])
+                    del self._breakers[tenant]
+                return
+            if breaker is None:
+                breaker = self._breakers[tenant] = _Breaker()
+            breaker.failures += 1
+            if breaker.opened_at is not None:
+                if breaker.probe_since is not None:  # the half-open probe failed
+                    breaker.opened_at = time.monotonic()
+                    breaker.probe_since = None
+                return
+            if breaker.failures >= self.threshold:
+                breaker.opened_at = time.monotonic()
+                self.opened += 1
+                logger.warning(
+                    "Circuit for tenant %s opened after %d consecutive failures; pausing %.0fs",
+                    tenant[:8],
+                    breaker.failures,
+                    self.cooldown,
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            open_now = sum(1 for b in self._breakers.values() if b.opened_at is not None)
+        return {
+            "threshold": self.threshold,
+            "cooldown": self.cooldown,
+            "open": open_now,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
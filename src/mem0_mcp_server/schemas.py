@@ -23,6 +23,27 @@ class ConfigSchema(BaseModel):
     enable_graph_default: Optional[bool] = Field(
         None, description="Default enable_graph toggle when clients omit the flag."
     )
+    async_writes: Optional[bool] = Field(
+        None, description="Queue add_memory writes in the background and return a job id."
+    )
+    dedup_writes: Optional[bool] = Field(
+        None, description="Skip adds that nearly repeat a memory recently stored in the same scope."
+    )
+    delta_messages: Optional[bool] = Field(
+        None, description="Send only the turns of a `messages` history not already stored."
+    )
+    compact_responses: Optional[bool] = Field(
+        None, description="Return only essential memory fields unless a tool call asks otherwise."
+    )
+    rate_limit: Optional[float] = Field(
+        None, description="Tool calls per second for this API key; can only lower the server's."
+    )
+    rate_burst: Optional[float] = Field(
+        None, description="Burst size of the rate limit; can only lower the server's."
+    )
+    max_concurrency: Optional[int] = Field(
+        None, description="Concurrent tool calls for this API key; can only lower the server's."
+    )
 
 
 class AddMemoryArgs(BaseModel):
@@ -67,6 +88,12 @@ class GetMemoriesArgs(BaseModel):
     enable_graph: Optional[bool] = Field(
         None, description="Set True only when the user wants graph knowledge."
     )
+    cursor: Optional[str] = Field(
+        None, description="next_cursor from a previous call; continues that listing."
+    )
+    max_items: Optional[int] = Field(
+        None, description="Collect up to this many memories across pages in one call."
+    )
 
 
 class DeleteAllArgs(BaseModel):
@@ -78,6 +105,11 @@ class DeleteAllArgs(BaseModel):
     run_id: Optional[str] = Field(None, description="Optional run scope filter.")
 
 
+class MemoryUpdate(BaseModel):
+    memory_id: str = Field(..., description="Exact memory_id to overwrite.")
+    text: str = Field(..., description="Replacement text for the memory.")
+
+
 class DeleteEntitiesArgs(BaseModel):
     user_id: Optional[str] = Field(None, description="Delete this user and all related memories.")
     agent_id: Optional[str] = Field(None, description="Delete this agent and its memories.")
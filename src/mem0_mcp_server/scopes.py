@@ -0,0 +1,73 @@
+"""Tenant and scope helpers shared by the server's caches and indexes."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+SCOPE_FIELDS = ("user_id", "agent_id", "app_id", "run_id")
+ScopeKey = Tuple[Optional[str], ...]  # one value (or None) per SCOPE_FIELDS entry
+# A scope is a (field, value) pair such as ("user_id", "alice"); ANY_SCOPE stands for reads that
+# cannot be pinned to concrete scopes
+Scope = Tuple[str, str]
+ANY_SCOPE: Scope = ("*", "*")
+
+V = TypeVar("V")
+
+
+def fingerprint(value: str) -> str:
+    """Short stable digest of a string, for cache keys and tenant ids."""
+
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+def tenant_of(api_key: str) -> str:
+    """The tenant an API key belongs to; indexes hold this instead of the key."""
+
+    return fingerprint(api_key)
+
+
+def scope_of(payload: Dict[str, Any]) -> ScopeKey:
+    return tuple(payload.get(field) or None for field in SCOPE_FIELDS)
+
+
+class ScopeIndex(Generic[V]):
+    """Per-tenant, per-scope entries, keeping the `max_scopes` most recently used scopes."""
+
+    def __init__(self, max_scopes: int = 1024) -> None:
+        self.max_scopes = max_scopes
+        self._scopes: OrderedDict[Tuple[str, ScopeKey], V] = OrderedDict()
+
+    def _get(self, tenant: str, scope: ScopeKey) -> Optional[V]:
+        """The scope's entry, marked as recently used."""
+
+        key = (tenant, scope)
+        value = self._scopes.get(key)
+        if value is not None:
+            self._scopes.move_to_end(key)
+        return value
+
+    def _get_or_create(self, tenant: str, scope: ScopeKey, create: Callable[[], V]) -> V:
+        value = self._get(tenant, scope)
+        if value is None:
+            value = self._scopes[(tenant, scope)] = create()
+            while len(self._scopes) > self.max_scopes:
+                self._scopes.popitem(last=False)
+        return value
+
+    def forget(self, tenant: str, **ids: Optional[str]) -> None:
+        """Drop the tenant's scopes matching every given id; no ids drops all of them."""
+
+        wanted = [
+            (SCOPE_FIELDS.index(field), value)
+            for field, value in ids.items()
+            if field in SCOPE_FIELDS and value
+        ]
+        stale = [
+            key
+            for key in self._scopes
+            if key[0] == tenant and all(key[1][index] == value for index, value in wanted)
+        ]
+        for key in stale:
+            del self._scopes[key]
@@ -2,38 +2,115 @@
 
 from __future__ import annotations
 
+import argparse
+import asyncio
+import functools
+import inspect
 import json
 import logging
 import os
-from typing import Annotated, Any, Callable, Dict, Optional, TypeVar
-
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, asynccontextmanager
+from pathlib import Path
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Literal,
+    Optional,
+    TypeVar,
+)
+
+import anyio
+import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import Context, FastMCP
 from mcp.server.transport_security import TransportSecuritySettings
-from mem0 import MemoryClient
-from mem0.exceptions import MemoryError
 from pydantic import Field
 
 try:  # Support both package (`python -m mem0_mcp.server`) and script (`python mem0_mcp/server.py`) runs.
+    from . import metrics, tracing
+    from .admission import EXPENSIVE, READ, WRITE, AdmissionController, Limits, Throttled
+    from .cache import ResultCache, scopes_from_filters, scopes_from_ids
+    from .dedup import DedupIndex, Duplicate
+    from .delta import DeltaIndex, chunked, turn_hashes
+    from .filters import CompiledFilters, FilterError, compile_filters, keyable
+    from .ingest import IngestQueue, QueueFullError
+    from .pagination import FetchPage, PageCursors, PageStream, collect_pages, has_more
+    from .ranking import fuse_results, merge_relations, rerank, result_items
+    from .registry import ClientRegistry, PoolSettings
+    from .resilience import (
+        CircuitBreakers,
+        CircuitOpenError,
+        RetryPolicy,
+        hedged,
+        parse_timeouts,
+        retrying,
+        with_timeout,
+    )
     from .schemas import (
         AddMemoryArgs,
         ConfigSchema,
         DeleteAllArgs,
         DeleteEntitiesArgs,
         GetMemoriesArgs,
+        MemoryUpdate,
         SearchMemoriesArgs,
         ToolMessage,
     )
+    from .scopes import ANY_SCOPE, SCOPE_FIELDS, Scope, scope_of, tenant_of
+    from .sessions import SessionRegistry, SessionState
+    from .shaping import ResponseShape, dumps
+    from .singleflight import SingleFlight
+    from .store import LocalStore, scope_filters, simple_scope
+    from .transfer import ExportFile, ImportProgress, read_batch, read_records, unix_time
+    from .versions import ScopeVersions
+    from .warm import SessionWarmer
 except ImportError:  # pragma: no cover - fallback for script execution
+    import metrics
+    import tracing
+    from admission import EXPENSIVE, READ, WRITE, AdmissionController, Limits, Throttled
+    from cache import ResultCache, scopes_from_filters, scopes_from_ids
+    from dedup import DedupIndex, Duplicate
+    from delta import DeltaIndex, chunked, turn_hashes
+    from filters import CompiledFilters, FilterError, compile_filters, keyable
+    from ingest import IngestQueue, QueueFullError
+    from pagination import FetchPage, PageCursors, PageStream, collect_pages, has_more
+    from ranking import fuse_results, merge_relations, rerank, result_items
+    from registry import ClientRegistry, PoolSettings
+    from resilience import (
+        CircuitBreakers,
+        CircuitOpenError,
+        RetryPolicy,
+        hedged,
+        parse_timeouts,
+        retrying,
+        with_timeout,
+    )
     from schemas import (
         AddMemoryArgs,
         ConfigSchema,
         DeleteAllArgs,
         DeleteEntitiesArgs,
         GetMemoriesArgs,
+        MemoryUpdate,
         SearchMemoriesArgs,
         ToolMessage,
     )
+    from scopes import ANY_SCOPE, SCOPE_FIELDS, Scope, scope_of, tenant_of
+    from sessions import SessionRegistry, SessionState
+    from shaping import ResponseShape, dumps
+    from singleflight import SingleFlight
+    from store import LocalStore, scope_filters, simple_scope
+    from transfer import ExportFile, ImportProgress, read_batch, read_records, unix_time
+    from versions import ScopeVersions
+    from warm import SessionWarmer
 
 load_dotenv()
 
@@ -45,19 +122,22 @@ logger = logging.getLogger("mem0_mcp_server")
 
 T = TypeVar("T")
 
+# what FastMCP injects into a tool's `ctx` parameter, whatever the session and lifespan types
+ToolContext = Context[Any, Any, Any]
+
 try:
     from smithery.decorators import smithery
 except ImportError:  # pragma: no cover - Smithery optional
 
     class _SmitheryFallback:
         @staticmethod
-        def server(*args, **kwargs):  # type: ignore[misc]
-            def decorator(func: Callable[..., T]) -> Callable[..., T]:  # type: ignore[type-var]
+        def server(*args: Any, **kwargs: Any) -> Callable[[Callable[..., T]], Callable[..., T]]:
+            def decorator(func: Callable[..., T]) -> Callable[..., T]:
                 return func
 
             return decorator
 
-    smithery = _SmitheryFallback()  # type: ignore[assignment]
+    smithery = _SmitheryFallback()  # type: ignore[assignment, unused-ignore]
 
 
 # graph remains off by default , also set the default user_id to "mem0-mcp" when nothing set
@@ -69,10 +149,188 @@ ENV_ENABLE_GRAPH_DEFAULT = os.getenv("MEM0_ENABLE_GRAPH_DEFAULT", "false").lower
     "yes",
 }
 
-_CLIENT_CACHE: Dict[str, MemoryClient] = {}
+# upstream HTTP pool shared by every session using the same key, plus a small executor for
+# the remaining blocking work (AsyncMemoryClient pings the API synchronously on construction)
+ENV_HTTP_MAX_CONNECTIONS = int(os.getenv("MEM0_HTTP_MAX_CONNECTIONS", "100"))
+ENV_HTTP_MAX_KEEPALIVE = int(os.getenv("MEM0_HTTP_MAX_KEEPALIVE", "20"))
+ENV_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("MEM0_HTTP_KEEPALIVE_EXPIRY", "30"))
+ENV_HTTP_TIMEOUT = float(os.getenv("MEM0_HTTP_TIMEOUT", "300"))
+ENV_MAX_WORKERS = int(os.getenv("MEM0_MAX_WORKERS", "8"))
+# alternative Mem0 API base URL, e.g. a self-hosted deployment or the benchmark fake
+ENV_API_HOST = os.getenv("MEM0_API_HOST") or None
+
+# at most this many tenant clients stay open; idle ones are closed after the TTL (seconds)
+ENV_MAX_CLIENTS = int(os.getenv("MEM0_MAX_CLIENTS", "256"))
+ENV_CLIENT_IDLE_TTL = float(os.getenv("MEM0_CLIENT_IDLE_TTL", "900"))
+
+# add_memories fans out to Mem0 with at most this many concurrent writes per call
+ENV_BATCH_CONCURRENCY = int(os.getenv("MEM0_BATCH_CONCURRENCY", "8"))
+ENV_BATCH_MAX_ITEMS = int(os.getenv("MEM0_BATCH_MAX_ITEMS", "1000"))
+
+# search_memories_batch runs at most this many queries per call, all concurrently
+ENV_SEARCH_BATCH_MAX_QUERIES = int(os.getenv("MEM0_SEARCH_BATCH_MAX_QUERIES", "10"))
+
+# get_memories cursors: default page size, pages prefetched ahead of the reader, pages fetched
+# in parallel when collecting up to max_items, and the largest max_items accepted
+ENV_PAGE_SIZE = int(os.getenv("MEM0_PAGE_SIZE", "100"))
+ENV_PREFETCH_PAGES = int(os.getenv("MEM0_PREFETCH_PAGES", "1"))
+ENV_PAGE_CONCURRENCY = int(os.getenv("MEM0_PAGE_CONCURRENCY", "4"))
+ENV_MAX_COLLECT_ITEMS = int(os.getenv("MEM0_MAX_COLLECT_ITEMS", "1000"))
+ENV_CURSOR_TTL = float(os.getenv("MEM0_CURSOR_TTL", "300"))
+
+# search/get results are cached briefly per tenant; set either limit to 0 to disable
+ENV_CACHE_MAX_ENTRIES = int(os.getenv("MEM0_CACHE_MAX_ENTRIES", "1024"))
+ENV_CACHE_TTL = float(os.getenv("MEM0_CACHE_TTL", "30"))
+
+# opt-in local re-ranking of search_memories: fetch `limit` times this many candidates (at most
+# the maximum), blend the vector score with BM25 over their texts (weight = BM25's share) and pick
+# `limit` of them by maximal marginal relevance (diversity = penalty for repeating a result)
+ENV_RERANK = os.getenv("MEM0_RERANK", "false").lower() in {"1", "true", "yes"}
+ENV_RERANK_OVERFETCH = int(os.getenv("MEM0_RERANK_OVERFETCH", "3"))
+ENV_RERANK_MAX_CANDIDATES = int(os.getenv("MEM0_RERANK_MAX_CANDIDATES", "100"))
+ENV_RERANK_LEXICAL_WEIGHT = float(os.getenv("MEM0_RERANK_LEXICAL_WEIGHT", "0.3"))
+ENV_RERANK_DIVERSITY = float(os.getenv("MEM0_RERANK_DIVERSITY", "0.3"))
+# Mem0's own default search limit, used as the re-ranking target when a call gives none
+_SEARCH_DEFAULT_LIMIT = 10
+
+# per-attempt deadlines by tool name (`search_memories=5,get_memories=15`; unlisted tools only
+# have MEM0_HTTP_TIMEOUT), attempts per read with jittered exponential backoff, and per-tenant
+# circuit breakers opened by consecutive transient failures (threshold 0 disables them)
+ENV_TOOL_TIMEOUTS = parse_timeouts(os.getenv("MEM0_TOOL_TIMEOUTS", ""))
+ENV_READ_ATTEMPTS = int(os.getenv("MEM0_READ_ATTEMPTS", "3"))
+ENV_RETRY_BACKOFF = float(os.getenv("MEM0_RETRY_BACKOFF", "0.2"))
+ENV_RETRY_MAX_BACKOFF = float(os.getenv("MEM0_RETRY_MAX_BACKOFF", "2"))
+ENV_BREAKER_THRESHOLD = int(os.getenv("MEM0_BREAKER_THRESHOLD", "5"))
+ENV_BREAKER_COOLDOWN = float(os.getenv("MEM0_BREAKER_COOLDOWN", "30"))
+# send a second copy of a search still unanswered after this many seconds (0 disables hedging)
+ENV_HEDGE_SEARCH_AFTER = float(os.getenv("MEM0_HEDGE_SEARCH_AFTER", "0"))
+
+# per-API-key admission control (0 disables a limit): token-bucket rate in calls per second and
+# its burst, tokens taken by add_memory/add_memories/graph calls, calls running at once per key
+# and overall, and how many calls may wait how long for a slot; sessions may only lower these
+ENV_RATE_LIMIT = float(os.getenv("MEM0_RATE_LIMIT", "0"))
+ENV_RATE_BURST = float(os.getenv("MEM0_RATE_BURST", "0"))
+ENV_RATE_EXPENSIVE_COST = float(os.getenv("MEM0_RATE_EXPENSIVE_COST", "5"))
+ENV_TENANT_CONCURRENCY = int(os.getenv("MEM0_TENANT_CONCURRENCY", "0"))
+ENV_MAX_CONCURRENT_CALLS = int(os.getenv("MEM0_MAX_CONCURRENT_CALLS", "0"))
+ENV_ADMISSION_MAX_QUEUE = int(os.getenv("MEM0_ADMISSION_MAX_QUEUE", "100"))
+ENV_ADMISSION_MAX_WAIT = float(os.getenv("MEM0_ADMISSION_MAX_WAIT", "10"))
+
+# identical reads (same tenant, method and arguments) in flight at once share one upstream request
+ENV_COALESCE_READS = os.getenv("MEM0_COALESCE_READS", "true").lower() in {"1", "true", "yes"}
+
+# opt-in near-duplicate suppression: an add whose text is at least this similar (Jaccard over
+# character shingles) to one written in the same scope within the window is skipped; the index
+# keeps this many recent texts per scope and this many scopes
+ENV_DEDUP_WRITES = os.getenv("MEM0_DEDUP_WRITES", "false").lower() in {"1", "true", "yes"}
+ENV_DEDUP_THRESHOLD = float(os.getenv("MEM0_DEDUP_THRESHOLD", "0.9"))
+ENV_DEDUP_WINDOW = float(os.getenv("MEM0_DEDUP_WINDOW", "3600"))
+ENV_DEDUP_MAX_ENTRIES = int(os.getenv("MEM0_DEDUP_MAX_ENTRIES", "256"))
+ENV_DEDUP_MAX_SCOPES = int(os.getenv("MEM0_DEDUP_MAX_SCOPES", "1024"))
+
+# opt-in delta ingestion of add_memory histories: turns already ingested for the scope (the
+# longest known prefix) are not sent again and the rest goes out in chunks of at most this many
+# turns, concurrently; the index keeps this many turn hashes per scope and this many scopes
+ENV_DELTA_MESSAGES = os.getenv("MEM0_DELTA_MESSAGES", "false").lower() in {"1", "true", "yes"}
+ENV_DELTA_CHUNK_TURNS = int(os.getenv("MEM0_DELTA_CHUNK_TURNS", "20"))
+ENV_DELTA_MAX_TURNS = int(os.getenv("MEM0_DELTA_MAX_TURNS", "1000"))
+ENV_DELTA_MAX_SCOPES = int(os.getenv("MEM0_DELTA_MAX_SCOPES", "1024"))
+
+# opt-in write-behind mode: add_memory returns a job id and background workers call Mem0
+ENV_ASYNC_WRITES = os.getenv("MEM0_ASYNC_WRITES", "false").lower() in {"1", "true", "yes"}
+ENV_INGEST_QUEUE_SIZE = int(os.getenv("MEM0_INGEST_QUEUE_SIZE", "1000"))
+ENV_INGEST_WORKERS = int(os.getenv("MEM0_INGEST_WORKERS", "4"))
+ENV_INGEST_COALESCE_MAX = int(os.getenv("MEM0_INGEST_COALESCE_MAX", "20"))
+ENV_INGEST_MAX_ATTEMPTS = int(os.getenv("MEM0_INGEST_MAX_ATTEMPTS", "5"))
+ENV_INGEST_ENQUEUE_TIMEOUT = float(os.getenv("MEM0_INGEST_ENQUEUE_TIMEOUT", "5"))
+ENV_INGEST_DRAIN_TIMEOUT = float(os.getenv("MEM0_INGEST_DRAIN_TIMEOUT", "30"))
+
+# opt-in session warm-up: each session prefetches the default user's memory listing when it
+# starts, answers matching get_memories/get_memory calls from it and refreshes it in the
+# background once older than the refresh interval (at most `concurrency` fetches at once);
+# snapshots older than the max age are not served
+ENV_WARM_SESSIONS = os.getenv("MEM0_WARM_SESSIONS", "false").lower() in {"1", "true", "yes"}
+ENV_WARM_REFRESH = float(os.getenv("MEM0_WARM_REFRESH", "60"))
+ENV_WARM_MAX_AGE = float(os.getenv("MEM0_WARM_MAX_AGE", "600"))
+ENV_WARM_CONCURRENCY = int(os.getenv("MEM0_WARM_CONCURRENCY", "4"))
+ENV_WARM_ITEMS = int(os.getenv("MEM0_WARM_ITEMS", "20"))
+
+# optional SQLite mirror (path or ":memory:") serving known ids and reconciled scope listings
+# locally, and stale data while Mem0 is unreachable; unset keeps every read remote
+ENV_LOCAL_STORE = os.getenv("MEM0_LOCAL_STORE")
+ENV_STORE_MAX_AGE = float(os.getenv("MEM0_STORE_MAX_AGE", "300"))
+ENV_STORE_RECONCILE_INTERVAL = float(os.getenv("MEM0_STORE_RECONCILE_INTERVAL", "120"))
+ENV_STORE_MAX_SCOPE_ITEMS = int(os.getenv("MEM0_STORE_MAX_SCOPE_ITEMS", "5000"))
+
+# response shaping defaults: compact mode, memory fields kept by read tools (comma separated,
+# empty keeps everything) and the longest memory text returned before truncation (0 = no limit)
+ENV_RESPONSE_COMPACT = os.getenv("MEM0_RESPONSE_COMPACT", "false").lower() in {"1", "true", "yes"}
+ENV_RESPONSE_FIELDS = [
+    name.strip() for name in os.getenv("MEM0_RESPONSE_FIELDS", "").split(",") if name.strip()
+]
+ENV_RESPONSE_MAX_CHARS = int(os.getenv("MEM0_RESPONSE_MAX_CHARS", "0"))
+
+# export_memories/import_memories only touch files inside this directory (the CLI subcommands
+# take any path); imports add this many memories between checkpoints
+ENV_TRANSFER_DIR = os.getenv("MEM0_TRANSFER_DIR", "mem0-transfers")
+ENV_IMPORT_BATCH = int(os.getenv("MEM0_IMPORT_BATCH", "100"))
+
+# per-session state (resolved settings, warm listing, usage) is kept for at most this many MCP
+# sessions and dropped after this many idle seconds; an evicted session resolves it again
+ENV_MAX_SESSIONS = int(os.getenv("MEM0_MAX_SESSIONS", "1024"))
+ENV_SESSION_IDLE_TTL = float(os.getenv("MEM0_SESSION_IDLE_TTL", "3600"))
+
+# optional OpenTelemetry spans per tool call and stage, exported to `console` (stderr), `file`
+# (JSON lines at MEM0_TRACING_FILE) or `otlp` (standard OTEL_EXPORTER_OTLP_* settings)
+ENV_TRACING = os.getenv("MEM0_TRACING", "").strip().lower()
+ENV_TRACING_FILE = os.getenv("MEM0_TRACING_FILE", "mem0-mcp-traces.jsonl")
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=ENV_MAX_WORKERS, thread_name_prefix="mem0-mcp")
+_RESULT_CACHE = ResultCache(max_entries=ENV_CACHE_MAX_ENTRIES, ttl=ENV_CACHE_TTL)
+_PAGE_CURSORS = PageCursors(ttl=ENV_CURSOR_TTL, depth=ENV_PREFETCH_PAGES)
+_READS_IN_FLIGHT = SingleFlight()
+_VERSIONS = ScopeVersions()
+_SESSIONS = SessionRegistry(max_sessions=ENV_MAX_SESSIONS, idle_ttl=ENV_SESSION_IDLE_TTL)
+_DEDUP = DedupIndex(
+    threshold=ENV_DEDUP_THRESHOLD,
+    window=ENV_DEDUP_WINDOW,
+    max_entries=ENV_DEDUP_MAX_ENTRIES,
+    max_scopes=ENV_DEDUP_MAX_SCOPES,
+)
+_DELTA = DeltaIndex(max_turns=ENV_DELTA_MAX_TURNS, max_scopes=ENV_DELTA_MAX_SCOPES)
+_ADMISSION = AdmissionController(
+    Limits(
+        rate=ENV_RATE_LIMIT,
+        burst=ENV_RATE_BURST,
+        concurrency=ENV_TENANT_CONCURRENCY,
+        max_queue=ENV_ADMISSION_MAX_QUEUE,
+        max_wait=ENV_ADMISSION_MAX_WAIT,
+    ),
+    max_concurrent=ENV_MAX_CONCURRENT_CALLS,
+)
+_BREAKERS = CircuitBreakers(threshold=ENV_BREAKER_THRESHOLD, cooldown=ENV_BREAKER_COOLDOWN)
+_READ_RETRIES = RetryPolicy(
+    attempts=max(1, ENV_READ_ATTEMPTS),
+    backoff=ENV_RETRY_BACKOFF,
+    max_backoff=ENV_RETRY_MAX_BACKOFF,
+)
+_WRITE_RETRIES = RetryPolicy(attempts=1)
+_STORE = (
+    LocalStore(
+        ENV_LOCAL_STORE, max_age=ENV_STORE_MAX_AGE, max_scope_items=ENV_STORE_MAX_SCOPE_ITEMS
+    )
+    if ENV_LOCAL_STORE
+    else None
+)
+
 
+def _local_store() -> LocalStore:
+    # for callers that only run once MEM0_LOCAL_STORE is known to be set
+    assert _STORE is not None
+    return _STORE
 
-def _config_value(source: Any, field: str):
+
+def _config_value(source: Any, field: str) -> Any:
     if source is None:
         return None
     if isinstance(source, dict):
@@ -80,63 +338,1115 @@ def _config_value(source: Any, field: str):
     return getattr(source, field, None)
 
 
-def _with_default_filters(
-    default_user_id: str, filters: Optional[Dict[str, Any]] = None
+def _error(body: Dict[str, Any]) -> str:
+    """Serialize an error response and count the tool call as failed."""
+
+    metrics.set_outcome("error")
+    return dumps(body)
+
+
+def _invalid_filters(exc: FilterError) -> str:
+    return _error({"error": "invalid_filters", "detail": str(exc)})
+
+
+async def _run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the bounded executor instead of the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EXECUTOR, functools.partial(func, *args, **kwargs))
+
+
+_CLIENTS = ClientRegistry(
+    _run_blocking,
+    pool=PoolSettings(
+        max_connections=ENV_HTTP_MAX_CONNECTIONS,
+        max_keepalive=ENV_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=ENV_HTTP_KEEPALIVE_EXPIRY,
+        timeout=ENV_HTTP_TIMEOUT,
+        host=ENV_API_HOST,
+    ),
+    max_clients=ENV_MAX_CLIENTS,
+    idle_ttl=ENV_CLIENT_IDLE_TTL,
+)
+
+
+# mem0 is imported on first use: its package import pulls in the whole local Memory stack and
+# takes longer than the rest of the server's startup combined
+@functools.cache
+def _upstream_errors() -> tuple[type[BaseException], ...]:
+    """Exceptions a Mem0 client call raises for upstream failures."""
+    from mem0.exceptions import MemoryError
+
+    return (MemoryError, httpx.HTTPError)
+
+
+@functools.cache
+def _transient_errors() -> tuple[type[BaseException], ...]:
+    from mem0.exceptions import NetworkError, RateLimitError
+
+    return (httpx.TransportError, NetworkError, RateLimitError)
+
+
+def _error_details(exc: BaseException) -> tuple[Optional[int], Any]:
+    # AsyncMemoryClient's error decorator does not wrap coroutines, so raw httpx errors can escape
+    if isinstance(exc, httpx.HTTPStatusError):
+        try:
+            payload = exc.response.json()
+        except ValueError:
+            payload = exc.response.text
+        return exc.response.status_code, payload
+    return getattr(exc, "status", None), getattr(exc, "payload", None)
+
+
+def _error_body(exc: BaseException) -> Dict[str, Any]:
+    logger.error("Mem0 call failed: %s", exc)
+    status, payload = _error_details(exc)
+    return {"error": str(exc), "status": status, "payload": payload}
+
+
+def _error_response(exc: BaseException) -> str:
+    # returns the erorr to the model
+    return _error(_error_body(exc))
+
+
+_WRITE_METHODS = frozenset({"add", "update", "delete", "delete_all", "delete_users"})
+
+
+def _memory_id(args: tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    memory_id: str = kwargs.get("memory_id") or args[0]
+    return memory_id
+
+
+def _invalidate_after_write(
+    api_key: str, method: str, args: tuple[Any, ...], kwargs: Dict[str, Any]
+) -> None:
+    tenant = tenant_of(api_key)
+    if method in ("update", "delete"):
+        memory_id = _memory_id(args, kwargs)
+        scopes = _RESULT_CACHE.scopes_of(api_key, memory_id)
+        _bump_versions(tenant, scopes)
+        _RESULT_CACHE.invalidate_memory(api_key, memory_id)
+        # texts recorded for the memory's scope may describe it; without a cached read of the
+        # memory its scope is unknown and none of the tenant's texts can be trusted
+        _DEDUP.forget(tenant, **dict(scopes or ()))
+        for warmer in _WARMERS:
+            if warmer.tenant == tenant and warmer.contains(memory_id):
+                warmer.invalidate()
+    else:
+        # deleting a user's memories also changes the agents/apps/runs they belong to, so bulk
+        # deletes drop every read of the tenant rather than those of the ids they name
+        scopes = scopes_from_ids(**kwargs) if method == "add" else None
+        _bump_versions(tenant, scopes or None)
+        _RESULT_CACHE.invalidate(api_key, scopes)
+        if method != "add":
+            _DEDUP.forget(tenant, **kwargs)
+            _DELTA.forget(tenant, **kwargs)
+        for warmer in _WARMERS:
+            if warmer.tenant == tenant and (
+                scopes is None or ANY_SCOPE in warmer.scopes or warmer.scopes & scopes
+            ):
+                warmer.invalidate()
+
+
+def _bump_versions(tenant: str, scopes: Optional[frozenset[Scope]]) -> None:
+    """Bump resource versions for a write and notify the sessions subscribed to them."""
+
+    for session, uri in _VERSIONS.bump(tenant, scopes):
+        task = asyncio.ensure_future(session.send_resource_updated(uri))
+        task.add_done_callback(_drop_notification_error)
+
+
+def _drop_notification_error(task: asyncio.Future[None]) -> None:
+    # the subscribed session may have gone away; it will not miss anything it could still see
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("Resource update notification failed: %s", task.exception())
+
+
+async def _mirror(
+    api_key: str, method: str, args: tuple[Any, ...], kwargs: Dict[str, Any], result: Any
+) -> None:
+    """Keep the local store in step with what just went through Mem0."""
+
+    if _STORE is not None:
+        await _run_blocking(_apply_mirror, tenant_of(api_key), method, args, kwargs, result)
+
+
+def _apply_mirror(
+    tenant: str, method: str, args: tuple[Any, ...], kwargs: Dict[str, Any], result: Any
+) -> None:
+    # runs on the executor: the store's lock is never taken on the event loop
+    try:
+        if method in ("search", "get_all"):
+            _local_store().record(tenant, result_items(result))
+        elif method == "get" and isinstance(result, dict):
+            _local_store().record(tenant, [result])
+        elif method == "add":
+            _local_store().record_add(tenant, result, kwargs)
+        elif method == "update" and kwargs.get("text") is not None:
+            _local_store().update_text(tenant, _memory_id(args, kwargs), kwargs["text"])
+        elif method == "delete":
+            _local_store().delete(tenant, _memory_id(args, kwargs))
+        elif method in ("delete_all", "delete_users"):
+            _local_store().delete_scope(tenant, **kwargs)
+    except sqlite3.Error as exc:  # the mirror is best effort and must never fail a tool call
+        logger.warning("Local store update after %s failed: %s", method, exc)
+
+
+async def _mem0_request(api_key: str, method: str, *args: Any, **kwargs: Any) -> Any:
+    """Invoke one AsyncMemoryClient method on the tenant's pooled client.
+
+    Identical concurrent reads share one upstream request (the cache generation keeps reads
+    issued after a write apart from those started before it); writes are never coalesced.
+    """
+
+    if method in _WRITE_METHODS or not ENV_COALESCE_READS:
+        return await _mem0_send(api_key, method, *args, **kwargs)
+    key = _READS_IN_FLIGHT.make_key(
+        api_key, method, args, keyable(kwargs), _RESULT_CACHE.generation(api_key)
+    )
+    return await _READS_IN_FLIGHT.do(
+        key,
+        lambda: _mem0_send(api_key, method, *args, **kwargs),
+        on_join=lambda: metrics.coalesced_request(method),
+    )
+
+
+async def _mem0_send(api_key: str, method: str, *args: Any, **kwargs: Any) -> Any:
+    """Send one request to Mem0.
+
+    Reads are retried on transient failures and searches may be hedged; writes get a single
+    attempt, since a write that timed out may still have landed. Writes invalidate cached reads
+    of the scopes they touch, even when they fail, and every result is mirrored into the local
+    store.
+    """
+
+    def attempt() -> Awaitable[Any]:
+        return _mem0_attempt(api_key, method, args, kwargs)
+
+    async def send() -> Any:
+        if method == "search" and ENV_HEDGE_SEARCH_AFTER > 0:
+            return await hedged(
+                attempt, ENV_HEDGE_SEARCH_AFTER, on_hedge=lambda: metrics.record_hedge(method)
+            )
+        return await attempt()
+
+    def on_retry(number: int, delay: float, exc: BaseException) -> None:
+        metrics.record_retry(method)
+        span.set_attribute("mem0.retries", number)
+        logger.warning(
+            "Mem0 %s failed (attempt %d/%d), retrying in %.2fs: %s",
+            method,
+            number,
+            _READ_RETRIES.attempts,
+            delay,
+            exc,
+        )
+
+    policy = _WRITE_RETRIES if method in _WRITE_METHODS else _READ_RETRIES
+    with tracing.span(f"mem0 {method}", attributes={"mem0.method": method}) as span:
+        try:
+            result = await retrying(send, policy, _is_retryable, on_retry)
+        finally:
+            if method in _WRITE_METHODS:
+                _invalidate_after_write(api_key, method, args, kwargs)
+        span.set_attribute("mem0.result_count", _result_count(result))
+    await _mirror(api_key, method, args, kwargs, result)
+    return result
+
+
+async def _mem0_attempt(api_key: str, method: str, args: tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    """One upstream attempt, gated by the tenant's circuit breaker and the tool's deadline."""
+
+    tenant = tenant_of(api_key)
+    try:
+        _BREAKERS.check(tenant)
+    except CircuitOpenError:
+        metrics.record_rejected()
+        raise
+    try:
+        async with _CLIENTS.lease(api_key) as client:
+            with metrics.upstream_request(method):
+                result = await with_timeout(
+                    getattr(client, method)(*args, **kwargs),
+                    ENV_TOOL_TIMEOUTS.get(metrics.current_tool()),
+                )
+    except _upstream_errors() as exc:
+        metrics.record_error(_error_details(exc)[0])
+        _BREAKERS.record(tenant, ok=not _is_transient(exc))
+        raise
+    _BREAKERS.record(tenant, ok=True)
+    return result
+
+
+_UNSHAPED = ResponseShape()
+
+
+def _result_count(result: Any) -> int:
+    if isinstance(result, dict) and not isinstance(result.get("results"), list):
+        return 1
+    return len(result_items(result))
+
+
+def _render(shape: ResponseShape, result: Any) -> str:
+    """Shape and serialize a tool result."""
+
+    with tracing.span("serialize") as span:
+        body = dumps(shape.apply(result))
+        span.set_attribute("mem0.result_count", _result_count(result))
+        span.set_attribute("mcp.response.bytes", len(body))
+    return body
+
+
+async def _mem0_call(
+    api_key: str, method: str, *args: Any, shape: ResponseShape = _UNSHAPED, **kwargs: Any
+) -> str:
+    try:
+        result = await _mem0_request(api_key, method, *args, **kwargs)
+    except _upstream_errors() as exc:  # surface structured error back to MCP client
+        return _error_response(exc)
+    return _render(shape, result)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether an upstream failure is worth retrying (network trouble, 429 or 5xx)."""
+
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, _transient_errors())
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    # an open breaker means Mem0 is already known to be down; retrying would only add delay
+    return _is_transient(exc) and not isinstance(exc, CircuitOpenError)
+
+
+async def _submit_add(
+    api_key: str, conversation: list[Dict[str, Any]], payload: Dict[str, Any]
+) -> Any:
+    with metrics.background("ingest"):
+        return await _mem0_request(api_key, "add", conversation, **payload)
+
+
+_INGEST = IngestQueue(
+    _submit_add,
+    max_size=ENV_INGEST_QUEUE_SIZE,
+    workers=ENV_INGEST_WORKERS,
+    coalesce_max=ENV_INGEST_COALESCE_MAX,
+    max_attempts=ENV_INGEST_MAX_ATTEMPTS,
+    enqueue_timeout=ENV_INGEST_ENQUEUE_TIMEOUT,
+    retryable=_is_transient,
+    error_body=_error_body,
+)
+
+
+_RECONCILE_WAKE = asyncio.Event()
+_RECONCILER: Optional[asyncio.Task[None]] = None
+# api keys of tenants whose scopes are being reconciled; only held in memory
+_STORE_KEYS: Dict[str, str] = {}
+
+
+async def _watch_scope(api_key: str, scope: Any) -> None:
+    """Register a listed scope with the local store and make sure reconciliation runs."""
+
+    global _RECONCILER
+    tenant = tenant_of(api_key)
+    _STORE_KEYS[tenant] = api_key
+    await _run_blocking(_local_store().want_scope, tenant, scope)
+    if _RECONCILER is None or _RECONCILER.done():
+        _RECONCILER = asyncio.create_task(_reconcile_loop(), name="mem0-store-reconcile")
+    _RECONCILE_WAKE.set()
+
+
+async def _reconcile_scope(api_key: str, tenant: str, scope: Any) -> None:
+    started_at = time.time()
+    request = {"filters": scope_filters(scope), "page_size": ENV_PAGE_SIZE}
+    memories: list[Dict[str, Any]] = []
+    page = 1
+    while True:
+        with metrics.background("reconcile"):
+            result = await _mem0_request(api_key, "get_all", **request, page=page)
+        memories.extend(result_items(result))
+        if len(memories) > ENV_STORE_MAX_SCOPE_ITEMS:
+            logger.info(
+                "Scope %s holds over %d memories; not mirroring it locally",
+                sorted(scope),
+                ENV_STORE_MAX_SCOPE_ITEMS,
+            )
+            await _run_blocking(_local_store().forget_scope, tenant, scope)
+            return
+        if not has_more(result, page, ENV_PAGE_SIZE):
+            break
+        page += 1
+    await _run_blocking(_local_store().replace_scope, tenant, scope, memories, started_at)
+
+
+async def _reconcile_loop() -> None:
+    """Re-list watched scopes against get_all so local listings stay within the staleness window."""
+
+    while True:
+        _RECONCILE_WAKE.clear()
+        for tenant, scope in await _run_blocking(
+            _local_store().scopes_due, ENV_STORE_RECONCILE_INTERVAL
+        ):
+            api_key = _STORE_KEYS.get(tenant)
+            if api_key is None:  # registered by an earlier process; wait for a new listing
+                continue
+            try:
+                await _reconcile_scope(api_key, tenant, scope)
+            except _upstream_errors() + (sqlite3.Error,) as exc:
+                logger.warning("Reconciling scope %s failed: %s", sorted(scope), exc)
+        try:
+            await asyncio.wait_for(_RECONCILE_WAKE.wait(), timeout=ENV_STORE_RECONCILE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _local_listing(api_key: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Serve an unpaged get_memories for a plain scope from the store when it is fresh."""
+
+    scope = simple_scope(payload.get("filters"))
+    if _STORE is None or scope is None or payload.get("enable_graph") or "page" in payload:
+        return None
+    await _watch_scope(api_key, scope)
+    memories = await _run_blocking(_STORE.list_scope, tenant_of(api_key), scope)
+    if memories is None:
+        return None
+    return {"results": memories, "count": len(memories), "source": "local"}
+
+
+async def _local_fallback(
+    api_key: str, method: str, payload: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Answer a search/get_all for a plain scope from the store while Mem0 is unreachable."""
+
+    scope = simple_scope(payload.get("filters"))
+    if _STORE is None or scope is None:
+        return None
+    tenant = tenant_of(api_key)
+    if method == "search":
+        memories = await _run_blocking(
+            _STORE.search, tenant, payload["query"], scope, payload.get("limit") or 10
+        )
+    else:
+        listed = await _run_blocking(_STORE.list_scope, tenant, scope, allow_stale=True)
+        memories = listed or []
+        if "page" in payload:
+            size = payload.get("page_size") or ENV_PAGE_SIZE
+            memories = memories[(payload["page"] - 1) * size : payload["page"] * size]
+    return {"results": memories, "stale": True}
+
+
+def _read_scopes(filters: Any) -> frozenset[Scope]:
+    if isinstance(filters, CompiledFilters):
+        return filters.scopes
+    return scopes_from_filters(filters)
+
+
+async def _cached_mem0_request(api_key: str, tool: str, method: str, **payload: Any) -> Any:
+    """Serve a read from the result cache, falling through to Mem0 on a miss.
+
+    While Mem0 is unreachable, reads of a plain scope are answered from the local store.
+    """
+
+    key = _RESULT_CACHE.make_key(api_key, tool, keyable(payload))
+    cached = _RESULT_CACHE.get(key)
+    if cached is not None:
+        return cached
+    generation = _RESULT_CACHE.generation(api_key)
+    try:
+        result = await _mem0_request(api_key, method, **payload)
+    except _upstream_errors() as exc:
+        fallback = await _local_fallback(api_key, method, payload) if _is_transient(exc) else None
+        if fallback is None:
+            raise
+        logger.warning("Mem0 unreachable (%s); serving %s from the local store", exc, tool)
+        return fallback
+    _RESULT_CACHE.put(
+        api_key, key, result, _read_scopes(payload.get("filters")), generation=generation
+    )
+    return result
+
+
+async def _mem0_call_or_local(
+    api_key: str,
+    local: Callable[[], Any],
+    method: str,
+    *args: Any,
+    shape: ResponseShape = _UNSHAPED,
+    **kwargs: Any,
+) -> str:
+    """Like _mem0_call, but answer with `local()` when Mem0 is unreachable and it has data.
+
+    `local` reads the store, so it runs on the executor.
+    """
+
+    try:
+        result = await _mem0_request(api_key, method, *args, **kwargs)
+    except _upstream_errors() as exc:
+        transient = _STORE is not None and _is_transient(exc)
+        fallback = await _run_blocking(local) if transient else None
+        if fallback is None:
+            return _error_response(exc)
+        logger.warning("Mem0 unreachable (%s); serving %s from the local store", exc, method)
+        return _render(shape, fallback)
+    return _render(shape, result)
+
+
+async def _cached_mem0_call(
+    api_key: str, tool: str, method: str, shape: ResponseShape = _UNSHAPED, **payload: Any
+) -> str:
+    try:
+        result = await _cached_mem0_request(api_key, tool, method, **payload)
+    except _upstream_errors() as exc:
+        return _error_response(exc)
+    return _render(shape, result)
+
+
+def _reranked(query: str, result: Any, limit: int) -> Any:
+    items = rerank(
+        query,
+        result_items(result),
+        limit,
+        lexical_weight=ENV_RERANK_LEXICAL_WEIGHT,
+        diversity=ENV_RERANK_DIVERSITY,
+    )
+    return {**result, "results": items} if isinstance(result, dict) else items
+
+
+def _page_fetcher(api_key: str, request: Dict[str, Any]) -> FetchPage:
+    async def fetch(page: int) -> Any:
+        return await _cached_mem0_request(
+            api_key, "get_memories", "get_all", **request, page=page
+        )
+
+    return fetch
+
+
+def _page_items(result: Any) -> list[Any]:
+    return result_items(result) if isinstance(result, dict) else list(result or [])
+
+
+async def _read_page(stream: PageStream, page: int, skip: int) -> Dict[str, Any]:
+    """Return one page of a cursor stream and queue the prefetch of the pages after it."""
+
+    result = await _PAGE_CURSORS.page(stream, page)
+    items = _page_items(result)[skip:]
+    response = {**result, "results": items} if isinstance(result, dict) else {"results": items}
+    if has_more(result, page, stream.request["page_size"]):
+        response["next_cursor"] = _PAGE_CURSORS.cursor(stream.id, page + 1)
+        _PAGE_CURSORS.prefetch(stream, page)
+    return response
+
+
+async def _report_progress(
+    ctx: ToolContext | None, progress: float, total: Optional[float] = None
+) -> None:
+    if ctx is None:
+        return
+    try:
+        await ctx.report_progress(progress, total)
+    except ValueError:  # no active request, e.g. when a tool is invoked directly
+        pass
+
+
+async def _collect(
+    stream: PageStream, page: int, skip: int, max_items: int, ctx: ToolContext | None
 ) -> Dict[str, Any]:
-    """Ensure filters exist and include the default user_id at the top level."""
-    if not filters:
-        return {"AND": [{"user_id": default_user_id}]}
-    if not any(key in filters for key in ("AND", "OR", "NOT")):
-        filters = {"AND": [filters]}
-    has_user = json.dumps(filters, sort_keys=True).find('"user_id"') != -1
-    if not has_user:
-        and_list = filters.setdefault("AND", [])
-        if not isinstance(and_list, list):
-            raise ValueError("filters['AND'] must be a list when present.")
-        and_list.insert(0, {"user_id": default_user_id})
-    return filters
-
-
-def _mem0_call(func, *args, **kwargs):
+    """Gather up to `max_items` memories from parallel page fetches, reporting progress per page."""
+
+    page_size = stream.request["page_size"]
+    collected: list[Any] = []
+    raw_pages: list[Any] = []
+    next_cursor = None
+    prefetch_after = None
+    pages = collect_pages(
+        lambda p: _PAGE_CURSORS.page(stream, p),
+        page_size,
+        max_items + skip,
+        concurrency=ENV_PAGE_CONCURRENCY,
+        start_page=page,
+    )
+    async with aclosing(pages):
+        async for page_no, result in pages:
+            offset = skip if page_no == page else 0
+            items = _page_items(result)[offset:]
+            room = max_items - len(collected)
+            collected.extend(items[:room])
+            if isinstance(result, dict) and result.get("relations"):
+                raw_pages.append(result)
+            next_cursor = prefetch_after = None
+            if len(items) > room:
+                next_cursor = _PAGE_CURSORS.cursor(stream.id, page_no, offset + room)
+            elif has_more(result, page_no, page_size):
+                next_cursor = _PAGE_CURSORS.cursor(stream.id, page_no + 1)
+                prefetch_after = page_no
+            await _report_progress(ctx, len(collected), max_items)
+            if len(collected) >= max_items:
+                break
+    response: Dict[str, Any] = {"results": collected}
+    relations = merge_relations(raw_pages)
+    if relations:
+        response["relations"] = relations
+    if next_cursor:
+        response["next_cursor"] = next_cursor
+    if prefetch_after is not None:
+        _PAGE_CURSORS.prefetch(stream, prefetch_after)
+    return response
+
+
+async def _matching_memories(
+    api_key: str, request: Dict[str, Any], max_items: int, ctx: ToolContext | None
+) -> tuple[list[Dict[str, Any]], bool]:
+    """The id and text of up to `max_items` memories matching a get_all request.
+
+    Pages are read uncached and without a cursor stream, since the memories are about to be
+    written to. Also returns whether more memories match than were listed.
+    """
+
+    async def fetch(page: int) -> Any:
+        return await _mem0_request(api_key, "get_all", **request, page=page)
+
+    page_size = request["page_size"]
+    matches: list[Dict[str, Any]] = []
+    truncated = False
+    pages = collect_pages(fetch, page_size, max_items, concurrency=ENV_PAGE_CONCURRENCY)
+    async with aclosing(pages):
+        async for page, result in pages:
+            items = [
+                {"id": item["id"], "memory": item.get("memory")}
+                for item in _page_items(result)
+                if isinstance(item, dict) and item.get("id")
+            ]
+            room = max_items - len(matches)
+            matches.extend(items[:room])
+            await _report_progress(ctx, len(matches), max_items)
+            if len(matches) >= max_items:
+                truncated = len(items) > room or has_more(result, page, page_size)
+                break
+    return matches, truncated
+
+
+async def _write_by_id(api_key: str, method: str, memory_id: str, **kwargs: Any) -> Dict[str, Any]:
+    """One update or delete of a bulk tool; the per-id outcome never raises.
+
+    Writes addressed by id are idempotent, so unlike single writes they are retried on
+    transient failures like reads.
+    """
+
+    def on_retry(number: int, delay: float, exc: BaseException) -> None:
+        metrics.record_retry(method)
+        logger.warning("Mem0 %s of %s failed, retrying in %.2fs: %s", method, memory_id, delay, exc)
+
     try:
-        result = func(*args, **kwargs)
-    except MemoryError as exc:  # surface structured error back to MCP client
-        logger.error("Mem0 call failed: %s", exc)
-        # returns the erorr to the model
-        return json.dumps(
-            {
-                "error": str(exc),
-                "status": getattr(exc, "status", None),
-                "payload": getattr(exc, "payload", None),
-            },
-            ensure_ascii=False,
+        await retrying(
+            lambda: _mem0_request(api_key, method, memory_id=memory_id, **kwargs),
+            _READ_RETRIES,
+            _is_retryable,
+            on_retry,
         )
-    return json.dumps(result, ensure_ascii=False)
+    except _upstream_errors() as exc:
+        status = _error_details(exc)[0]
+        if status == 404:
+            return {"memory_id": memory_id, "status": "not_found"}
+        return {"memory_id": memory_id, "status": "error", "detail": _error_body(exc)}
+    return {"memory_id": memory_id, "status": "ok"}
+
+
+async def _bulk_by_id(
+    ctx: ToolContext | None, calls: list[Callable[[], Awaitable[Dict[str, Any]]]]
+) -> str:
+    """Run per-id writes with bounded concurrency and summarize their outcomes in order."""
+
+    semaphore = asyncio.Semaphore(ENV_BATCH_CONCURRENCY)
+    done = 0
+
+    async def run(call: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        nonlocal done
+        async with semaphore:
+            outcome = await call()
+        done += 1
+        await _report_progress(ctx, done, len(calls))
+        return outcome
+
+    results = await asyncio.gather(*(run(call) for call in calls))
+    counts = {status: 0 for status in ("ok", "not_found", "error")}
+    for outcome in results:
+        counts[outcome["status"]] += 1
+    return _render(
+        _UNSHAPED,
+        {
+            "total": len(results),
+            "succeeded": counts["ok"],
+            "not_found": counts["not_found"],
+            "failed": counts["error"],
+            "results": results,
+        },
+    )
+
+
+Progress = Callable[[int, Optional[int]], Awaitable[None]]
+# failed import lines listed in the summary; all of them are in the errors file
+_IMPORT_ERRORS_KEPT = 20
+
+
+def _transfer_path(file_name: str) -> Path:
+    """A tool's file name resolved inside MEM0_TRANSFER_DIR; ValueError if it leads outside."""
+
+    base = Path(ENV_TRANSFER_DIR).resolve()
+    path = (base / file_name).resolve()
+    if base not in path.parents:
+        raise ValueError(f"{file_name!r} is not a file name inside the transfer directory.")
+    return path
+
+
+async def _export_memories(
+    api_key: str, request: Dict[str, Any], path: Path, resume: bool, progress: Progress
+) -> Dict[str, Any]:
+    """Stream every memory matching a get_all request into an NDJSON file, page by page.
+
+    Pages are fetched `MEM0_PAGE_CONCURRENCY` at a time and written in order, so memory stays
+    bounded by a few pages whatever the scope size. An interrupted export keeps its checkpoint
+    and the next call with the same request resumes after the last page written.
+    """
+
+    export = ExportFile(path, request, encode=dumps)
+    resumed = await _run_blocking(export.open, resume)
+
+    async def fetch(page: int) -> Any:
+        # uncached: an export would otherwise fill the result cache with the whole scope
+        return await _mem0_request(api_key, "get_all", **request, page=page)
+
+    pages = collect_pages(
+        fetch,
+        request["page_size"],
+        sys.maxsize,
+        concurrency=ENV_PAGE_CONCURRENCY,
+        start_page=export.next_page,
+    )
+    total = None
+    try:
+        async with aclosing(pages):
+            async for page, result in pages:
+                if isinstance(result, dict) and isinstance(result.get("count"), int):
+                    total = result["count"]
+                await _run_blocking(export.write_page, page, _page_items(result))
+                await progress(export.exported, total)
+    finally:
+        export.close()
+    export.finish()
+    return {
+        "path": str(path),
+        "exported": export.exported,
+        "pages": export.next_page - 1,
+        "resumed": resumed,
+    }
+
+
+def _import_request(record: Any, scope: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """client.add kwargs storing an exported memory verbatim; ValueError when it cannot be."""
+
+    if not isinstance(record, dict) or not isinstance(record.get("memory"), str):
+        raise ValueError("Not an exported memory: no `memory` text.")  # noqa: TRY004
+    payload: Dict[str, Any] = {
+        field: scope.get(field) or record.get(field)
+        for field in SCOPE_FIELDS
+        if scope.get(field) or record.get(field)
+    }
+    if not payload:
+        raise ValueError("No user_id, agent_id, app_id or run_id to store the memory under.")
+    payload["messages"] = [{"role": "user", "content": record["memory"]}]
+    payload["infer"] = False  # keep the exported text instead of extracting new facts from it
+    if isinstance(record.get("metadata"), dict):
+        payload["metadata"] = record["metadata"]
+    created = unix_time(record.get("created_at"))
+    if created is not None:
+        payload["timestamp"] = created
+    return payload
+
+
+async def _import_memories(
+    api_key: str,
+    path: Path,
+    scope: Dict[str, Optional[str]],
+    resume: bool,
+    progress: Progress,
+) -> Dict[str, Any]:
+    """Add the memories of an NDJSON export, `MEM0_IMPORT_BATCH` lines at a time.
+
+    The file is read and parsed lazily on the executor, and each batch is written with at most
+    `MEM0_BATCH_CONCURRENCY` adds in flight, so memory stays flat whatever the file size and the
+    event loop never waits on the disk. Lines that are not importable memories are skipped and
+    listed in the errors file. An upstream failure stops the import after its batch settles,
+    checkpointing only the lines that went through, and is raised so that the next run resumes
+    with the lines that did not.
+    """
+
+    state = ImportProgress(path)
+    resumed = await _run_blocking(state.load, resume)
+    semaphore = asyncio.Semaphore(ENV_BATCH_CONCURRENCY)
+    errors: list[Dict[str, Any]] = []
+
+    async def add(record: Any) -> None:
+        payload = _import_request(record, scope)
+        async with semaphore:
+            await _mem0_request(api_key, "add", payload.pop("messages"), **payload)
+
+    records = read_records(path, state.line)
+    size = max(1, ENV_IMPORT_BATCH)
+    try:
+        while batch := await _run_blocking(read_batch, records, size):
+            pending = [(number, record) for number, record in batch if number not in state.done]
+            outcomes = await asyncio.gather(
+                *(add(record) for _, record in pending), return_exceptions=True
+            )
+            failures = []
+            interrupted: Optional[BaseException] = None
+            for (number, _), outcome in zip(pending, outcomes):
+                if outcome is None:
+                    state.imported += 1
+                elif isinstance(outcome, ValueError):
+                    state.failed += 1
+                    failures.append({"line": number, "error": str(outcome)})
+                else:
+                    interrupted = interrupted or outcome
+                    continue
+                state.done.add(number)
+            if interrupted is None:
+                state.line = batch[-1][0]
+                state.done.clear()
+            await _run_blocking(state.save, failures)
+            errors.extend(failures[: max(0, _IMPORT_ERRORS_KEPT - len(errors))])
+            await progress(state.imported + state.failed, None)
+            if interrupted is not None:
+                raise interrupted
+    finally:
+        records.close()
+    await _run_blocking(state.finish)
+    summary = {
+        "path": str(path),
+        "imported": state.imported,
+        "failed": state.failed,
+        "errors": errors,
+        "resumed": resumed,
+    }
+    if state.failed:
+        summary["errors_file"] = str(state.errors)
+    return summary
+
+
+def describe_sessions(tenant: Optional[str] = None) -> list[Dict[str, Any]]:
+    """Active sessions, most recently used first, with what each holds and has used."""
+
+    described = []
+    for session, state in _SESSIONS.items(tenant):
+        info = state.describe()
+        info["subscriptions"] = _VERSIONS.subscribed(session)
+        if state.warmer is not None:
+            info["warm"] = state.warmer.stats()
+        described.append(info)
+    return described
+
+
+_WARMERS: set[SessionWarmer] = set()
+_WARM_LIMITER = asyncio.Semaphore(max(1, ENV_WARM_CONCURRENCY))
+
+
+def _listing_request(default_user: str, graph_default: bool) -> Dict[str, Any]:
+    """The get_memories payload of a call without arguments."""
+
+    return {"filters": compile_filters(None, default_user), "enable_graph": graph_default}
+
+
+@asynccontextmanager
+async def _session_lifespan(server: FastMCP) -> AsyncIterator[Optional[SessionWarmer]]:
+    """Per-session state: start warming the default listing when the session opens.
+
+    Runs once per MCP session (per process over stdio). Only the server-wide API key can be
+    warmed: session config only arrives with the first request.
+    """
+
+    if not (ENV_WARM_SESSIONS and ENV_API_KEY):
+        yield None
+        return
+    api_key = ENV_API_KEY
+    request = _listing_request(ENV_DEFAULT_USER_ID, ENV_ENABLE_GRAPH_DEFAULT)
+
+    async def fetch() -> Any:
+        with metrics.background("warm"):
+            return await _cached_mem0_request(api_key, "get_memories", "get_all", **request)
+
+    warmer = SessionWarmer(
+        tenant_of(api_key),
+        request,
+        request["filters"].scopes,
+        fetch,
+        _WARM_LIMITER,
+        refresh_after=ENV_WARM_REFRESH,
+        max_age=ENV_WARM_MAX_AGE,
+    )
+    _WARMERS.add(warmer)
+    warmer.start()
+    try:
+        yield warmer
+    finally:
+        _WARMERS.discard(warmer)
+        await warmer.aclose()
+
+
+def _session_warmer(ctx: ToolContext | None, api_key: str) -> Optional[SessionWarmer]:
+    warmer = _session_state(ctx).warmer
+    if isinstance(warmer, SessionWarmer) and warmer.tenant == tenant_of(api_key):
+        return warmer
+    return None
+
+
+_RESOURCE_KINDS = {"users": "user_id", "agents": "agent_id", "apps": "app_id", "runs": "run_id"}
+
+
+def _resource_scope(uri: str, default_user: str) -> Optional[tuple[str, str]]:
+    """The scope a memory resource URI lists, e.g. ("user_id", "alice")."""
+
+    if uri == "mem0://memories/recent":
+        return ("user_id", default_user)
+    kind, _, rest = uri.removeprefix("mem0://").partition("/")
+    value, _, tail = rest.partition("/")
+    if kind in _RESOURCE_KINDS and value and tail == "memories":
+        return (_RESOURCE_KINDS[kind], value)
+    return None
+
+
+def _recent(result: Any, limit: int) -> list[Any]:
+    items = _page_items(result)
+    items.sort(key=lambda item: str(item.get("updated_at") or item.get("created_at") or ""))
+    return items[::-1][:limit]
 
 
-def _resolve_settings(ctx: Context | None) -> tuple[str, str, bool]:
+def _resolve_session(ctx: ToolContext | None, lifespan_context: Any = None) -> SessionState:
+    """Resolve the session config, defaults and admission limits behind a tool call."""
+
     session_config = getattr(ctx, "session_config", None)
-    api_key = _config_value(session_config, "mem0_api_key") or ENV_API_KEY
+    config = {
+        name: value
+        for name in ConfigSchema.model_fields
+        if (value := _config_value(session_config, name)) is not None
+    }
+    api_key = config.get("mem0_api_key") or ENV_API_KEY
     if not api_key:
         raise RuntimeError(
             "MEM0_API_KEY is required (via Smithery config, session config, or environment) to run the Mem0 MCP server."
         )
 
-    default_user = _config_value(session_config, "default_user_id") or ENV_DEFAULT_USER_ID
-    enable_graph_default = _config_value(session_config, "enable_graph_default")
+    enable_graph_default = config.get("enable_graph_default")
     if enable_graph_default is None:
         enable_graph_default = ENV_ENABLE_GRAPH_DEFAULT
+    tenant = tenant_of(api_key)
+    return SessionState(
+        tenant=tenant,
+        api_key=api_key,
+        default_user=config.get("default_user_id") or ENV_DEFAULT_USER_ID,
+        graph_default=bool(enable_graph_default),
+        config=config,
+        limits=_ADMISSION.limits.tightened(
+            rate=config.get("rate_limit"),
+            burst=config.get("rate_burst"),
+            concurrency=config.get("max_concurrency"),
+        ),
+        warmer=lifespan_context if isinstance(lifespan_context, SessionWarmer) else None,
+    )
+
+
+def _request_context(ctx: ToolContext | None) -> Any:
+    try:
+        return ctx.request_context  # type: ignore[union-attr]
+    except (AttributeError, ValueError):  # no ctx, or called outside a request
+        return None
+
+
+def _session_state(ctx: ToolContext | None) -> SessionState:
+    """The calling session's state, resolved on its first call; per call outside a session."""
+
+    request_context = _request_context(ctx)
+    if request_context is None:
+        return _resolve_session(ctx)
+    state = _SESSIONS.get(request_context.session)
+    if state is None:
+        state = _resolve_session(ctx, request_context.lifespan_context)
+        _SESSIONS.add(request_context.session, state)
+    return state
+
+
+def _resolve_settings(ctx: ToolContext | None) -> tuple[str, str, bool]:
+    with tracing.span("resolve_settings"):
+        state = _session_state(ctx)
+    return state.api_key, state.default_user, state.graph_default
+
 
-    return api_key, default_user, enable_graph_default
+def _session_flag(ctx: ToolContext | None, field: str, default: bool) -> bool:
+    return _session_state(ctx).flag(field, default)
 
 
-# init the client
-def _mem0_client(api_key: str) -> MemoryClient:
-    client = _CLIENT_CACHE.get(api_key)
-    if client is None:
-        client = MemoryClient(api_key=api_key)
-        _CLIENT_CACHE[api_key] = client
-    return client
+# tools whose memories are projected onto MEM0_RESPONSE_FIELDS
+_READ_TOOLS = frozenset({"search_memories", "search_memories_batch", "get_memories", "get_memory"})
+
+
+FieldsArg = Annotated[
+    Optional[list[str]],
+    Field(
+        default=None,
+        description='Only return these memory fields, e.g. ["memory", "score"] (id is always kept).',
+    ),
+]
+CompactArg = Annotated[
+    Optional[bool],
+    Field(
+        default=None,
+        description="Return only the essential memory fields and drop empty values.",
+    ),
+]
+
+
+def _response_shape(
+    ctx: ToolContext | None,
+    tool: str,
+    fields: Optional[list[str]] = None,
+    compact: Optional[bool] = None,
+) -> ResponseShape:
+    """Combine per-call shaping arguments with session and server-wide defaults."""
+
+    if compact is None:
+        compact = _session_flag(ctx, "compact_responses", ENV_RESPONSE_COMPACT)
+    if not fields and tool in _READ_TOOLS:
+        fields = ENV_RESPONSE_FIELDS
+    return ResponseShape.build(tool, fields, compact, ENV_RESPONSE_MAX_CHARS)
+
+
+def _trace_carrier(ctx: ToolContext | None) -> Optional[Dict[str, str]]:
+    """W3C trace context sent by the client, from the request's `_meta` or HTTP headers."""
+
+    request_context = _request_context(ctx)
+    if request_context is None:
+        return None
+    meta = request_context.meta.model_extra if request_context.meta is not None else None
+    headers = getattr(request_context.request, "headers", None)
+    carrier = {}
+    for field in tracing.CARRIER_FIELDS:
+        value = (meta or {}).get(field) or (headers.get(field) if headers is not None else None)
+        if isinstance(value, str):
+            carrier[field] = value
+    return carrier or None
+
+
+def _instrumented(func: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """Record call counts, latency (upstream vs local) and response size for a tool."""
+
+    tool = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> str:
+        ctx = kwargs.get("ctx")
+        carrier = _trace_carrier(ctx) if tracing.enabled() else None
+        started = time.perf_counter()
+        with (
+            tracing.span(f"tool {tool}", carrier, {"mcp.tool.name": tool}) as span,
+            metrics.tool_call(tool) as call,
+        ):
+            body = await func(*args, **kwargs)
+            span.set_attribute("mcp.tool.outcome", call.outcome)
+            span.set_attribute("mcp.response.bytes", len(body))
+        metrics.record_response(tool, body)
+        request_context = _request_context(ctx)
+        state = _SESSIONS.get(request_context.session) if request_context is not None else None
+        if state is not None:
+            state.record(call.outcome, len(body), time.perf_counter() - started, call.upstream)
+        return body
+
+    return wrapper
+
+
+# admission class per tool; graph-enabled calls of any tool count as EXPENSIVE
+_TOOL_CLASSES = {
+    "add_memory": EXPENSIVE,
+    "add_memories": EXPENSIVE,
+    "delete_memories": EXPENSIVE,
+    "update_memories": EXPENSIVE,
+    "export_memories": EXPENSIVE,
+    "import_memories": EXPENSIVE,
+    "update_memory": WRITE,
+    "delete_memory": WRITE,
+    "delete_all_memories": WRITE,
+    "delete_entities": WRITE,
+}
+
+
+def _admitted(func: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """Run a tool under its tenant's admission limits, answering `throttled` when refused."""
+
+    tool = func.__name__
+    graph_aware = "enable_graph" in inspect.signature(func).parameters
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> str:
+        state = _session_state(kwargs.get("ctx"))
+        limits = state.limits
+        if not limits.active and _ADMISSION.max_concurrent <= 0:
+            return await func(*args, **kwargs)
+        priority = _TOOL_CLASSES.get(tool, READ)
+        if graph_aware and _default_enable_graph(kwargs.get("enable_graph"), state.graph_default):
+            priority = EXPENSIVE
+        cost = ENV_RATE_EXPENSIVE_COST if priority == EXPENSIVE else 1.0
+        try:
+            async with _ADMISSION.admit(state.tenant, cost, priority, limits):
+                return await func(*args, **kwargs)
+        except Throttled as exc:
+            metrics.set_outcome("throttled")
+            return dumps(exc.body())
+
+    return wrapper
+
+
+def _runtime_gauges() -> Dict[str, tuple[str, float]]:
+    clients = _CLIENTS.stats()
+    ingest = _INGEST.stats()
+    gauges = {
+        "mem0_mcp_cache_entries": ("Read cache entries.", _RESULT_CACHE.stats()["entries"]),
+        "mem0_mcp_clients_open": ("Upstream clients open.", clients["live_clients"]),
+        "mem0_mcp_pool_connections": ("Pooled upstream connections.", clients["pool_connections"]),
+        "mem0_mcp_ingest_queued": ("Writes waiting in the ingest queue.", ingest["queued"]),
+        "mem0_mcp_ingest_in_flight": ("Queued writes being sent.", ingest["in_flight"]),
+        "mem0_mcp_page_streams": ("Open cursor streams.", _PAGE_CURSORS.stats()["streams"]),
+        "mem0_mcp_breakers_open": (
+            "Tenants whose circuit breaker is open.",
+            _BREAKERS.stats()["open"],
+        ),
+        "mem0_mcp_admission_waiting": (
+            "Tool calls waiting for an admission slot.",
+            _ADMISSION.stats()["waiting"],
+        ),
+        "mem0_mcp_dedup_entries": (
+            "Recent write texts kept for deduplication.",
+            _DEDUP.stats()["entries"],
+        ),
+        "mem0_mcp_delta_turns": (
+            "Ingested conversation turns remembered for delta ingestion.",
+            _DELTA.stats()["turns"],
+        ),
+        "mem0_mcp_sessions": ("MCP sessions with resolved state.", _SESSIONS.stats()["sessions"]),
+        "mem0_mcp_warm_sessions": ("Sessions holding a warm memory listing.", len(_WARMERS)),
+        "mem0_mcp_resource_subscriptions": (
+            "Memory resource subscriptions held by sessions.",
+            _VERSIONS.stats()["subscriptions"],
+        ),
+        "mem0_mcp_reads_in_flight": (
+            "Distinct upstream reads in flight.",
+            _READS_IN_FLIGHT.stats()["in_flight"],
+        ),
+    }
+    if _STORE is not None:
+        gauges["mem0_mcp_store_memories"] = ("Locally stored memories.", _STORE.stats()["memories"])
+    return gauges
+
+
+metrics.REGISTRY.add_collector(_runtime_gauges)
 
 
 def _default_enable_graph(enable_graph: Optional[bool], default: bool) -> bool:
@@ -145,7 +1455,107 @@ def _default_enable_graph(enable_graph: Optional[bool], default: bool) -> bool:
     return enable_graph
 
 
-@smithery.server(config_schema=ConfigSchema)
+_MESSAGES_MISSING = {
+    "error": "messages_missing",
+    "detail": "Provide either `text` or `messages` so Mem0 knows what to store.",
+}
+
+
+def _apply_add_defaults(args: AddMemoryArgs, default_user: str, graph_default: bool) -> AddMemoryArgs:
+    """Fill in the server user scope and graph toggle the way add_memory does."""
+
+    updates: Dict[str, Any] = {"enable_graph": _default_enable_graph(args.enable_graph, graph_default)}
+    if not args.user_id and not (args.agent_id or args.run_id):
+        updates["user_id"] = default_user
+    return args.model_copy(update=updates)
+
+
+def _deduplicate(
+    ctx: ToolContext | None, api_key: str, conversation: list[Dict[str, Any]], payload: Dict[str, Any]
+) -> tuple[Optional[Duplicate], Optional[int]]:
+    """Check an add against recent writes to its scope; see DedupIndex.check."""
+
+    if not _session_flag(ctx, "dedup_writes", ENV_DEDUP_WRITES):
+        return None, None
+    text = "\n".join(str(message.get("content", "")) for message in conversation)
+    duplicate, entry = _DEDUP.check(tenant_of(api_key), scope_of(payload), text)
+    if duplicate is not None:
+        metrics.record_deduplicated()
+    return duplicate, entry
+
+
+def _undo_dedup(api_key: str, payload: Dict[str, Any], entry: Optional[int]) -> None:
+    # a failed write must not suppress its retry
+    if entry is not None:
+        _DEDUP.discard(tenant_of(api_key), scope_of(payload), entry)
+
+
+async def _add_delta(
+    api_key: str,
+    turns: list[Dict[str, Any]],
+    payload: Dict[str, Any],
+    hashes: list[bytes],
+    skipped: int,
+    shape: ResponseShape,
+    dedup_entry: Optional[int] = None,
+) -> str:
+    """Send the new turns of a history in concurrent chunks and record what got ingested."""
+
+    chunks = chunked(turns, ENV_DELTA_CHUNK_TURNS)
+    semaphore = asyncio.Semaphore(ENV_BATCH_CONCURRENCY)
+
+    async def send(chunk: list[Dict[str, Any]]) -> Any:
+        async with semaphore:
+            return await _mem0_request(api_key, "add", chunk, **payload)
+
+    outcomes = await asyncio.gather(*(send(chunk) for chunk in chunks), return_exceptions=True)
+    # only a gap-free prefix counts as ingested: a retry resends from the first failed chunk
+    ingested = skipped
+    for chunk, outcome in zip(chunks, outcomes):
+        if isinstance(outcome, BaseException):
+            break
+        ingested += len(chunk)
+    _DELTA.record(tenant_of(api_key), scope_of(payload), hashes[:ingested])
+    counts = {"skipped_turns": skipped, "sent_turns": ingested - skipped, "chunks": len(chunks)}
+    errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    if errors:
+        _undo_dedup(api_key, payload, dedup_entry)
+        if not isinstance(errors[0], _upstream_errors()):
+            raise errors[0]
+        return _error({**_error_body(errors[0]), **counts})
+    results = [outcome for outcome in outcomes if not isinstance(outcome, BaseException)]
+    if len(results) == 1:
+        result = results[0]
+    else:
+        result = {
+            "results": [
+                item for outcome in results for item in (result_items(outcome) or [outcome])
+            ]
+        }
+    shaped = shape.apply(result)
+    if not isinstance(shaped, dict):
+        shaped = {"results": shaped}
+    return _render(_UNSHAPED, {**shaped, **counts})
+
+
+def _add_request(
+    args: AddMemoryArgs, graph_default: bool
+) -> tuple[Optional[list[Dict[str, Any]]], Dict[str, Any]]:
+    """Split validated add arguments into the conversation and the client.add kwargs."""
+
+    payload = args.model_dump(exclude_none=True)
+    payload.setdefault("enable_graph", graph_default)
+    conversation = payload.pop("messages", None)
+    if not conversation:
+        derived_text = payload.pop("text", None)
+        if derived_text:
+            conversation = [{"role": "user", "content": derived_text}]
+    else:
+        payload.pop("text", None)
+    return conversation, payload
+
+
+@smithery.server(config_schema=ConfigSchema)  # type: ignore[untyped-decorator, unused-ignore]
 def create_server() -> FastMCP:
     """Create a FastMCP server usable via stdio, Docker, or Smithery."""
 
@@ -156,19 +1566,23 @@ def create_server() -> FastMCP:
             "MEM0_API_KEY is not set; Smithery health checks will pass, but every tool "
             "invocation will fail until a key is supplied via session config or env vars."
         )
+    tracing.configure(ENV_TRACING, ENV_TRACING_FILE)
 
     server = FastMCP(
         "mem0",
         host=os.getenv("HOST", "0.0.0.0"),
         port=int(os.getenv("PORT", "8081")),
         transport_security=TransportSecuritySettings(enable_dns_rebinding_protection=False),
+        lifespan=_session_lifespan,
     )
 
     # graph is disabled by default to make queries simpler and fast
     # Mention " Enable/Use graph while calling memory " in your system prompt to run it in each instance
 
     @server.tool(description="Store a new preference, fact, or conversation snippet. Requires at least one: user_id, agent_id, or run_id.")
-    def add_memory(
+    @_instrumented
+    @_admitted
+    async def add_memory(
         text: Annotated[
             str,
             Field(
@@ -207,41 +1621,161 @@ def create_server() -> FastMCP:
                 description="Set true only if the caller explicitly wants Mem0 graph memory.",
             ),
         ] = None,
-        ctx: Context | None = None,
+        ctx: ToolContext | None = None,
     ) -> str:
         """Write durable information to Mem0."""
 
         api_key, default_user, graph_default = _resolve_settings(ctx)
-        args = AddMemoryArgs(
-            text=text,
-            messages=[ToolMessage(**msg) for msg in messages] if messages else None,
-            user_id=user_id if user_id else (default_user if not (agent_id or run_id) else None),
-            agent_id=agent_id,
-            app_id=app_id,
-            run_id=run_id,
-            metadata=metadata,
-            enable_graph=_default_enable_graph(enable_graph, graph_default),
-        )
-        payload = args.model_dump(exclude_none=True)
-        payload.setdefault("enable_graph", graph_default)
-        conversation = payload.pop("messages", None)
+        with tracing.span("validate_args"):
+            args = AddMemoryArgs(
+                text=text,
+                messages=[ToolMessage(**msg) for msg in messages] if messages else None,
+                user_id=user_id
+                if user_id
+                else (default_user if not (agent_id or run_id) else None),
+                agent_id=agent_id,
+                app_id=app_id,
+                run_id=run_id,
+                metadata=metadata,
+                enable_graph=_default_enable_graph(enable_graph, graph_default),
+            )
+        conversation, payload = _add_request(args, graph_default)
         if not conversation:
-            derived_text = payload.pop("text", None)
-            if derived_text:
-                conversation = [{"role": "user", "content": derived_text}]
-            else:
-                return json.dumps(
+            return _error(_MESSAGES_MISSING)
+        hashes: Optional[list[bytes]] = None
+        skipped = 0
+        if messages and _session_flag(ctx, "delta_messages", ENV_DELTA_MESSAGES):
+            hashes = turn_hashes(conversation)
+            skipped = _DELTA.skip(tenant_of(api_key), scope_of(payload), hashes)
+            if skipped == len(conversation):
+                return _render(
+                    _UNSHAPED,
                     {
-                        "error": "messages_missing",
-                        "detail": "Provide either `text` or `messages` so Mem0 knows what to store.",
+                        "status": "unchanged",
+                        "skipped_turns": skipped,
+                        "detail": "Every turn was already stored for this scope.",
                     },
-                    ensure_ascii=False,
                 )
-        else:
-            payload.pop("text", None)
+            conversation = conversation[skipped:]
+        duplicate, entry = _deduplicate(ctx, api_key, conversation, payload)
+        if duplicate is not None:
+            return _render(_UNSHAPED, duplicate.body())
+
+        if _session_flag(ctx, "async_writes", ENV_ASYNC_WRITES):
+            try:
+                job = await _INGEST.enqueue(
+                    api_key,
+                    conversation,
+                    payload,
+                    # the turns only count as ingested once the queued write went through
+                    on_success=(
+                        functools.partial(
+                            _DELTA.record, tenant_of(api_key), scope_of(payload), hashes
+                        )
+                        if hashes is not None
+                        else None
+                    ),
+                    on_failure=functools.partial(_undo_dedup, api_key, payload, entry),
+                )
+            except QueueFullError as exc:
+                _undo_dedup(api_key, payload, entry)
+                return _error(
+                    {
+                        "error": "queue_full",
+                        "detail": str(exc),
+                        "retry_after": ENV_INGEST_ENQUEUE_TIMEOUT,
+                    },
+                )
+            queued: Dict[str, Any] = {
+                "job_id": job.id,
+                "status": job.status,
+                "detail": "Queued; call get_add_status with this job_id for the outcome.",
+            }
+            if hashes is not None:
+                queued["skipped_turns"] = skipped
+            return _render(_UNSHAPED, queued)
+
+        shape = _response_shape(ctx, "add_memory")
+        if hashes is not None:
+            return await _add_delta(api_key, conversation, payload, hashes, skipped, shape, entry)
+        try:
+            result = await _mem0_request(api_key, "add", conversation, **payload)
+        except _upstream_errors() as exc:
+            _undo_dedup(api_key, payload, entry)
+            return _error_response(exc)
+        return _render(shape, result)
 
-        client = _mem0_client(api_key)
-        return _mem0_call(client.add, conversation, **payload)
+    @server.tool(
+        description="Store many memories in one call (bulk import or end-of-session flush). "
+        "Each item takes the same fields as add_memory; results come back in the same order."
+    )
+    @_instrumented
+    @_admitted
+    async def add_memories(
+        items: Annotated[
+            list[AddMemoryArgs],
+            Field(
+                description="Memories to store, each with `text` or `messages` plus optional "
+                "user_id/agent_id/app_id/run_id/metadata/enable_graph.",
+                min_length=1,
+                max_length=ENV_BATCH_MAX_ITEMS,
+            ),
+        ],
+        ctx: ToolContext | None = None,
+    ) -> str:
+        """Write a batch of memories to Mem0 with bounded concurrency."""
+
+        api_key, default_user, graph_default = _resolve_settings(ctx)
+        semaphore = asyncio.Semaphore(ENV_BATCH_CONCURRENCY)
+        shape = _response_shape(ctx, "add_memories")
+
+        async def _store(index: int, item: AddMemoryArgs) -> Dict[str, Any]:
+            conversation, payload = _add_request(
+                _apply_add_defaults(item, default_user, graph_default), graph_default
+            )
+            if not conversation:
+                return {"index": index, "status": "error", **_MESSAGES_MISSING}
+            duplicate, entry = _deduplicate(ctx, api_key, conversation, payload)
+            if duplicate is not None:
+                return {"index": index, **duplicate.body()}
+            async with semaphore:
+                try:
+                    result = await _mem0_request(api_key, "add", conversation, **payload)
+                except _upstream_errors() as exc:
+                    _undo_dedup(api_key, payload, entry)
+                    return {"index": index, "status": "error", **_error_body(exc)}
+            return {"index": index, "status": "ok", "result": shape.apply(result)}
+
+        results = await asyncio.gather(*(_store(i, item) for i, item in enumerate(items)))
+        deduplicated = sum(1 for item in results if item["status"] == "deduplicated")
+        failed = sum(1 for item in results if item["status"] != "ok") - deduplicated
+        return _render(
+            _UNSHAPED,
+            {
+                "total": len(results),
+                "succeeded": len(results) - failed - deduplicated,
+                "failed": failed,
+                "deduplicated": deduplicated,
+                "results": results,
+            },
+        )
+
+    @server.tool(description="Check the outcome of an add_memory call that was queued in the background.")
+    @_instrumented
+    @_admitted
+    async def get_add_status(
+        job_id: Annotated[str, Field(description="job_id returned by a queued add_memory call.")],
+        ctx: ToolContext | None = None,
+    ) -> str:
+        """Report the status of a queued add_memory job."""
+
+        api_key, _, _ = _resolve_settings(ctx)
+        job = _INGEST.job(api_key, job_id)
+        if job is None:
+            return _error(
+                {"error": "job_not_found", "detail": f"No queued write with job_id {job_id}."},
+            )
+        return _render(_UNSHAPED, job.describe())
 
     @server.tool(
         description="""Run a semantic search over existing memories.
@@ -256,7 +1790,9 @@ def create_server() -> FastMCP:
         user_id is automatically added to filters if not provided.
         """
     )
-    def search_memories(
+    @_instrumented
+    @_admitted
+    async def search_memories(
         query: Annotated[str, Field(description="Natural language description of what to find.")],
         filters: Annotated[
             Optional[Dict[str, Any]],
@@ -272,22 +1808,146 @@ def create_server() -> FastMCP:
                 description="Set true only when the user explicitly wants graph-derived memories.",
             ),
         ] = None,
-        ctx: Context | None = None,
+        rerank: Annotated[
+            Optional[bool],
+            Field(
+                default=None,
+                description="Re-rank a larger candidate set locally by keyword match and drop "
+                "near-repeats, returning fewer redundant memories.",
+            ),
+        ] = None,
+        fields: FieldsArg = None,
+        compact: CompactArg = None,
+        ctx: ToolContext | None = None,
     ) -> str:
         """Semantic search against existing memories."""
 
         api_key, default_user, graph_default = _resolve_settings(ctx)
-        args = SearchMemoriesArgs(
-            query=query,
-            filters=filters,
-            limit=limit,
-            enable_graph=_default_enable_graph(enable_graph, graph_default),
-        )
+        with tracing.span("validate_args"):
+            args = SearchMemoriesArgs(
+                query=query,
+                filters=filters,
+                limit=limit,
+                enable_graph=_default_enable_graph(enable_graph, graph_default),
+            )
         payload = args.model_dump(exclude_none=True)
-        payload["filters"] = _with_default_filters(default_user, payload.get("filters"))
+        try:
+            with tracing.span("compile_filters"):
+                payload["filters"] = compile_filters(payload.get("filters"), default_user)
+        except FilterError as exc:
+            return _invalid_filters(exc)
         payload.setdefault("enable_graph", graph_default)
-        client = _mem0_client(api_key)
-        return _mem0_call(client.search, **payload)
+        shape = _response_shape(ctx, "search_memories", fields, compact)
+        if not (ENV_RERANK if rerank is None else rerank):
+            return await _cached_mem0_call(
+                api_key, "search_memories", "search", shape=shape, **payload
+            )
+        wanted = payload.get("limit") or _SEARCH_DEFAULT_LIMIT
+        candidates = min(wanted * ENV_RERANK_OVERFETCH, ENV_RERANK_MAX_CANDIDATES)
+        payload["limit"] = max(wanted, candidates)
+        try:
+            result = await _cached_mem0_request(api_key, "search_memories", "search", **payload)
+        except _upstream_errors() as exc:
+            return _error_response(exc)
+        return _render(shape, _reranked(query, result, wanted))
+
+    @server.tool(
+        description="""Run several phrasings of a search at once and get one merged list.
+
+        Use this instead of repeated search_memories calls when expanding a request into
+        synonyms. Hits are deduplicated by memory id and ranked with reciprocal-rank fusion
+        (`rrf`, rewards memories found by several queries) or by best score (`max`).
+        Filters follow search_memories; user_id is automatically added if not provided.
+        """
+    )
+    @_instrumented
+    @_admitted
+    async def search_memories_batch(
+        queries: Annotated[
+            list[str],
+            Field(
+                description="Natural language queries to run together.",
+                min_length=1,
+                max_length=ENV_SEARCH_BATCH_MAX_QUERIES,
+            ),
+        ],
+        filters: Annotated[
+            Optional[Dict[str, Any]],
+            Field(default=None, description="Filter clauses shared by every query."),
+        ] = None,
+        limit: Annotated[
+            Optional[int],
+            Field(default=None, description="Maximum number of merged results to return."),
+        ] = None,
+        fusion: Annotated[
+            Literal["rrf", "max"],
+            Field(default="rrf", description="How to combine scores: `rrf` or `max`."),
+        ] = "rrf",
+        enable_graph: Annotated[
+            Optional[bool],
+            Field(
+                default=None,
+                description="Set true only when the user explicitly wants graph-derived memories.",
+            ),
+        ] = None,
+        fields: FieldsArg = None,
+        compact: CompactArg = None,
+        ctx: ToolContext | None = None,
+    ) -> str:
+        """Concurrent multi-query search with merged, deduplicated results."""
+
+        api_key, default_user, graph_default = _resolve_settings(ctx)
+        unique_queries = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+        if not unique_queries:
+            return _error(
+                {"error": "queries_missing", "detail": "Provide at least one non-empty query."},
+            )
+        with tracing.span("validate_args"):
+            base = SearchMemoriesArgs(
+                query=unique_queries[0],
+                filters=filters,
+                limit=limit,
+                enable_graph=_default_enable_graph(enable_graph, graph_default),
+            ).model_dump(exclude_none=True)
+        try:
+            with tracing.span("compile_filters"):
+                base["filters"] = compile_filters(base.get("filters"), default_user)
+        except FilterError as exc:
+            return _invalid_filters(exc)
+        base.setdefault("enable_graph", graph_default)
+
+        async def _search(query: str) -> Any:
+            payload = {**base, "query": query}
+            return await _cached_mem0_request(api_key, "search_memories", "search", **payload)
+
+        outcomes = await asyncio.gather(
+            *(_search(query) for query in unique_queries), return_exceptions=True
+        )
+        errors = []
+        succeeded: list[tuple[str, Any]] = []
+        for query, outcome in zip(unique_queries, outcomes):
+            if isinstance(outcome, _upstream_errors()):
+                errors.append({"query": query, **_error_body(outcome)})
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                succeeded.append((query, outcome))
+        if not succeeded:
+            return _error({"error": "all_queries_failed", "errors": errors})
+
+        merged = fuse_results(
+            [result_items(result) for _, result in succeeded],
+            [query for query, _ in succeeded],
+            method=fusion,
+            limit=limit,
+        )
+        response: Dict[str, Any] = {"results": merged, "queries": len(unique_queries)}
+        relations = merge_relations([result for _, result in succeeded])
+        if relations:
+            response["relations"] = relations
+        if errors:
+            response["errors"] = errors
+        return _render(_response_shape(ctx, "search_memories_batch", fields, compact), response)
 
     @server.tool(
         description="""Page through memories using filters instead of search.
@@ -298,11 +1958,15 @@ def create_server() -> FastMCP:
         - Recent memories: {"AND": [{"user_id": "john"}, {"created_at": {"gte": "2024-01-01"}}]}
         - Multiple users: {"AND": [{"user_id": {"in": ["john", "jane"]}}]}
 
-        Pagination: Use page (1-indexed) and page_size for browsing results.
+        Pagination: Use page (1-indexed) and page_size for browsing results. Paged responses
+        include `next_cursor` when more pages exist; pass it back as `cursor` to continue (the
+        next page is already being fetched). Use max_items to collect several pages at once.
         user_id is automatically added to filters if not provided.
         """
     )
-    def get_memories(
+    @_instrumented
+    @_admitted
+    async def get_memories(
         filters: Annotated[
             Optional[Dict[str, Any]],
             Field(default=None, description="Structured filters; user_id injected automatically."),
@@ -320,27 +1984,89 @@ def create_server() -> FastMCP:
                 description="Set true only if the caller explicitly wants graph-derived memories.",
             ),
         ] = None,
-        ctx: Context | None = None,
+        cursor: Annotated[
+            Optional[str],
+            Field(
+                default=None,
+                description="`next_cursor` from a previous get_memories call; continues that "
+                "listing (filters/page/page_size are taken from the original call).",
+            ),
+        ] = None,
+        max_items: Annotated[
+            Optional[int],
+            Field(
+                default=None,
+                ge=1,
+                le=ENV_MAX_COLLECT_ITEMS,
+                description="Collect up to this many memories across pages in a single call.",
+            ),
+        ] = None,
+        fields: FieldsArg = None,
+        compact: CompactArg = None,
+        ctx: ToolContext | None = None,
     ) -> str:
         """List memories via structured filters or pagination."""
 
         api_key, default_user, graph_default = _resolve_settings(ctx)
-        args = GetMemoriesArgs(
-            filters=filters,
-            page=page,
-            page_size=page_size,
-            enable_graph=_default_enable_graph(enable_graph, graph_default),
-        )
-        payload = args.model_dump(exclude_none=True)
-        payload["filters"] = _with_default_filters(default_user, payload.get("filters"))
-        payload.setdefault("enable_graph", graph_default)
-        client = _mem0_client(api_key)
-        return _mem0_call(client.get_all, **payload)
+        shape = _response_shape(ctx, "get_memories", fields, compact)
+        if cursor:
+            resolved = _PAGE_CURSORS.resolve(api_key, cursor)
+            if resolved is None:
+                return _error(
+                    {
+                        "error": "cursor_expired",
+                        "detail": "Unknown or expired cursor; start again without `cursor`.",
+                    },
+                )
+            stream, start_page, skip = resolved
+        else:
+            with tracing.span("validate_args"):
+                args = GetMemoriesArgs(
+                    filters=filters,
+                    page=page,
+                    page_size=page_size,
+                    enable_graph=_default_enable_graph(enable_graph, graph_default),
+                    max_items=max_items,
+                )
+            payload = args.model_dump(exclude_none=True, exclude={"max_items"})
+            try:
+                with tracing.span("compile_filters"):
+                    payload["filters"] = compile_filters(payload.get("filters"), default_user)
+            except FilterError as exc:
+                return _invalid_filters(exc)
+            payload.setdefault("enable_graph", graph_default)
+            if page_size is None and max_items is None:
+                warmer = _session_warmer(ctx, api_key)
+                if warmer is not None and keyable(payload) == keyable(warmer.request):
+                    warm = warmer.snapshot()
+                    if warm is not None:
+                        return _render(shape, warm)
+                local = await _local_listing(api_key, payload)
+                if local is not None:
+                    return _render(shape, local)
+                return await _cached_mem0_call(
+                    api_key, "get_memories", "get_all", shape=shape, **payload
+                )
+            start_page, skip = payload.pop("page", None) or 1, 0
+            if page_size is None:
+                payload["page_size"] = min(max_items or ENV_PAGE_SIZE, ENV_PAGE_SIZE)
+            stream = _PAGE_CURSORS.open(api_key, payload, _page_fetcher(api_key, payload))
+
+        try:
+            if max_items:
+                response = await _collect(stream, start_page, skip, max_items, ctx)
+            else:
+                response = await _read_page(stream, start_page, skip)
+        except _upstream_errors() as exc:
+            return _error_response(exc)
+        return _render(shape, response)
 
     @server.tool(
         description="Delete every memory in the given user/agent/app/run but keep the entity."
     )
-    def delete_all_memories(
+    @_instrumented
+    @_admitted
+    async def delete_all_memories(
         user_id: Annotated[
             Optional[str], Field(default=None, description="User scope to delete; defaults to server user.")
         ] = None,
@@ -353,67 +2079,327 @@ def create_server() -> FastMCP:
         run_id: Annotated[
             Optional[str], Field(default=None, description="Optional run scope to delete.")
         ] = None,
-        ctx: Context | None = None,
+        ctx: ToolContext | None = None,
     ) -> str:
         """Bulk-delete every memory in the confirmed scope."""
 
         api_key, default_user, _ = _resolve_settings(ctx)
-        args = DeleteAllArgs(
-            user_id=user_id or default_user,
-            agent_id=agent_id,
-            app_id=app_id,
-            run_id=run_id,
+        with tracing.span("validate_args"):
+            args = DeleteAllArgs(
+                user_id=user_id or default_user,
+                agent_id=agent_id,
+                app_id=app_id,
+                run_id=run_id,
+            )
+        return await _mem0_call(
+            api_key,
+            "delete_all",
+            shape=_response_shape(ctx, "delete_all_memories"),
+            **args.model_dump(exclude_none=True),
         )
-        payload = args.model_dump(exclude_none=True)
-        client = _mem0_client(api_key)
-        return _mem0_call(client.delete_all, **payload)
 
     @server.tool(description="List which users/agents/apps/runs currently hold memories.")
-    def list_entities(ctx: Context | None = None) -> str:
+    @_instrumented
+    @_admitted
+    async def list_entities(ctx: ToolContext | None = None) -> str:
         """List users/agents/apps/runs with stored memories."""
 
         api_key, _, _ = _resolve_settings(ctx)
-        client = _mem0_client(api_key)
-        return _mem0_call(client.users)
+        return await _mem0_call_or_local(
+            api_key,
+            lambda: {"results": _local_store().entities(tenant_of(api_key)), "stale": True},
+            "users",
+        )
 
     @server.tool(description="Fetch a single memory once you know its memory_id.")
-    def get_memory(
+    @_instrumented
+    @_admitted
+    async def get_memory(
         memory_id: Annotated[str, Field(description="Exact memory_id to fetch.")],
-        ctx: Context | None = None,
+        fields: FieldsArg = None,
+        compact: CompactArg = None,
+        ctx: ToolContext | None = None,
     ) -> str:
         """Retrieve a single memory once the user has picked an exact ID."""
 
         api_key, _, _ = _resolve_settings(ctx)
-        client = _mem0_client(api_key)
-        return _mem0_call(client.get, memory_id)
+        shape = _response_shape(ctx, "get_memory", fields, compact)
+        warmer = _session_warmer(ctx, api_key)
+        warm = warmer.memory(memory_id) if warmer is not None else None
+        if warm is not None:
+            return _render(shape, warm)
+        if _STORE is not None:
+            local = await _run_blocking(_STORE.get, tenant_of(api_key), memory_id)
+            if local is not None:
+                return _render(shape, local)
+        return await _mem0_call_or_local(
+            api_key,
+            lambda: _local_store().get(tenant_of(api_key), memory_id, allow_stale=True),
+            "get",
+            memory_id,
+            shape=shape,
+        )
 
     @server.tool(description="Overwrite an existing memory’s text.")
-    def update_memory(
+    @_instrumented
+    @_admitted
+    async def update_memory(
         memory_id: Annotated[str, Field(description="Exact memory_id to overwrite.")],
         text: Annotated[str, Field(description="Replacement text for the memory.")],
-        ctx: Context | None = None,
+        ctx: ToolContext | None = None,
     ) -> str:
         """Overwrite an existing memory’s text after the user confirms the exact memory_id."""
 
         api_key, _, _ = _resolve_settings(ctx)
-        client = _mem0_client(api_key)
-        return _mem0_call(client.update, memory_id=memory_id, text=text)
+        return await _mem0_call(
+            api_key,
+            "update",
+            memory_id=memory_id,
+            text=text,
+            shape=_response_shape(ctx, "update_memory"),
+        )
 
     @server.tool(description="Delete one memory after the user confirms its memory_id.")
-    def delete_memory(
+    @_instrumented
+    @_admitted
+    async def delete_memory(
         memory_id: Annotated[str, Field(description="Exact memory_id to delete.")],
-        ctx: Context | None = None,
+        ctx: ToolContext | None = None,
     ) -> str:
         """Delete a memory once the user explicitly confirms the memory_id to remove."""
 
         api_key, _, _ = _resolve_settings(ctx)
-        client = _mem0_client(api_key)
-        return _mem0_call(client.delete, memory_id)
+        return await _mem0_call(api_key, "delete", memory_id)
+
+    @server.tool(
+        description="Delete many memories at once, by id or by filter (e.g. to clean up a bad "
+        "import). Call with dry_run=true first to see which memories a filter matches."
+    )
+    @_instrumented
+    @_admitted
+    async def delete_memories(
+        memory_ids: Annotated[
+            Optional[list[str]],
+            Field(
+                default=None,
+                description="Exact memory_ids to delete.",
+                max_length=ENV_BATCH_MAX_ITEMS,
+            ),
+        ] = None,
+        filters: Annotated[
+            Optional[Dict[str, Any]],
+            Field(
+                default=None,
+                description="Delete every memory matching these filters, as in get_memories "
+                "(user_id injected automatically). Ignored when memory_ids is given.",
+            ),
+        ] = None,
+        dry_run: Annotated[
+            bool,
+            Field(default=False, description="Only report which memories would be deleted."),
+        ] = False,
+        ctx: ToolContext | None = None,
+    ) -> str:
+        """Delete a list of memories, or those matching a filter, with per-id outcomes."""
+
+        api_key, default_user, _ = _resolve_settings(ctx)
+        truncated = False
+        if memory_ids:
+            matches = [{"id": memory_id} for memory_id in dict.fromkeys(memory_ids)]
+        elif filters:
+            try:
+                compiled = compile_filters(filters, default_user)
+            except FilterError as exc:
+                return _invalid_filters(exc)
+            request = {"filters": compiled, "page_size": ENV_PAGE_SIZE}
+            try:
+                matches, truncated = await _matching_memories(
+                    api_key, request, ENV_BATCH_MAX_ITEMS, ctx
+                )
+            except _upstream_errors() as exc:
+                return _error_response(exc)
+        else:
+            return _error(
+                {
+                    "error": "ids_missing",
+                    "detail": "Provide memory_ids or filters selecting the memories to delete.",
+                },
+            )
+
+        if dry_run:
+            response: Dict[str, Any] = {"dry_run": True, "total": len(matches), "matches": matches}
+            if truncated:
+                response["detail"] = (
+                    f"More than {ENV_BATCH_MAX_ITEMS} memories match; only the first are listed "
+                    "and a real run would delete only those."
+                )
+            return _render(_UNSHAPED, response)
+        return await _bulk_by_id(
+            ctx,
+            [
+                functools.partial(_write_by_id, api_key, "delete", match["id"])
+                for match in matches
+            ],
+        )
+
+    @server.tool(
+        description="Overwrite the text of many memories at once; results come back per memory_id."
+    )
+    @_instrumented
+    @_admitted
+    async def update_memories(
+        updates: Annotated[
+            list[MemoryUpdate],
+            Field(
+                description="memory_id/text pairs to apply.",
+                min_length=1,
+                max_length=ENV_BATCH_MAX_ITEMS,
+            ),
+        ],
+        ctx: ToolContext | None = None,
+    ) -> str:
+        """Apply a batch of text updates with bounded concurrency."""
+
+        api_key, _, _ = _resolve_settings(ctx)
+        return await _bulk_by_id(
+            ctx,
+            [
+                functools.partial(
+                    _write_by_id, api_key, "update", update.memory_id, text=update.text
+                )
+                for update in updates
+            ],
+        )
+
+    @server.tool(
+        description="Back up memories: write every memory matching the filters to an NDJSON file "
+        "in the server's transfer directory. An interrupted export resumes when called again "
+        "with the same arguments."
+    )
+    @_instrumented
+    @_admitted
+    async def export_memories(
+        file_name: Annotated[
+            str, Field(description="File to write in the transfer directory, e.g. alice.ndjson.")
+        ],
+        filters: Annotated[
+            Optional[Dict[str, Any]],
+            Field(
+                default=None,
+                description="Which memories to export, as in get_memories "
+                "(user_id injected automatically).",
+            ),
+        ] = None,
+        resume: Annotated[
+            bool,
+            Field(default=True, description="Continue an interrupted export of the same filters."),
+        ] = True,
+        ctx: ToolContext | None = None,
+    ) -> str:
+        """Export a scope to NDJSON, one memory per line."""
+
+        api_key, default_user, _ = _resolve_settings(ctx)
+        try:
+            path = _transfer_path(file_name)
+            compiled = compile_filters(filters, default_user)
+        except FilterError as exc:
+            return _invalid_filters(exc)
+        except ValueError as exc:
+            return _error({"error": "invalid_path", "detail": str(exc)})
+        request = {"filters": compiled, "page_size": ENV_PAGE_SIZE}
+
+        async def progress(done: int, total: Optional[int]) -> None:
+            await _report_progress(ctx, done, total)
+
+        try:
+            summary = await _export_memories(api_key, request, path, resume, progress)
+        except _upstream_errors() as exc:
+            return _error(
+                {
+                    **_error_body(exc),
+                    "detail": "Export interrupted; call again with the same arguments to resume.",
+                }
+            )
+        return _render(_UNSHAPED, {**summary, "path": file_name})
+
+    @server.tool(
+        description="Restore memories from an NDJSON file written by export_memories, stored "
+        "verbatim under their original (or the given) user/agent/app/run. An interrupted import "
+        "resumes when called again."
+    )
+    @_instrumented
+    @_admitted
+    async def import_memories(
+        file_name: Annotated[
+            str, Field(description="NDJSON file inside the transfer directory.")
+        ],
+        user_id: Annotated[
+            Optional[str], Field(default=None, description="Store every memory for this user.")
+        ] = None,
+        agent_id: Annotated[
+            Optional[str], Field(default=None, description="Store every memory for this agent.")
+        ] = None,
+        app_id: Annotated[
+            Optional[str], Field(default=None, description="Store every memory for this app.")
+        ] = None,
+        run_id: Annotated[
+            Optional[str], Field(default=None, description="Store every memory for this run.")
+        ] = None,
+        resume: Annotated[
+            bool,
+            Field(default=True, description="Continue an interrupted import of the same file."),
+        ] = True,
+        ctx: ToolContext | None = None,
+    ) -> str:
+        """Import an NDJSON export with bounded concurrency."""
+
+        api_key, _, _ = _resolve_settings(ctx)
+        try:
+            path = _transfer_path(file_name)
+        except ValueError as exc:
+            return _error({"error": "invalid_path", "detail": str(exc)})
+        if not path.is_file():
+            return _error({"error": "file_not_found", "detail": f"No file {file_name!r} to import."})
+        scope = {"user_id": user_id, "agent_id": agent_id, "app_id": app_id, "run_id": run_id}
+
+        async def progress(done: int, total: Optional[int]) -> None:
+            await _report_progress(ctx, done, total)
+
+        try:
+            summary = await _import_memories(api_key, path, scope, resume, progress)
+        except _upstream_errors() as exc:
+            return _error(
+                {
+                    **_error_body(exc),
+                    "detail": "Import interrupted; call again with the same arguments to resume.",
+                }
+            )
+        if "errors_file" in summary:
+            base = Path(ENV_TRANSFER_DIR).resolve()
+            summary["errors_file"] = str(Path(summary["errors_file"]).relative_to(base))
+        return _render(_UNSHAPED, {**summary, "path": file_name})
+
+    @server.tool(
+        description="Show this API key's active MCP sessions on this server with their calls, "
+        "errors, response bytes, time spent and warm/subscription state, to diagnose load."
+    )
+    @_instrumented
+    @_admitted
+    async def list_sessions(ctx: ToolContext | None = None) -> str:
+        """List the caller's sessions and their resource use; other tenants stay hidden."""
+
+        state = _session_state(ctx)
+        sessions = describe_sessions(state.tenant)
+        for info in sessions:
+            info["current"] = info["session"] == state.id
+        return _render(_UNSHAPED, {"sessions": sessions})
 
     @server.tool(
         description="Remove a user/agent/app/run record entirely (and cascade-delete its memories)."
     )
-    def delete_entities(
+    @_instrumented
+    @_admitted
+    async def delete_entities(
         user_id: Annotated[
             Optional[str], Field(default=None, description="Delete this user and its memories.")
         ] = None,
@@ -426,28 +2412,116 @@ def create_server() -> FastMCP:
         run_id: Annotated[
             Optional[str], Field(default=None, description="Delete this run and its memories.")
         ] = None,
-        ctx: Context | None = None,
+        ctx: ToolContext | None = None,
     ) -> str:
         """Delete a user/agent/app/run (and its memories) once the user confirms the scope."""
 
         api_key, _, _ = _resolve_settings(ctx)
-        args = DeleteEntitiesArgs(
-            user_id=user_id,
-            agent_id=agent_id,
-            app_id=app_id,
-            run_id=run_id,
-        )
+        with tracing.span("validate_args"):
+            args = DeleteEntitiesArgs(
+                user_id=user_id,
+                agent_id=agent_id,
+                app_id=app_id,
+                run_id=run_id,
+            )
         if not any([args.user_id, args.agent_id, args.app_id, args.run_id]):
-            return json.dumps(
+            return _error(
                 {
                     "error": "scope_missing",
                     "detail": "Provide user_id, agent_id, app_id, or run_id before calling delete_entities.",
                 },
-                ensure_ascii=False,
             )
-        payload = args.model_dump(exclude_none=True)
-        client = _mem0_client(api_key)
-        return _mem0_call(client.delete_users, **payload)
+        return await _mem0_call(api_key, "delete_users", **args.model_dump(exclude_none=True))
+
+    @server.resource(
+        "mem0://memories/recent",
+        name="recent_memories",
+        description="The default user's most recently updated memories, prefetched when the "
+        "session starts if the server enables session warm-up.",
+        mime_type="application/json",
+    )
+    async def recent_memories() -> str:
+        ctx = server.get_context()
+        api_key, default_user, graph_default = _resolve_settings(ctx)
+        version = _VERSIONS.version(tenant_of(api_key), ("user_id", default_user))
+        warmer = _session_warmer(ctx, api_key)
+        result = await warmer.current(timeout=ENV_HTTP_TIMEOUT) if warmer is not None else None
+        if result is None:
+            request = _listing_request(default_user, graph_default)
+            try:
+                result = await _cached_mem0_request(api_key, "get_memories", "get_all", **request)
+            except _upstream_errors() as exc:
+                return _error_response(exc)
+        recent = {
+            "user_id": default_user,
+            "version": version,
+            "results": _recent(result, ENV_WARM_ITEMS),
+        }
+        return _render(_response_shape(ctx, "get_memories"), recent)
+
+    def _scope_resource(kind: str, field: str) -> Callable[..., Any]:
+        return server.resource(
+            f"mem0://{kind}/{{{field}}}/memories",
+            name=f"{kind[:-1]}_memories",
+            description=f"Memories of one {field[:-3]}, with a `version` that changes whenever "
+            "a write through this server touches them. Subscribe to be notified of changes.",
+            mime_type="application/json",
+        )
+
+    @_scope_resource("users", "user_id")
+    async def user_memories(user_id: str) -> str:
+        return await _scope_listing("user_id", user_id)
+
+    @_scope_resource("agents", "agent_id")
+    async def agent_memories(agent_id: str) -> str:
+        return await _scope_listing("agent_id", agent_id)
+
+    @_scope_resource("apps", "app_id")
+    async def app_memories(app_id: str) -> str:
+        return await _scope_listing("app_id", app_id)
+
+    @_scope_resource("runs", "run_id")
+    async def run_memories(run_id: str) -> str:
+        return await _scope_listing("run_id", run_id)
+
+    async def _scope_listing(field: str, value: str) -> str:
+        ctx = server.get_context()
+        api_key, default_user, _ = _resolve_settings(ctx)
+        # read the version first: a write landing during the fetch then shows up as a change
+        version = _VERSIONS.version(tenant_of(api_key), (field, value))
+        filters = {field: value} if field == "user_id" else {"user_id": "*", field: value}
+        request = {"filters": compile_filters(filters, default_user), "enable_graph": False}
+        try:
+            result = await _cached_mem0_request(api_key, "scope_resource", "get_all", **request)
+        except _upstream_errors() as exc:
+            return _error_response(exc)
+        listing = {field: value, "version": version, "results": _page_items(result)}
+        return _render(_response_shape(ctx, "get_memories"), listing)
+
+    lowlevel = server._mcp_server
+
+    @lowlevel.subscribe_resource()  # type: ignore[no-untyped-call, untyped-decorator]
+    async def subscribe(uri: Any) -> None:
+        ctx = server.get_context()
+        api_key, default_user, _ = _resolve_settings(ctx)
+        scope = _resource_scope(str(uri), default_user)
+        if scope is not None:
+            _VERSIONS.subscribe(ctx.session, tenant_of(api_key), scope, str(uri))
+
+    @lowlevel.unsubscribe_resource()  # type: ignore[no-untyped-call, untyped-decorator]
+    async def unsubscribe(uri: Any) -> None:
+        _VERSIONS.unsubscribe(server.get_context().session, str(uri))
+
+    # the low-level server always advertises subscribe=False; this one honours subscriptions
+    base_capabilities = lowlevel.get_capabilities
+
+    def get_capabilities(*args: Any, **kwargs: Any) -> Any:
+        capabilities = base_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    lowlevel.get_capabilities = get_capabilities  # type: ignore[method-assign]
 
     # Add a simple prompt for server capabilities
     @server.prompt()
@@ -457,9 +2531,13 @@ def create_server() -> FastMCP:
 
 Quick Start:
 1. Store memories: Use add_memory to save facts, preferences, or conversations
-2. Search memories: Use search_memories for semantic queries
+2. Search memories: Use search_memories for semantic queries, or search_memories_batch to run
+   several phrasings of the same question in one call
 3. List memories: Use get_memories for filtered browsing
-4. Update/Delete: Use update_memory and delete_memory for modifications
+4. Update/Delete: Use update_memory and delete_memory for modifications, or update_memories and
+   delete_memories for many at once (delete_memories with dry_run=true previews a filter)
+5. Back up/restore: export_memories writes a scope to an NDJSON file and import_memories
+   restores one; call either again to resume after an interruption
 
 Filter Examples:
 - User memories: {"AND": [{"user_id": "john"}]}
@@ -474,12 +2552,103 @@ Tips:
     return server
 
 
+async def shutdown() -> None:
+    """Flush queued writes and spans and close upstream clients before the process exits."""
+
+    if not await _INGEST.drain(timeout=ENV_INGEST_DRAIN_TIMEOUT):
+        logger.error("Exited with queued writes still pending: %s", _INGEST.stats())
+    if _RECONCILER is not None:
+        _RECONCILER.cancel()
+    await _CLIENTS.aclose()
+    if _STORE is not None:
+        await _run_blocking(_STORE.close)
+    await _run_blocking(tracing.shutdown)
+
+
+async def serve(server: FastMCP, transport: str) -> None:
+    """Run `server` on the given transport and drain background work once it stops."""
+
+    try:
+        if transport == "streamable-http":
+            await server.run_streamable_http_async()
+        else:
+            await server.run_stdio_async()
+    finally:
+        await asyncio.shield(shutdown())
+
+
+def _transfer_main(argv: list[str]) -> int:
+    """`mem0-mcp-server export|import`: move memories between Mem0 and NDJSON files."""
+
+    parser = argparse.ArgumentParser(
+        prog="mem0-mcp-server",
+        description="Export memories to NDJSON or import them back (MEM0_API_KEY selects the "
+        "account). Interrupted runs resume from their checkpoint.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Write the memories matching --filters to PATH.")
+    export.add_argument("path", type=Path)
+    export.add_argument(
+        "--filters",
+        type=json.loads,
+        help='get_memories filters as JSON, e.g. \'{"user_id": "alice"}\' '
+        "(defaults to MEM0_DEFAULT_USER_ID).",
+    )
+    restore = commands.add_parser("import", help="Add the memories of an export at PATH.")
+    restore.add_argument("path", type=Path)
+    for field in SCOPE_FIELDS:
+        restore.add_argument(
+            f"--{field.replace('_', '-')}", help=f"Store every memory under this {field}."
+        )
+    for command in (export, restore):
+        command.add_argument("--restart", action="store_true", help="Ignore any checkpoint.")
+    args = parser.parse_args(argv)
+    if not ENV_API_KEY:
+        parser.error("MEM0_API_KEY is required")
+    if args.command == "import" and not args.path.is_file():
+        parser.error(f"no such file: {args.path}")
+    if args.command == "export":
+        try:
+            filters = compile_filters(args.filters, ENV_DEFAULT_USER_ID)
+        except FilterError as exc:
+            parser.error(f"invalid --filters: {exc}")
+
+    async def progress(done: int, total: Optional[int]) -> None:
+        print(f"\r{args.command}: {done}" + (f"/{total}" if total else ""), end="", file=sys.stderr)
+
+    async def run() -> Dict[str, Any]:
+        try:
+            with metrics.background(args.command):
+                if args.command == "export":
+                    request = {"filters": filters, "page_size": ENV_PAGE_SIZE}
+                    return await _export_memories(
+                        ENV_API_KEY, request, args.path, not args.restart, progress
+                    )
+                scope = {field: getattr(args, field) for field in SCOPE_FIELDS}
+                return await _import_memories(
+                    ENV_API_KEY, args.path, scope, not args.restart, progress
+                )
+        finally:
+            await shutdown()
+
+    try:
+        summary = asyncio.run(run())
+    except _upstream_errors() as exc:
+        print(f"\n{args.command} interrupted ({exc}); run it again to resume.", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    print(dumps(summary))
+    return 1 if summary.get("failed") else 0
+
+
 def main() -> None:
-    """Run the MCP server over stdio."""
+    """Run the MCP server over stdio, or export/import memories given that subcommand."""
 
+    if sys.argv[1:2] in (["export"], ["import"]):
+        sys.exit(_transfer_main(sys.argv[1:]))
     server = create_server()
     logger.info("Starting Mem0 MCP server (default user=%s)", ENV_DEFAULT_USER_ID)
-    server.run(transport="stdio")
+    anyio.run(serve, server, "stdio")
 
 
 if __name__ == "__main__":
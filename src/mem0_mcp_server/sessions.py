@@ -0,0 +1,112 @@
+"""Per-MCP-session state: settings resolved once per session, plus what the session has used."""
+
+from __future__ import annotations
+
+import secrets
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# session config fields never shown by `describe`
+_PRIVATE_CONFIG = frozenset({"mem0_api_key", "default_user_id"})
+
+
+@dataclass
+class SessionState:
+    """What a session resolved on its first call (key, defaults, config, admission limits and
+    warm listing) and its running totals."""
+
+    tenant: str
+    api_key: str = field(repr=False)
+    default_user: str = field(repr=False)
+    graph_default: bool
+    config: Dict[str, Any]  # session config fields that were set
+    limits: Any = None
+    warmer: Any = None
+    id: str = field(default_factory=lambda: secrets.token_hex(4))
+    created: float = field(default_factory=time.monotonic)
+    last_seen: float = field(default_factory=time.monotonic)
+    calls: int = 0
+    errors: int = 0
+    response_bytes: int = 0
+    busy_seconds: float = 0.0
+    upstream_seconds: float = 0.0
+
+    def flag(self, name: str, default: bool) -> bool:
+        value = self.config.get(name)
+        return default if value is None else bool(value)
+
+    def record(self, outcome: str, response_bytes: int, elapsed: float, upstream: float) -> None:
+        self.calls += 1
+        if outcome != "ok":
+            self.errors += 1
+        self.response_bytes += response_bytes
+        self.busy_seconds += elapsed
+        self.upstream_seconds += upstream
+
+    def describe(self) -> Dict[str, Any]:
+        """Usage of this session, without its API key or user ids."""
+
+        now = time.monotonic()
+        return {
+            "session": self.id,
+            "tenant": self.tenant[:8],
+            "age_seconds": round(now - self.created, 1),
+            "idle_seconds": round(now - self.last_seen, 1),
+            "calls": self.calls,
+            "errors": self.errors,
+            "response_bytes": self.response_bytes,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "upstream_seconds": round(self.upstream_seconds, 3),
+            "config": {k: v for k, v in self.config.items() if k not in _PRIVATE_CONFIG},
+        }
+
+
+class SessionRegistry:
+    """Session states keyed by the MCP session object, created on a session's first call.
+
+    A state goes away with its session (weak keys), after `idle_ttl` seconds without a call,
+    or, oldest first, once more than `max_sessions` are held, so the registry stays bounded
+    however many clients connect. An evicted session that calls again gets a fresh state.
+    Single event loop only.
+    """
+
+    def __init__(self, max_sessions: int = 1024, idle_ttl: float = 3600.0) -> None:
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.created = 0
+        self.evicted = 0
+        self._states: weakref.WeakKeyDictionary[Any, SessionState] = weakref.WeakKeyDictionary()
+
+    def get(self, session: Any) -> Optional[SessionState]:
+        state = self._states.get(session)
+        if state is not None:
+            state.last_seen = time.monotonic()
+        return state
+
+    def add(self, session: Any, state: SessionState) -> None:
+        self.created += 1
+        self._states[session] = state
+        self._evict()
+
+    def items(self, tenant: Optional[str] = None) -> Iterator[Tuple[Any, SessionState]]:
+        """(session, state) pairs, most recently used first, optionally of one tenant only."""
+
+        pairs = sorted(self._states.items(), key=lambda pair: -pair[1].last_seen)
+        return iter([pair for pair in pairs if tenant is None or pair[1].tenant == tenant])
+
+    def _evict(self) -> None:
+        cutoff = time.monotonic() - self.idle_ttl
+        stale = [session for session, state in self._states.items() if state.last_seen < cutoff]
+        overflow = len(self._states) - len(stale) - self.max_sessions
+        if overflow > 0:
+            live = [pair for pair in self._states.items() if pair[1].last_seen >= cutoff]
+            live.sort(key=lambda pair: pair[1].last_seen)
+            stale.extend(session for session, _ in live[:overflow])
+        for session in stale:
+            del self._states[session]
+        self.evicted += len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"sessions": len(self._states), "created": self.created, "evicted": self.evicted}
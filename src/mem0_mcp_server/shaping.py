@@ -0,0 +1,117 @@
+"""Response shaping: field projection, text truncation and compact encoding of tool results."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson optional
+    orjson = None  # type: ignore[assignment]
+
+# fields kept per memory in compact mode when the caller names none
+COMPACT_FIELDS: Dict[str, FrozenSet[str]] = {
+    "search_memories": frozenset({"id", "memory", "score", "categories", "metadata"}),
+    "search_memories_batch": frozenset(
+        {"id", "memory", "score", "categories", "metadata", "matched_queries"}
+    ),
+    "default": frozenset(
+        {"id", "memory", "event", "categories", "metadata", "created_at"}
+        | {"user_id", "agent_id", "app_id", "run_id"}
+    ),
+}
+
+# markers added by the server itself that must survive any projection
+_ALWAYS_KEPT = frozenset({"id", "stale", "truncated"})
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (type(value) in (str, list, dict) and not value)
+
+
+def dumps(value: Any, sort_keys: bool = False) -> str:
+    """Serialize to compact JSON, with orjson when it is installed.
+
+    Both encoders produce the same text, so responses and the digests built from this look
+    alike whichever one ran.
+    """
+
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(value, default=str, option=option).decode()
+        except TypeError:  # e.g. integers beyond 64 bits; the stdlib encoder copes
+            pass
+    return json.dumps(
+        value, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+
+
+@dataclass(frozen=True)
+class ResponseShape:
+    """How memories in a response are trimmed before serialization.
+
+    `fields` projects every memory onto those keys (plus `id` and the server's own `stale`/
+    `truncated` markers), `max_chars` truncates memory text (marking the memory `truncated`),
+    and `compact` drops empty values and rounds scores.
+    """
+
+    fields: Optional[FrozenSet[str]] = None
+    max_chars: int = 0
+    compact: bool = False
+
+    @classmethod
+    def build(
+        cls,
+        tool: str,
+        fields: Optional[Iterable[str]] = None,
+        compact: bool = False,
+        max_chars: int = 0,
+    ) -> ResponseShape:
+        if fields:
+            projection: Optional[FrozenSet[str]] = frozenset(fields) | _ALWAYS_KEPT
+        elif compact:
+            projection = COMPACT_FIELDS.get(tool, COMPACT_FIELDS["default"]) | _ALWAYS_KEPT
+        else:
+            projection = None
+        return cls(projection, max(0, max_chars), compact)
+
+    @property
+    def identity(self) -> bool:
+        return self.fields is None and not self.max_chars and not self.compact
+
+    def memory(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        fields, compact = self.fields, self.compact
+        if fields is None:
+            shaped = {k: v for k, v in item.items() if not (compact and _is_empty(v))}
+        elif compact:
+            shaped = {k: v for k, v in item.items() if k in fields and not _is_empty(v)}
+        else:
+            shaped = {k: v for k, v in item.items() if k in fields}
+        text = shaped.get("memory")
+        if self.max_chars and isinstance(text, str) and len(text) > self.max_chars:
+            shaped["memory"] = text[: self.max_chars].rstrip() + "…"
+            shaped["truncated"] = True
+        if compact and type(shaped.get("score")) is float:
+            shaped["score"] = round(shaped["score"], 4)
+        return shaped
+
+    def apply(self, result: Any) -> Any:
+        """Return a shaped copy of `result`; the input (possibly a cached value) is untouched."""
+
+        if self.identity:
+            return result
+        if isinstance(result, list):
+            return [self.memory(item) if isinstance(item, dict) else item for item in result]
+        if not isinstance(result, dict):
+            return result
+        if isinstance(result.get("results"), list):
+            shaped = {**result, "results": self.apply(result["results"])}
+            if self.compact:
+                shaped = {k: v for k, v in shaped.items() if k == "results" or not _is_empty(v)}
+            return shaped
+        if "id" in result and "memory" in result:
+            return self.memory(result)
+        return result
@@ -0,0 +1,80 @@
+"""Coalescing of identical concurrent upstream reads into a single request."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, ContextManager, Dict, Optional, Tuple, TypeVar
+
+try:
+    from .scopes import fingerprint, tenant_of
+except ImportError:  # pragma: no cover - script execution
+    from scopes import fingerprint, tenant_of
+
+T = TypeVar("T")
+
+
+def _settle(task: asyncio.Future[Any]) -> None:
+    # mark the exception retrieved: every waiter may have been cancelled before it was raised
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlight:
+    """Share one in-flight call between every caller asking for the same key.
+
+    The first caller (the leader) starts the call as a task; callers arriving while it runs
+    await the same task. The call is shielded, so a cancelled caller never cancels it for the
+    others. Results are shared between callers and must be treated as read-only. A joining
+    caller waits inside the context `on_join` returns, e.g. to account the shared wait.
+    """
+
+    def __init__(self) -> None:
+        self.leaders = 0
+        self.coalesced = 0
+        self._flights: Dict[str, asyncio.Future[Any]] = {}
+
+    @staticmethod
+    def make_key(
+        api_key: str, method: str, args: Tuple[Any, ...], kwargs: Dict[str, Any], epoch: int
+    ) -> str:
+        """Key a read by tenant, client method and canonical arguments.
+
+        `epoch` should change whenever the tenant writes, so a read issued after a write never
+        joins one that started before it.
+        """
+
+        canonical = json.dumps([args, kwargs], sort_keys=True, separators=(",", ":"), default=str)
+        return f"{tenant_of(api_key)}:{method}:{epoch}:{fingerprint(canonical)}"
+
+    async def do(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[T]],
+        on_join: Optional[Callable[[], ContextManager[Any]]] = None,
+    ) -> T:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(call())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._land(key, done))
+            self.leaders += 1
+            return await asyncio.shield(flight)
+        self.coalesced += 1
+        with on_join() if on_join is not None else nullcontext():
+            return await asyncio.shield(flight)
+
+    def _land(self, key: str, flight: asyncio.Future[Any]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        _settle(flight)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / calls, 4) if calls else 0.0,
+        }
@@ -0,0 +1,406 @@
+"""Optional local SQLite mirror of memories seen through the server's tools.
+
+Staleness rules:
+
+* A memory row is *fresh* for `max_age` seconds after it was last seen upstream or written
+  through this server. `get_memory` serves fresh, complete rows locally.
+* A scope listing (a plain conjunction of user/agent/app/run equalities) is served locally only
+  after a full reconciliation of that scope and for `max_age` seconds after it. Scopes that are
+  listed keep being reconciled in the background every `reconcile_interval` seconds; scopes
+  nobody asked for within `3 * max_age` are dropped from the rotation.
+* Anything else goes upstream. When upstream is unreachable, stale rows are served with
+  `"stale": true` rather than failing the read.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+try:
+    from .scopes import SCOPE_FIELDS
+except ImportError:  # pragma: no cover - script execution
+    from scopes import SCOPE_FIELDS
+
+logger = logging.getLogger("mem0_mcp_server.store")
+
+ScopeKey = FrozenSet[Tuple[str, str]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    tenant TEXT NOT NULL,
+    id TEXT NOT NULL,
+    user_id TEXT,
+    agent_id TEXT,
+    app_id TEXT,
+    run_id TEXT,
+    memory TEXT,
+    data TEXT NOT NULL,
+    complete INTEGER NOT NULL DEFAULT 1,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (tenant, id)
+);
+CREATE INDEX IF NOT EXISTS memories_scope
+    ON memories (tenant, user_id, agent_id, app_id, run_id);
+CREATE TABLE IF NOT EXISTS scopes (
+    tenant TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    synced_at REAL,
+    requested_at REAL NOT NULL,
+    PRIMARY KEY (tenant, scope)
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts
+    USING fts5(memory, content='memories', content_rowid='rowid');
+CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+    INSERT INTO memories_fts (rowid, memory) VALUES (new.rowid, new.memory);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+    INSERT INTO memories_fts (memories_fts, rowid, memory) VALUES ('delete', old.rowid, old.memory);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories BEGIN
+    INSERT INTO memories_fts (memories_fts, rowid, memory) VALUES ('delete', old.rowid, old.memory);
+    INSERT INTO memories_fts (rowid, memory) VALUES (new.rowid, new.memory);
+END;
+"""
+
+
+def simple_scope(filters: Any) -> Optional[ScopeKey]:
+    """Return the scope of a filter that is only an AND of user/agent/app/run equalities."""
+
+    if not isinstance(filters, dict) or set(filters) != {"AND"} or not filters["AND"]:
+        return None
+    pairs = set()
+    for clause in filters["AND"]:
+        if not isinstance(clause, dict) or len(clause) != 1:
+            return None
+        field, value = next(iter(clause.items()))
+        if field not in SCOPE_FIELDS or not isinstance(value, str) or value == "*":
+            return None
+        pairs.add((field, value))
+    return frozenset(pairs)
+
+
+def scope_filters(scope: ScopeKey) -> Dict[str, Any]:
+    return {"AND": [{field: value} for field, value in sorted(scope)]}
+
+
+def _scope_text(scope: ScopeKey) -> str:
+    return json.dumps(sorted(scope))
+
+
+def _clean(memory: Dict[str, Any]) -> Dict[str, Any]:
+    # search scores are query-specific and must not leak into other reads
+    return {key: value for key, value in memory.items() if key != "score"}
+
+
+class LocalStore:
+    """SQLite-backed mirror with a full-text index over memory text."""
+
+    def __init__(self, path: str, max_age: float = 300.0, max_scope_items: int = 5000) -> None:
+        self.path = path
+        self.max_age = max_age
+        self.max_scope_items = max_scope_items
+        self.local_hits = 0
+        self.stale_hits = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:  # pragma: no cover - SQLite built without FTS5
+            logger.warning("SQLite FTS5 unavailable; local search falls back to LIKE matching")
+            self.fts = False
+
+    # -- writes -----------------------------------------------------------------------------
+
+    def record(
+        self,
+        tenant: str,
+        memories: Iterable[Dict[str, Any]],
+        complete: bool = True,
+    ) -> None:
+        """Upsert memories; `complete=False` rows only carry id/text and never overwrite data."""
+
+        now = time.time()
+        rows = []
+        for memory in memories:
+            if not isinstance(memory, dict) or not memory.get("id"):
+                continue
+            merged = _clean(memory)
+            rows.append(
+                (
+                    tenant,
+                    str(merged["id"]),
+                    *(merged.get(field) for field in SCOPE_FIELDS),
+                    merged.get("memory"),
+                    json.dumps(merged, ensure_ascii=False, default=str),
+                    int(complete),
+                    now,
+                )
+            )
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            if complete:
+                self._conn.executemany(
+                    "INSERT INTO memories (tenant, id, user_id, agent_id, app_id, run_id, memory,"
+                    " data, complete, deleted, synced_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)"
+                    " ON CONFLICT (tenant, id) DO UPDATE SET user_id=excluded.user_id,"
+                    " agent_id=excluded.agent_id, app_id=excluded.app_id, run_id=excluded.run_id,"
+                    " memory=excluded.memory, data=excluded.data, complete=1, deleted=0,"
+                    " synced_at=excluded.synced_at",
+                    rows,
+                )
+            else:
+                self._conn.executemany(
+                    "INSERT INTO memories (tenant, id, user_id, agent_id, app_id, run_id, memory,"
+                    " data, complete, deleted, synced_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)"
+                    " ON CONFLICT (tenant, id) DO UPDATE SET memory=excluded.memory,"
+                    " deleted=0, synced_at=excluded.synced_at,"
+                    " data=json_set(memories.data, '$.memory', excluded.memory)",
+                    rows,
+                )
+            self._conn.execute("COMMIT")
+
+    def record_add(self, tenant: str, result: Any, payload: Dict[str, Any]) -> None:
+        """Apply the ADD/UPDATE/DELETE events returned by client.add."""
+
+        events = result.get("results") if isinstance(result, dict) else result
+        if not isinstance(events, list):
+            return
+        scope = {field: payload.get(field) for field in SCOPE_FIELDS if payload.get(field)}
+        kept = []
+        for event in events:
+            if not isinstance(event, dict) or not event.get("id"):
+                continue
+            if event.get("event") == "DELETE":
+                self.delete(tenant, str(event["id"]))
+            else:
+                kept.append({"id": event["id"], "memory": event.get("memory"), **scope})
+        self.record(tenant, kept, complete=False)
+
+    def update_text(self, tenant: str, memory_id: str, text: str) -> None:
+        self.record(tenant, [{"id": memory_id, "memory": text}], complete=False)
+
+    def delete(self, tenant: str, memory_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE memories SET deleted = 1, synced_at = ? WHERE tenant = ? AND id = ?",
+                (time.time(), tenant, memory_id),
+            )
+
+    def delete_scope(self, tenant: str, **ids: Optional[str]) -> None:
+        clauses, params = self._scope_sql({(k, v) for k, v in ids.items() if v})
+        if not clauses:
+            return
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE memories SET deleted = 1, synced_at = ? WHERE tenant = ? AND {clauses}",
+                (time.time(), tenant, *params),
+            )
+
+    def replace_scope(
+        self, tenant: str, scope: ScopeKey, memories: List[Dict[str, Any]], started_at: float
+    ) -> None:
+        """Install a full upstream listing of `scope`, fetched from `started_at` on, as truth.
+
+        Rows written through the server after `started_at` may be missing from the listing and
+        are left alone.
+        """
+
+        clauses, params = self._scope_sql(scope)
+        self.record(tenant, memories)
+        keep = [str(m["id"]) for m in memories if isinstance(m, dict) and m.get("id")]
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS _keep (id TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM _keep")
+            self._conn.executemany("INSERT OR IGNORE INTO _keep VALUES (?)", [(i,) for i in keep])
+            self._conn.execute(
+                f"UPDATE memories SET deleted = 1, synced_at = ? WHERE tenant = ? AND {clauses}"
+                " AND synced_at < ? AND id NOT IN (SELECT id FROM _keep)",
+                (now, tenant, *params, started_at),
+            )
+            self._conn.execute(
+                "UPDATE scopes SET synced_at = ? WHERE tenant = ? AND scope = ?",
+                (now, tenant, _scope_text(scope)),
+            )
+            self._conn.execute("COMMIT")
+
+    # -- reads ------------------------------------------------------------------------------
+
+    def get(
+        self, tenant: str, memory_id: str, allow_stale: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, complete, deleted, synced_at FROM memories"
+                " WHERE tenant = ? AND id = ?",
+                (tenant, memory_id),
+            ).fetchone()
+        if row is None or row["deleted"]:
+            return None
+        fresh = row["complete"] and row["synced_at"] >= time.time() - self.max_age
+        if not fresh and not allow_stale:
+            return None
+        memory: Dict[str, Any] = json.loads(row["data"])
+        if fresh:
+            self.local_hits += 1
+        else:
+            self.stale_hits += 1
+            memory["stale"] = True
+        return memory
+
+    def want_scope(self, tenant: str, scope: ScopeKey) -> None:
+        """Register a listed scope for background reconciliation."""
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO scopes (tenant, scope, synced_at, requested_at) VALUES (?, ?, NULL, ?)"
+                " ON CONFLICT (tenant, scope) DO UPDATE SET requested_at = excluded.requested_at",
+                (tenant, _scope_text(scope), time.time()),
+            )
+
+    def forget_scope(self, tenant: str, scope: ScopeKey) -> None:
+        """Stop reconciling a scope (e.g. one larger than `max_scope_items`)."""
+
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM scopes WHERE tenant = ? AND scope = ?", (tenant, _scope_text(scope))
+            )
+
+    def list_scope(
+        self, tenant: str, scope: ScopeKey, allow_stale: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Return a reconciled scope's memories, or None when it cannot be served locally."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM scopes WHERE tenant = ? AND scope = ?",
+                (tenant, _scope_text(scope)),
+            ).fetchone()
+        synced_at = row["synced_at"] if row else None
+        fresh = synced_at is not None and synced_at >= time.time() - self.max_age
+        if not fresh and not allow_stale:
+            return None
+        memories = self._select(tenant, scope)
+        if fresh:
+            self.local_hits += 1
+        else:
+            self.stale_hits += 1
+        return memories
+
+    def search(
+        self, tenant: str, query: str, scope: Optional[ScopeKey] = None, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Full-text fallback search over mirrored memories (used during outages)."""
+
+        clauses, params = self._scope_sql(scope or frozenset())
+        scope_sql = f" AND {clauses}" if clauses else ""
+        terms = [term for term in query.replace('"', " ").split() if term]
+        if not terms:
+            return []
+        with self._lock:
+            if self.fts:
+                match = " OR ".join(f'"{term}"' for term in terms)
+                rows = self._conn.execute(
+                    "SELECT m.data, bm25(memories_fts) AS rank FROM memories_fts"
+                    " JOIN memories m ON m.rowid = memories_fts.rowid"
+                    f" WHERE memories_fts MATCH ? AND m.tenant = ? AND m.deleted = 0{scope_sql}"
+                    " ORDER BY rank LIMIT ?",
+                    (match, tenant, *params, limit),
+                ).fetchall()
+            else:  # pragma: no cover - SQLite built without FTS5
+                like = " OR ".join("m.memory LIKE ?" for _ in terms)
+                rows = self._conn.execute(
+                    "SELECT m.data, 0 AS rank FROM memories m WHERE m.tenant = ?"
+                    f" AND m.deleted = 0{scope_sql} AND ({like}) LIMIT ?",
+                    (tenant, *params, *(f"%{term}%" for term in terms), limit),
+                ).fetchall()
+        self.stale_hits += 1
+        return [{**json.loads(row["data"]), "stale": True} for row in rows]
+
+    def entities(self, tenant: str) -> List[Dict[str, Any]]:
+        """Approximate list_entities from mirrored rows (used during outages)."""
+
+        results = []
+        with self._lock:
+            for field in SCOPE_FIELDS:
+                for row in self._conn.execute(
+                    f"SELECT {field} AS name, COUNT(*) AS total FROM memories"
+                    f" WHERE tenant = ? AND deleted = 0 AND {field} IS NOT NULL GROUP BY {field}",
+                    (tenant,),
+                ):
+                    results.append(
+                        {
+                            "type": field.removesuffix("_id"),
+                            "name": row["name"],
+                            "total_memories": row["total"],
+                            "stale": True,
+                        }
+                    )
+        return results
+
+    def scopes_due(self, interval: float) -> List[Tuple[str, ScopeKey]]:
+        """Scopes that need a reconciliation pass; forgets scopes nobody listed recently."""
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM scopes WHERE requested_at < ?", (now - 3 * self.max_age,)
+            )
+            rows = self._conn.execute(
+                "SELECT tenant, scope FROM scopes WHERE synced_at IS NULL OR synced_at < ?",
+                (now - interval,),
+            ).fetchall()
+        return [
+            (row["tenant"], frozenset((field, value) for field, value in json.loads(row["scope"])))
+            for row in rows
+        ]
+
+    def _select(self, tenant: str, scope: ScopeKey) -> List[Dict[str, Any]]:
+        clauses, params = self._scope_sql(scope)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM memories WHERE tenant = ? AND deleted = 0 AND {clauses}"
+                " ORDER BY json_extract(data, '$.created_at') DESC, synced_at DESC",
+                (tenant, *params),
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    @staticmethod
+    def _scope_sql(scope: Iterable[Tuple[str, str]]) -> Tuple[str, List[str]]:
+        pairs = sorted(p for p in scope if p[0] in SCOPE_FIELDS)
+        return " AND ".join(f"{field} = ?" for field, _ in pairs), [value for _, value in pairs]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            memories = self._conn.execute(
+                "SELECT COUNT(*) FROM memories WHERE deleted = 0"
+            ).fetchone()[0]
+            scopes = self._conn.execute("SELECT COUNT(*) FROM scopes").fetchone()[0]
+        return {
+            "memories": memories,
+            "tracked_scopes": scopes,
+            "local_hits": self.local_hits,
+            "stale_hits": self.stale_hits,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,112 @@
+"""Optional OpenTelemetry tracing: a span per tool call with child spans for its stages.
+
+Tracing is off unless `configure` installs an exporter, and then needs the `tracing` extra
+(opentelemetry-sdk). While it is off, `span` hands out a shared no-op span and nothing from
+OpenTelemetry is imported. Attributes are limited to tool and method names, counts and sizes,
+so API keys, ids and memory text never reach a span.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+logger = logging.getLogger("mem0_mcp_server.tracing")
+
+EXPORTERS = ("console", "file", "otlp")
+# W3C trace context fields looked up in request `_meta` and HTTP headers
+CARRIER_FIELDS = ("traceparent", "tracestate")
+
+_tracer: Any = None
+_provider: Any = None
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def configure(exporter: str, path: str = "mem0-mcp-traces.jsonl") -> bool:
+    """Install a tracer provider exporting to `exporter`; return whether tracing is on.
+
+    `console` writes spans to stderr (stdout carries the stdio transport), `file` appends one
+    JSON span per line to `path`, and `otlp` sends them to the collector named by the standard
+    OTEL_EXPORTER_OTLP_* variables (needs opentelemetry-exporter-otlp-proto-http).
+    """
+
+    global _tracer, _provider
+    if _tracer is not None or not exporter:
+        return _tracer is not None
+    if exporter not in EXPORTERS:
+        logger.warning("Unknown MEM0_TRACING exporter %r; expected one of %s", exporter, EXPORTERS)
+        return False
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+        if exporter == "otlp":
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+            span_exporter: Any = OTLPSpanExporter()
+        elif exporter == "file":
+            span_exporter = ConsoleSpanExporter(
+                out=open(path, "a", encoding="utf-8"),  # noqa: SIM115 - lives as long as tracing
+                formatter=lambda span: span.to_json(indent=None) + "\n",
+            )
+        else:
+            span_exporter = ConsoleSpanExporter(out=sys.stderr)
+    except ImportError as exc:
+        logger.warning(
+            "MEM0_TRACING=%s needs `pip install \"mem0-mcp-server[tracing]\"` (%s); tracing is off",
+            exporter,
+            exc,
+        )
+        return False
+    provider = TracerProvider(resource=Resource.create({"service.name": "mem0-mcp-server"}))
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    _provider = provider
+    _tracer = trace.get_tracer("mem0_mcp_server")
+    return True
+
+
+def shutdown() -> None:
+    """Export spans still queued in the batch processor and close the exporter."""
+
+    global _tracer, _provider
+    if _provider is None:
+        return
+    _provider.shutdown()
+    _tracer = _provider = None
+
+
+@contextmanager
+def span(
+    name: str,
+    carrier: Optional[Mapping[str, str]] = None,
+    attributes: Optional[Dict[str, Any]] = None,
+) -> Iterator[Any]:
+    """A span named `name`, child of the current one or of the trace context in `carrier`."""
+
+    if _tracer is None:
+        yield _NOOP
+        return
+    context = None
+    if carrier:
+        from opentelemetry.propagate import extract
+
+        context = extract(carrier)
+    with _tracer.start_as_current_span(name, context=context, attributes=attributes) as current:
+        yield current
+
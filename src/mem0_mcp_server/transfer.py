@@ -0,0 +1,199 @@
+"""NDJSON export and import files for memory scopes, checkpointed so interrupted runs resume."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+try:
+    from .scopes import fingerprint
+except ImportError:  # pragma: no cover - script execution
+    from scopes import fingerprint
+
+Encode = Callable[[Any], str]
+
+
+def _load(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _save(path: Path, state: Dict[str, Any]) -> None:
+    # write-then-rename, so a crash never leaves a torn checkpoint behind
+    partial = path.with_name(path.name + ".tmp")
+    partial.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(partial, path)
+
+
+class ExportFile:
+    """An NDJSON export written one page at a time, one memory per line.
+
+    After every page the file is flushed and `<path>.checkpoint` records the request, the next
+    page and the file size. Opening with `resume` continues a checkpoint left by the same
+    request: anything written after it is truncated and the export restarts at its next page.
+    `finish` removes the checkpoint. Only one page is held at a time.
+    """
+
+    def __init__(self, path: Path, request: Dict[str, Any], encode: Encode = json.dumps) -> None:
+        self.path = path
+        self.checkpoint = path.with_name(path.name + ".checkpoint")
+        self.request = fingerprint(json.dumps(request, sort_keys=True, default=str))
+        self.exported = 0
+        self.next_page = 1
+        self._encode = encode
+        self._file: Optional[IO[bytes]] = None
+
+    def open(self, resume: bool = True) -> bool:
+        """Open for writing; return whether an earlier export is being resumed."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        state = _load(self.checkpoint) if resume and self.path.exists() else None
+        if (
+            state is not None
+            and state.get("request") == self.request
+            and self.path.stat().st_size >= state["bytes"]
+        ):
+            self._file = open(self.path, "r+b")  # noqa: SIM115 - closed by finish/close
+            self._file.truncate(state["bytes"])
+            self._file.seek(state["bytes"])
+            self.exported = state["exported"]
+            self.next_page = state["next_page"]
+            return True
+        self._file = open(self.path, "wb")  # noqa: SIM115 - closed by finish/close
+        self._save()
+        return False
+
+    def write_page(self, page: int, items: Iterable[Any]) -> None:
+        assert self._file is not None
+        for item in items:
+            self._file.write(self._encode(item).encode("utf-8") + b"\n")
+            self.exported += 1
+        self._file.flush()
+        self.next_page = page + 1
+        self._save()
+
+    def finish(self) -> None:
+        self.close()
+        self.checkpoint.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _save(self) -> None:
+        assert self._file is not None
+        _save(
+            self.checkpoint,
+            {
+                "request": self.request,
+                "next_page": self.next_page,
+                "exported": self.exported,
+                "bytes": self._file.tell(),
+            },
+        )
+
+
+class ImportProgress:
+    """How far an import of `path` got, kept in `<path>.import-checkpoint` between batches.
+
+    `line` is the last line of the file handled in order and `done` holds the lines after it
+    that were already handled, so a resumed import never adds a memory twice. Every line that
+    could not be imported is appended to `<path>.import-errors`, one JSON object per line.
+    A checkpoint only resumes an import of a file with the same size.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.checkpoint = path.with_name(path.name + ".import-checkpoint")
+        self.errors = path.with_name(path.name + ".import-errors")
+        self.size = path.stat().st_size
+        self.line = 0  # lines of the file already handled
+        self.done: Set[int] = set()
+        self.imported = 0
+        self.failed = 0
+
+    def load(self, resume: bool = True) -> bool:
+        """Pick up a matching checkpoint; return whether an earlier import is being resumed."""
+
+        state = _load(self.checkpoint) if resume else None
+        if state is None or state.get("size") != self.size:
+            self.errors.unlink(missing_ok=True)
+            return False
+        self.line = state.get("line", 0)
+        self.done = set(state.get("done", ()))
+        self.imported = state.get("imported", 0)
+        self.failed = state.get("failed", 0)
+        return True
+
+    def save(self, failures: Iterable[Dict[str, Any]] = ()) -> None:
+        """Append `failures` to the errors file, then checkpoint."""
+
+        lines = "".join(json.dumps(failure) + "\n" for failure in failures)
+        if lines:
+            with open(self.errors, "a", encoding="utf-8") as errors:
+                errors.write(lines)
+        _save(
+            self.checkpoint,
+            {
+                "size": self.size,
+                "line": self.line,
+                "done": sorted(self.done),
+                "imported": self.imported,
+                "failed": self.failed,
+            },
+        )
+
+    def finish(self) -> None:
+        self.checkpoint.unlink(missing_ok=True)
+        if not self.failed:
+            self.errors.unlink(missing_ok=True)
+
+
+def read_records(path: Path, start_line: int = 0) -> Generator[Tuple[int, Any], None, None]:
+    """Lazily yield (line number, parsed JSON or None when unparsable) after `start_line`."""
+
+    with open(path, "rb") as lines:
+        for number, line in enumerate(lines, 1):
+            if number <= start_line or not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError:
+                yield number, None
+
+
+def read_batch(records: Iterator[Tuple[int, Any]], size: int) -> List[Tuple[int, Any]]:
+    """The next `size` records of `read_records`, fewer at the end of the file. Blocking."""
+
+    return list(itertools.islice(records, size))
+
+
+def unix_time(value: Any) -> Optional[int]:
+    """Seconds since the epoch of an ISO 8601 timestamp such as Mem0's `created_at`."""
+
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
@@ -0,0 +1,83 @@
+"""Versions of memory scopes, bumped by writes, and the resource subscriptions they notify."""
+
+from __future__ import annotations
+
+import itertools
+import secrets
+import weakref
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+try:
+    from .scopes import Scope
+except ImportError:  # pragma: no cover - script execution
+    from scopes import Scope
+
+
+class ScopeVersions:
+    """Per-tenant scope versions usable as ETags, plus who subscribed to which scope.
+
+    Every bump takes the next value of one process-wide counter, so a version never repeats;
+    the random prefix keeps versions from an earlier process from matching. Writes with known
+    scopes bump just those; writes with unknown scopes bump the tenant, which changes the
+    version of all its scopes. Past `max_scopes` counters the oldest are folded into their
+    tenant's floor: their versions stay unchanged or move forward, never back.
+    """
+
+    def __init__(self, max_scopes: int = 100_000) -> None:
+        self.max_scopes = max_scopes
+        self.bumps = 0
+        self._prefix = secrets.token_hex(4)
+        self._counter = itertools.count(1)
+        self._scopes: Dict[Tuple[str, Scope], int] = {}  # insertion order = least recently bumped
+        self._floors: Dict[str, int] = {}
+        # subscriber (an MCP session) -> uri -> (tenant, scope)
+        self._subscriptions: weakref.WeakKeyDictionary[Any, Dict[str, Tuple[str, Scope]]]
+        self._subscriptions = weakref.WeakKeyDictionary()
+
+    def version(self, tenant: str, scope: Scope) -> str:
+        value = max(self._floors.get(tenant, 0), self._scopes.get((tenant, scope), 0))
+        return f"{self._prefix}-{value}"
+
+    def bump(
+        self, tenant: str, scopes: Optional[FrozenSet[Scope]] = None
+    ) -> List[Tuple[Any, str]]:
+        """Bump `scopes` (all of the tenant's when None); return the (subscriber, uri) to notify."""
+
+        self.bumps += 1
+        value = next(self._counter)
+        if scopes is None:
+            self._floors[tenant] = value
+        else:
+            for scope in scopes:
+                self._scopes.pop((tenant, scope), None)
+                self._scopes[(tenant, scope)] = value
+            while len(self._scopes) > self.max_scopes:
+                key = next(iter(self._scopes))
+                old = self._scopes.pop(key)
+                self._floors[key[0]] = max(self._floors.get(key[0], 0), old)
+        return [
+            (subscriber, uri)
+            for subscriber, uris in list(self._subscriptions.items())
+            for uri, (owner, scope) in uris.items()
+            if owner == tenant and (scopes is None or scope in scopes)
+        ]
+
+    def subscribe(self, subscriber: Any, tenant: str, scope: Scope, uri: str) -> None:
+        self._subscriptions.setdefault(subscriber, {})[uri] = (tenant, scope)
+
+    def unsubscribe(self, subscriber: Any, uri: str) -> None:
+        uris = self._subscriptions.get(subscriber)
+        if uris is not None:
+            uris.pop(uri, None)
+            if not uris:
+                del self._subscriptions[subscriber]
+
+    def subscribed(self, subscriber: Any) -> int:
+        return len(self._subscriptions.get(subscriber, ()))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scopes": len(self._scopes),
+            "bumps": self.bumps,
+            "subscriptions": sum(len(uris) for uris in self._subscriptions.values()),
+        }
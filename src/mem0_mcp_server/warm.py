@@ -0,0 +1,121 @@
+"""Per-session warm cache of the default scope's memories, fetched when the session starts."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional, Tuple
+
+logger = logging.getLogger("mem0_mcp_server.warm")
+
+
+class SessionWarmer:
+    """One session's snapshot of a read (`request`), prefetched and refreshed in the background.
+
+    `start` fetches the snapshot without blocking the session's handshake. `snapshot` returns
+    it while younger than `max_age` and, once it is older than `refresh_after`, starts a
+    background refresh; at most one fetch per session runs at a time and `limiter` bounds
+    fetches across sessions. `invalidate` drops the snapshot after a write so the next use
+    fetches it again.
+    """
+
+    def __init__(
+        self,
+        tenant: str,
+        request: Dict[str, Any],
+        scopes: FrozenSet[Tuple[str, str]],
+        fetch: Callable[[], Awaitable[Any]],
+        limiter: asyncio.Semaphore,
+        refresh_after: float = 60.0,
+        max_age: float = 600.0,
+    ) -> None:
+        self.tenant = tenant
+        self.request = request
+        self.scopes = scopes
+        self.refresh_after = refresh_after
+        self.max_age = max_age
+        self.fetches = 0
+        self.hits = 0
+        self._fetch = fetch
+        self._limiter = limiter
+        self._result: Any = None
+        self._memories: Dict[str, Dict[str, Any]] = {}
+        self._fetched = 0.0
+        self._epoch = 0  # bumped by invalidate; a fetch started before it is discarded
+        self._task: Optional[asyncio.Task[None]] = None
+        self._closed = False
+
+    def start(self) -> None:
+        if self._task is None and not self._closed:
+            self._task = asyncio.ensure_future(self._refresh())
+
+    async def _refresh(self) -> None:
+        epoch = self._epoch
+        try:
+            async with self._limiter:
+                result = await self._fetch()
+            self.fetches += 1
+            if epoch == self._epoch:
+                self._result = result
+                self._memories = _by_id(result)
+                self._fetched = time.monotonic()
+        except Exception as exc:  # noqa: BLE001 - the session simply stays cold
+            logger.warning("Session prefetch failed: %s", exc)
+        finally:
+            self._task = None
+
+    def snapshot(self) -> Optional[Any]:
+        if self._result is None:
+            self.start()
+            return None
+        age = time.monotonic() - self._fetched
+        if age >= self.refresh_after:
+            self.start()
+        if age >= self.max_age:
+            return None
+        self.hits += 1
+        return self._result
+
+    async def current(self, timeout: float) -> Optional[Any]:
+        """The snapshot, waiting up to `timeout` seconds for a fetch in progress."""
+
+        snapshot = self.snapshot()
+        if snapshot is None and self._task is not None:
+            await asyncio.wait({self._task}, timeout=timeout)
+            snapshot = self.snapshot()
+        return snapshot
+
+    def memory(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """One memory of the snapshot, if the snapshot is usable and holds it."""
+
+        if memory_id not in self._memories or self.snapshot() is None:
+            return None
+        return self._memories[memory_id]
+
+    def contains(self, memory_id: str) -> bool:
+        """Whether the snapshot holds `memory_id`, without counting a hit or starting a refresh."""
+
+        return memory_id in self._memories
+
+    def invalidate(self) -> None:
+        self._epoch += 1
+        self._result = None
+        self._memories = {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"memories": len(self._memories), "fetches": self.fetches, "hits": self.hits}
+
+    async def aclose(self) -> None:
+        self._closed = True
+        task = self._task
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+def _by_id(result: Any) -> Dict[str, Dict[str, Any]]:
+    items = result.get("results") if isinstance(result, dict) else result
+    if not isinstance(items, list):
+        return {}
+    return {str(item["id"]): item for item in items if isinstance(item, dict) and item.get("id")}
@@ -0,0 +1,111 @@
+import json
+import os
+import re
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import pytest
+
+# mem0 reports usage to PostHog unless told not to; tests never leave the machine
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+
+from mem0_mcp_server.scopes import SCOPE_FIELDS
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class FakeMem0:
+    """In-memory stand-in for the Mem0 REST endpoints the server calls.
+
+    `fail(request)` may return a response to send instead, e.g. to simulate an outage.
+    """
+
+    def __init__(self) -> None:
+        self.memories: Dict[str, Dict[str, Any]] = {}
+        self.added: List[str] = []
+        self.pages: List[int] = []  # get_all pages requested, in order
+        self.fail: Optional[Callable[[httpx.Request], Optional[httpx.Response]]] = None
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if self.fail is not None:
+            failure = self.fail(request)
+            if failure is not None:
+                return failure
+        path = request.url.path
+        body = json.loads(request.content) if request.content else {}
+        if path == "/v1/memories/" and request.method == "POST":
+            events = []
+            for message in body["messages"]:
+                memory_id = str(uuid.uuid4())
+                self.memories[memory_id] = {
+                    "id": memory_id,
+                    "memory": message["content"],
+                    **{field: body[field] for field in SCOPE_FIELDS if body.get(field)},
+                }
+                self.added.append(message["content"])
+                events.append({"id": memory_id, "event": "ADD", "memory": message["content"]})
+            return httpx.Response(200, json={"results": events})
+        if path == "/v2/memories/":
+            items = list(self.memories.values())
+            page = int(request.url.params.get("page", 1))
+            size = int(request.url.params.get("page_size", len(items) or 1))
+            self.pages.append(page)
+            more = page * size < len(items)
+            return httpx.Response(
+                200,
+                json={
+                    "count": len(items),
+                    "next": f"?page={page + 1}" if more else None,
+                    "results": items[(page - 1) * size : page * size],
+                },
+            )
+        if path == "/v1/memories/" and request.method == "DELETE":
+            self._delete(dict(request.url.params))
+            return httpx.Response(200, json={"message": "Memories deleted successfully!"})
+        match = re.match(r"/v2/entities/(user|agent|app|run)/([^/]+)/", path)
+        if match and request.method == "DELETE":
+            self._delete({f"{match.group(1)}_id": match.group(2)})
+            return httpx.Response(200, json={"message": "Entity deleted successfully."})
+        match = re.match(r"/v1/memories/([^/]+)/", path)
+        if match and match.group(1) in self.memories:
+            if request.method == "DELETE":
+                del self.memories[match.group(1)]
+                return httpx.Response(200, json={"message": "Memory deleted successfully!"})
+            return httpx.Response(200, json=self.memories[match.group(1)])
+        return httpx.Response(404, json={"detail": "not found"})
+
+    def _delete(self, scope: Dict[str, str]) -> None:
+        scope = {field: value for field, value in scope.items() if field in SCOPE_FIELDS}
+        for memory_id, memory in list(self.memories.items()):
+            if all(memory.get(field) == value for field, value in scope.items()):
+                del self.memories[memory_id]
+
+
+@pytest.fixture
+def fake_mem0(monkeypatch: pytest.MonkeyPatch) -> FakeMem0:
+    """Point the server's upstream clients at a FakeMem0."""
+
+    from mem0 import AsyncMemoryClient
+
+    from mem0_mcp_server import server
+
+    def validate(client: AsyncMemoryClient) -> str:
+        client.org_id, client.project_id = "org", "project"
+        return "tests@example.com"
+
+    fake = FakeMem0()
+
+    def build(api_key: str, pool: Any = None) -> AsyncMemoryClient:
+        http = httpx.AsyncClient(transport=fake.transport())
+        return AsyncMemoryClient(api_key=api_key, client=http)
+
+    monkeypatch.setattr(AsyncMemoryClient, "_validate_api_key", validate)
+    monkeypatch.setattr(server._CLIENTS, "_factory", build)
+    return fake
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from mem0_mcp_server.admission import (
+    EXPENSIVE,
+    READ,
+    WRITE,
+    AdmissionController,
+    Limits,
+    Throttled,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bucket_refuses_calls_beyond_the_burst():
+    admission = AdmissionController(Limits(rate=1.0, burst=2.0))
+
+    for _ in range(2):
+        async with admission.admit("t"):
+            pass
+    with pytest.raises(Throttled) as refused:
+        async with admission.admit("t"):
+            pass
+
+    assert refused.value.reason == "rate_limited"
+    assert 0 < refused.value.retry_after <= 1.0
+    assert refused.value.body()["error"] == "throttled"
+    # other tenants have buckets of their own
+    async with admission.admit("other"):
+        pass
+
+
+def test_limits_can_only_be_tightened():
+    limits = Limits(rate=10.0, concurrency=4)
+
+    assert limits.tightened(rate=20.0, concurrency=2) == Limits(rate=10.0, concurrency=2)
+    assert Limits().tightened(rate=5.0).rate == 5.0
+    assert limits.tightened(rate=None, concurrency=0) is limits
+
+
+async def _hold(admission, tenant, priority, started, release, order):
+    async with admission.admit(tenant, priority=priority):
+        order.append((tenant, priority))
+        started.set()
+        await release.wait()
+
+
+async def test_freed_slots_go_to_the_cheapest_waiting_call():
+    admission = AdmissionController(Limits(concurrency=1))
+    release, order = asyncio.Event(), []
+    started = asyncio.Event()
+    holder = asyncio.ensure_future(_hold(admission, "t", WRITE, started, release, order))
+    await started.wait()
+    waiters = [
+        asyncio.ensure_future(_hold(admission, "t", p, asyncio.Event(), release, order))
+        for p in (EXPENSIVE, WRITE, READ)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(holder, *waiters)
+
+    assert [priority for _, priority in order] == [WRITE, READ, WRITE, EXPENSIVE]
+
+
+async def test_waiting_tenants_are_served_round_robin():
+    admission = AdmissionController(Limits(), max_concurrent=1)
+    release, order = asyncio.Event(), []
+    started = asyncio.Event()
+    holder = asyncio.ensure_future(_hold(admission, "busy", READ, started, release, order))
+    await started.wait()
+    waiters = [
+        asyncio.ensure_future(_hold(admission, tenant, READ, asyncio.Event(), release, order))
+        for tenant in ("busy", "busy", "busy", "quiet")
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(holder, *waiters)
+
+    assert [tenant for tenant, _ in order] == ["busy", "busy", "quiet", "busy", "busy"]
+
+
+async def test_full_queue_and_long_waits_are_refused():
+    admission = AdmissionController(Limits(concurrency=1, max_queue=1, max_wait=0.05))
+    release, started = asyncio.Event(), asyncio.Event()
+    holder = asyncio.ensure_future(_hold(admission, "t", READ, started, release, []))
+    await started.wait()
+    waiter = asyncio.ensure_future(_hold(admission, "t", READ, asyncio.Event(), release, []))
+    await asyncio.sleep(0)
+
+    with pytest.raises(Throttled) as full:
+        async with admission.admit("t"):
+            pass
+    assert full.value.reason == "queue_full"
+    with pytest.raises(Throttled) as timed_out:
+        await waiter
+    assert timed_out.value.reason == "queue_timeout"
+
+    release.set()
+    await holder
+    assert admission.stats()["running"] == 0
@@ -0,0 +1,108 @@
+import pytest
+
+from mem0_mcp_server.cache import ResultCache, scopes_from_filters, scopes_from_ids
+from mem0_mcp_server.scopes import ANY_SCOPE
+
+ALICE = frozenset({("user_id", "alice")})
+BOB = frozenset({("user_id", "bob")})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("mem0_mcp_server.cache.time.monotonic", lambda: now[0])
+    return now
+
+
+def _put(cache, api_key, name, value, scopes, generation=None):
+    key = cache.make_key(api_key, "get_memories", {"name": name})
+    cache.put(api_key, key, value, scopes, generation=generation)
+    return key
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = ResultCache(ttl=10)
+    key = _put(cache, "k", "a", {"results": []}, ALICE)
+
+    assert cache.get(key) == {"results": []}
+    clock[0] += 10
+    assert cache.get(key) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_entries=2)
+    first = _put(cache, "k", "a", 1, ALICE)
+    second = _put(cache, "k", "b", 2, ALICE)
+    cache.get(first)
+    _put(cache, "k", "c", 3, ALICE)
+
+    assert cache.get(first) == 1
+    assert cache.get(second) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_keys_are_per_tenant_and_argument_order_insensitive():
+    cache = ResultCache()
+
+    assert cache.make_key("k", "t", {"a": 1, "b": 2}) == cache.make_key("k", "t", {"b": 2, "a": 1})
+    assert cache.make_key("k", "t", {"a": 1}) != cache.make_key("other", "t", {"a": 1})
+    assert "k" not in cache.make_key("k", "t", {})
+
+
+def test_invalidation_drops_only_entries_reading_the_written_scopes():
+    cache = ResultCache()
+    alice = _put(cache, "k", "alice", 1, ALICE)
+    bob = _put(cache, "k", "bob", 2, BOB)
+    anything = _put(cache, "k", "any", 3, frozenset({ANY_SCOPE}))
+    other_tenant = _put(cache, "other", "alice", 4, ALICE)
+
+    assert cache.invalidate("k", ALICE) == 2
+    assert cache.get(alice) is None and cache.get(anything) is None
+    assert cache.get(bob) == 2
+    assert cache.get(other_tenant) == 4
+
+
+def test_reads_started_before_a_write_are_not_cached():
+    cache = ResultCache()
+    generation = cache.generation("k")
+    cache.invalidate("k", ALICE)
+    key = _put(cache, "k", "a", 1, ALICE, generation=generation)
+
+    assert cache.get(key) is None
+    assert cache.generation("other") == 0
+
+
+def test_writes_to_a_seen_memory_invalidate_its_scopes_only():
+    cache = ResultCache()
+    listing = {"results": [{"id": "m1", "memory": "x", "user_id": "alice"}]}
+    alice = _put(cache, "k", "alice", listing, ALICE)
+    bob = _put(cache, "k", "bob", 2, BOB)
+
+    assert cache.scopes_of("k", "m1") == ALICE
+    cache.invalidate_memory("k", "m1")
+    assert cache.get(alice) is None and cache.get(bob) == 2
+    # the memory's scopes are no longer known, so the next write clears the tenant
+    assert cache.scopes_of("k", "m1") is None
+    cache.invalidate_memory("k", "m1")
+    assert cache.get(bob) is None
+
+
+def test_scopes_are_read_from_filters_and_ids():
+    filters = {"AND": [{"user_id": "alice"}, {"agent_id": {"in": ["a", "b"]}}]}
+
+    assert scopes_from_filters(filters) == {
+        ("user_id", "alice"),
+        ("agent_id", "a"),
+        ("agent_id", "b"),
+    }
+    assert scopes_from_filters({"NOT": [{"user_id": "alice"}]}) == {ANY_SCOPE}
+    assert scopes_from_ids(user_id="alice", agent_id=None, other="x") == ALICE
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResultCache(ttl=0)
+    key = _put(cache, "k", "a", 1, ALICE)
+
+    assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,66 @@
+from mem0_mcp_server.dedup import DedupIndex, normalize
+
+ALICE = ("alice", None, None, None)
+ALICE_BOT = ("alice", "bot", None, None)
+BOB = ("bob", None, None, None)
+
+
+def test_near_identical_texts_in_one_scope_are_duplicates():
+    index = DedupIndex(threshold=0.9)
+    first, entry = index.check("t", ALICE, "I love green tea in the morning.")
+    duplicate, skipped = index.check("t", ALICE, "i love green tea, in the morning")
+
+    assert first is None and entry is not None
+    assert duplicate is not None and skipped is None
+    assert duplicate.similarity == 1.0
+    assert duplicate.body()["status"] == "deduplicated"
+
+
+def test_other_texts_scopes_and_tenants_are_not_duplicates():
+    index = DedupIndex(threshold=0.9)
+    index.check("t", ALICE, "I love green tea in the morning")
+
+    assert index.check("t", ALICE, "I love black coffee at night")[0] is None
+    assert index.check("t", BOB, "I love green tea in the morning")[0] is None
+    assert index.check("other", ALICE, "I love green tea in the morning")[0] is None
+
+
+def test_old_texts_fall_out_of_the_window(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("mem0_mcp_server.dedup.time.monotonic", lambda: now[0])
+    index = DedupIndex(window=60)
+    index.check("t", ALICE, "remember the milk")
+    now[0] = 61
+
+    assert index.check("t", ALICE, "remember the milk")[0] is None
+
+
+def test_discarded_entries_no_longer_suppress_a_retry():
+    index = DedupIndex()
+    _, entry = index.check("t", ALICE, "a failed write")
+    index.discard("t", ALICE, entry)
+
+    assert index.check("t", ALICE, "a failed write")[0] is None
+
+
+def test_forget_drops_matching_scopes_only():
+    index = DedupIndex()
+    for scope in (ALICE, ALICE_BOT, BOB):
+        index.check("t", scope, "same text")
+    index.check("other", ALICE, "same text")
+
+    index.forget("t", user_id="alice", agent_id="bot")
+    assert index.check("t", ALICE_BOT, "same text")[0] is None
+    assert index.check("t", ALICE, "same text")[0] is not None
+
+    index.forget("t", user_id="alice")
+    assert index.check("t", ALICE, "same text")[0] is None
+    assert index.check("t", BOB, "same text")[0] is not None
+
+    index.forget("t")
+    assert index.check("t", BOB, "same text")[0] is None
+    assert index.check("other", ALICE, "same text")[0] is not None
+
+
+def test_normalize_ignores_case_punctuation_and_spacing():
+    assert normalize("  Hello,   WORLD!! ") == "hello world"
@@ -0,0 +1,56 @@
+from mem0_mcp_server.delta import DeltaIndex, chunked, turn_hashes
+
+ALICE = ("alice", None, None, None)
+BOB = ("bob", None, None, None)
+
+
+def _turns(*texts, role="user"):
+    return [{"role": role, "content": text} for text in texts]
+
+
+def test_prefix_hashes_cover_role_content_and_order():
+    hashes = turn_hashes(_turns("a", "b"))
+
+    assert len(hashes) == 2 and hashes[0] == turn_hashes(_turns("a"))[0]
+    assert hashes != turn_hashes(_turns("b", "a"))
+    assert hashes != turn_hashes(_turns("a", "b", role="assistant"))
+
+
+def test_delta_skips_the_longest_ingested_prefix():
+    index = DeltaIndex()
+    history = _turns("hi", "I like tea", "and scones")
+    index.record("t", ALICE, turn_hashes(history[:2]))
+
+    assert index.skip("t", ALICE, turn_hashes(history)) == 2
+    assert index.skip("t", BOB, turn_hashes(history)) == 0
+    assert index.skip("other", ALICE, turn_hashes(history)) == 0
+    # an edited turn invalidates everything after it
+    edited = _turns("hi", "I like coffee", "and scones")
+    assert index.skip("t", ALICE, turn_hashes(edited)) == 1
+    # the same turns at another position are not a prefix
+    assert index.skip("t", ALICE, turn_hashes(history[1:])) == 0
+    assert index.stats() == {"scopes": 1, "turns": 2, "skipped": 3}
+
+
+def test_delta_forget_and_bounds():
+    index = DeltaIndex(max_turns=2, max_scopes=2)
+    history = _turns("a", "b", "c")
+    index.record("t", ALICE, turn_hashes(history))
+
+    assert index.skip("t", ALICE, turn_hashes(history)) == 3
+    assert index.skip("t", ALICE, turn_hashes(history[:1])) == 0  # evicted
+    index.forget("t", user_id="alice")
+    assert index.skip("t", ALICE, turn_hashes(history)) == 0
+
+    for tenant in ("t1", "t2", "t3"):
+        index.record(tenant, ALICE, turn_hashes(history[:1]))
+    assert [index.skip(t, ALICE, turn_hashes(history)) for t in ("t1", "t2", "t3")] == [0, 1, 1]
+
+
+def test_chunks_are_as_even_as_possible():
+    turns = _turns(*"abcdefg")
+
+    assert [len(chunk) for chunk in chunked(turns, 3)] == [2, 2, 3]
+    assert chunked(turns, 0) == [turns]
+    assert chunked(turns[:3], 3) == [turns[:3]]
+    assert [turn for chunk in chunked(turns, 2) for turn in chunk] == turns
@@ -0,0 +1,76 @@
+import pytest
+
+from mem0_mcp_server.filters import CompiledFilters, FilterError, compile_filters, keyable
+from mem0_mcp_server.scopes import ANY_SCOPE
+
+
+def test_default_user_is_added_when_the_tree_names_none():
+    compiled = compile_filters({"agent_id": "bot"}, "alice")
+
+    assert compiled == {"AND": [{"agent_id": "bot"}, {"user_id": "alice"}]}
+    assert compiled.scopes == {("agent_id", "bot"), ("user_id", "alice")}
+
+
+def test_user_only_inside_not_still_gets_the_default_user():
+    compiled = compile_filters({"NOT": {"user_id": "bob"}}, "alice")
+
+    assert {"user_id": "alice"} in compiled["AND"]
+    assert ANY_SCOPE in compiled.scopes
+
+
+def test_equivalent_trees_share_canonical_form_and_digest():
+    a = compile_filters({"AND": [{"user_id": "u"}, {"AND": [{"x": 1}, {"y": {"gt": 2}}]}]}, "d")
+    b = compile_filters({"y": {"gt": 2}, "AND": [{"x": 1}, {"user_id": "u"}, {"x": 1}]}, "d")
+
+    assert a.canonical == b.canonical
+    assert a.digest == b.digest
+    assert a == b == {"AND": [{"user_id": "u"}, {"x": 1}, {"y": {"gt": 2}}]}
+
+
+def test_in_operator_pins_every_listed_scope():
+    compiled = compile_filters({"user_id": {"in": ["a", "b"]}}, "d")
+
+    assert compiled.scopes == {("user_id", "a"), ("user_id", "b")}
+
+
+def test_wildcards_cannot_be_pinned():
+    assert compile_filters({"user_id": "*"}, "d").scopes == {ANY_SCOPE}
+
+
+def test_metadata_objects_are_matched_verbatim():
+    compiled = compile_filters({"metadata": {"gt": 1}}, "d")
+
+    assert {"metadata": {"gt": 1}} in compiled["AND"]
+
+
+@pytest.mark.parametrize(
+    ("filters", "message"),
+    [
+        ({"AND": []}, "filters.AND must be a non-empty list"),
+        ({"user_id": {"xx": 1}}, "Unknown operator 'xx' at filters.user_id.xx"),
+        ({"tag": {"in": "a"}}, "expects a list"),
+        ({"created_at": {"gte": None}}, "expects a number or a date string"),
+        ({"memory": {"contains": 3}}, "expects a string"),
+        ({"tag": {}}, "names no operator"),
+        ({"OR": [{}]}, "filters.OR[0] must be a non-empty object"),
+    ],
+)
+def test_malformed_trees_are_rejected(filters, message):
+    with pytest.raises(FilterError, match=message.replace("[", r"\[").replace("]", r"\]")):
+        compile_filters(filters, "d")
+
+
+def test_compiled_filters_are_memoized_and_pass_through():
+    filters = {"user_id": "memo", "topic": "tea"}
+    first = compile_filters(filters, "d")
+
+    assert compile_filters(dict(filters), "d") is first
+    assert compile_filters(first, "other") is first
+
+
+def test_keyable_replaces_compiled_filters_with_their_digest():
+    compiled = compile_filters({"user_id": "u"}, "d")
+
+    assert isinstance(compiled, CompiledFilters)
+    assert keyable({"filters": compiled, "limit": 5}) == {"filters": compiled.digest, "limit": 5}
+    assert keyable({"filters": {"raw": 1}}) == {"filters": {"raw": 1}}
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from mem0_mcp_server.ingest import IngestQueue, QueueFullError
+
+pytestmark = pytest.mark.anyio
+
+ALICE = {"user_id": "alice"}
+
+
+def _turn(text):
+    return [{"role": "user", "content": text}]
+
+
+class Upstream:
+    """Records each add and can hold or fail them."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.errors = []
+
+    async def submit(self, api_key, conversation, payload):
+        self.calls.append(([turn["content"] for turn in conversation], payload))
+        await self.release.wait()
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"results": [{"event": "ADD"}]}
+
+
+async def _settled(queue, api_key, job):
+    for _ in range(200):
+        if queue.job(api_key, job.id).finished_at is not None:
+            return job
+        await asyncio.sleep(0.005)
+    raise AssertionError("job never settled")
+
+
+async def test_queued_adds_to_one_scope_are_coalesced_in_order():
+    upstream = Upstream()
+    upstream.release.clear()
+    queue = IngestQueue(upstream.submit, workers=1)
+    first = await queue.enqueue("k", _turn("a"), ALICE)
+    await asyncio.sleep(0)  # the worker picks up the first add on its own
+    rest = [await queue.enqueue("k", _turn(text), ALICE) for text in "bcd"]
+    other = await queue.enqueue("k", _turn("e"), {"user_id": "bob"})
+    upstream.release.set()
+    for job in [first, *rest, other]:
+        await _settled(queue, "k", job)
+
+    assert upstream.calls == [(["a"], ALICE), (["b", "c", "d"], ALICE), (["e"], {"user_id": "bob"})]
+    assert [job.coalesced_with for job in rest] == [2, 2, 2]
+    assert {job.status for job in [first, *rest, other]} == {"succeeded"}
+    assert queue.stats()["coalesced"] == 2
+    assert await queue.drain(1.0)
+
+
+async def test_a_full_queue_refuses_adds_after_the_enqueue_timeout():
+    upstream = Upstream()
+    upstream.release.clear()
+    queue = IngestQueue(upstream.submit, max_size=1, workers=1, enqueue_timeout=0.05)
+    await queue.enqueue("k", _turn("a"), ALICE)
+    await asyncio.sleep(0)
+    await queue.enqueue("k", _turn("b"), ALICE)
+
+    with pytest.raises(QueueFullError, match="full"):
+        await queue.enqueue("k", _turn("c"), ALICE)
+    assert queue.stats()["rejected"] == 1
+    upstream.release.set()
+    assert await queue.drain(1.0)
+
+
+async def test_transient_failures_are_retried_and_others_fail_the_job():
+    upstream = Upstream()
+    upstream.errors = [ConnectionError("reset"), ConnectionError("reset")]
+    settled = []
+    queue = IngestQueue(
+        upstream.submit,
+        backoff=0.0,
+        retryable=lambda exc: isinstance(exc, ConnectionError),
+    )
+    job = await queue.enqueue("k", _turn("a"), ALICE, on_success=lambda: settled.append("ok"))
+    await _settled(queue, "k", job)
+
+    assert (job.status, job.attempts, queue.stats()["retries"]) == ("succeeded", 3, 2)
+
+    upstream.errors = [ValueError("bad request")]
+    job = await queue.enqueue("k", _turn("b"), ALICE, on_failure=lambda: settled.append("failed"))
+    await _settled(queue, "k", job)
+
+    assert (job.status, job.attempts, job.error) == ("failed", 1, "bad request")
+    assert settled == ["ok", "failed"]
+    assert await queue.drain(1.0)
+
+
+async def test_jobs_are_visible_to_their_tenant_only():
+    queue = IngestQueue(Upstream().submit)
+    job = await queue.enqueue("k", _turn("a"), ALICE)
+
+    assert queue.job("k", job.id) is job
+    assert queue.job("other", job.id) is None
+    assert queue.job("k", "unknown") is None
+    assert await queue.drain(1.0)
+
+
+async def test_drain_flushes_queued_adds_and_refuses_new_ones():
+    upstream = Upstream()
+    queue = IngestQueue(upstream.submit, workers=1)
+    jobs = [await queue.enqueue("k", _turn(text), {"user_id": text}) for text in "abc"]
+
+    assert await queue.drain(1.0)
+    assert {job.status for job in jobs} == {"succeeded"}
+    assert len(upstream.calls) == 3
+    with pytest.raises(QueueFullError, match="shutting down"):
+        await queue.enqueue("k", _turn("d"), ALICE)
@@ -0,0 +1,72 @@
+import time
+
+import anyio
+import pytest
+from starlette.testclient import TestClient
+
+from mem0_mcp_server import http_entry, metrics
+from mem0_mcp_server.metrics import Counter, Histogram, Registry
+
+
+def test_exposition_is_prometheus_text():
+    registry = Registry()
+    calls = registry.register(Counter("calls_total", "Calls.", ("tool", "outcome")))
+    latency = registry.register(Histogram("latency_seconds", "Latency.", ("tool",), (0.1, 1.0)))
+    registry.add_collector(lambda: {"queue_depth": ("Queued jobs.", 3)})
+    calls.inc("search", 'bad "quote"\n')
+    calls.inc("search", "ok", amount=2)
+    for value in (0.05, 0.5, 5.0):
+        latency.observe("search", value=value)
+
+    assert registry.render().splitlines() == [
+        "# HELP calls_total Calls.",
+        "# TYPE calls_total counter",
+        'calls_total{tool="search",outcome="bad \\"quote\\"\\n"} 1',
+        'calls_total{tool="search",outcome="ok"} 2',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{tool="search",le="0.1"} 1',
+        'latency_seconds_bucket{tool="search",le="1"} 2',
+        'latency_seconds_bucket{tool="search",le="+Inf"} 3',
+        'latency_seconds_sum{tool="search"} 5.55',
+        'latency_seconds_count{tool="search"} 3',
+        "# HELP queue_depth Queued jobs.",
+        "# TYPE queue_depth gauge",
+        "queue_depth 3",
+    ]
+    with pytest.raises(ValueError, match="expects labels"):
+        calls.inc("search")
+
+
+def test_upstream_time_is_not_counted_as_local_time():
+    local = metrics.TOOL_LOCAL_DURATION
+
+    with (
+        metrics.tool_call("metrics_test_tool"),
+        metrics.upstream_request("search"),
+        metrics.coalesced_request("search"),
+    ):
+        time.sleep(0.05)
+
+    counts, total = local._values[("metrics_test_tool",)]
+    assert sum(counts) == 1 and total[0] < 0.04
+    assert metrics.TOOL_REQUESTS._values[("metrics_test_tool", "ok")] == 1
+    assert metrics.COALESCED_REQUESTS._values[("metrics_test_tool", "search")] == 1
+    assert metrics.UPSTREAM_IN_FLIGHT._values[("search",)] == 0
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_the_metrics_route_is_opt_in(monkeypatch, enabled):
+    served = []
+    monkeypatch.setattr(http_entry, "ENV_METRICS_ENABLED", enabled)
+    monkeypatch.setattr(anyio, "run", lambda serve, server, transport: served.append(server))
+
+    http_entry.main()
+    response = TestClient(served[0].streamable_http_app()).get("/metrics")
+
+    if enabled:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE mem0_mcp_tool_requests_total counter" in response.text
+    else:
+        assert response.status_code == 404
@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import pytest
+
+from mem0_mcp_server.pagination import PageCursors, collect_pages, has_more
+
+pytestmark = pytest.mark.anyio
+
+
+def _fetcher(total, page_size, calls):
+    async def fetch(page):
+        calls.append(page)
+        start = (page - 1) * page_size
+        items = [{"id": str(i)} for i in range(start, min(total, start + page_size))]
+        return {"count": total, "results": items}
+
+    return fetch
+
+
+def test_has_more_prefers_next_then_count_then_a_full_page():
+    assert has_more({"next": "p2", "count": 1}, 1, 10)
+    assert not has_more({"next": None, "count": 100}, 1, 10)
+    assert has_more({"count": 25}, 2, 10) and not has_more({"count": 20}, 2, 10)
+    assert has_more([{}] * 10, 1, 10) and not has_more([{}] * 9, 1, 10)
+
+
+async def test_cursors_resolve_only_for_their_tenant():
+    cursors = PageCursors()
+    stream = cursors.open("k", {"page_size": 10}, _fetcher(30, 10, []))
+    cursor = PageCursors.cursor(stream.id, 2, skip=3)
+
+    assert cursor == f"{stream.id}.2.3"
+    assert cursors.resolve("k", cursor) == (stream, 2, 3)
+    assert cursors.resolve("k", PageCursors.cursor(stream.id, 2)) == (stream, 2, 0)
+    assert cursors.resolve("other", cursor) is None
+    assert cursors.resolve("k", "garbage") is None
+    assert cursors.resolve("k", f"{stream.id}.x") is None
+
+
+async def test_streams_expire_and_are_evicted(monkeypatch):
+    now = [time.monotonic()]
+    monkeypatch.setattr("mem0_mcp_server.pagination.time.monotonic", lambda: now[0])
+    cursors = PageCursors(max_streams=2, ttl=60)
+    first = cursors.open("k", {}, _fetcher(0, 10, []))
+    second = cursors.open("k", {}, _fetcher(0, 10, []))
+    cursors.open("k", {}, _fetcher(0, 10, []))
+
+    assert cursors.resolve("k", f"{first.id}.1") is None
+    now[0] += 61
+    assert cursors.resolve("k", f"{second.id}.1") is None
+
+
+async def test_prefetched_pages_are_served_from_the_buffer():
+    calls = []
+    cursors = PageCursors(depth=2)
+    stream = cursors.open("k", {}, _fetcher(50, 10, calls))
+
+    await cursors.page(stream, 1)
+    cursors.prefetch(stream, 1)
+    page = await cursors.page(stream, 2)
+
+    assert [item["id"] for item in page["results"]][:2] == ["10", "11"]
+    assert sorted(calls) == [1, 2, 3]
+    assert cursors.stats()["prefetch_hits"] == 1
+    cursors.prefetch(stream, 3)  # drops buffered pages at or before 3
+    await asyncio.sleep(0)
+    assert sorted(stream.pages) == [4, 5]
+
+
+async def test_collect_pages_stops_at_max_items_or_the_last_page():
+    calls = []
+    pages = [page async for page, _ in collect_pages(_fetcher(95, 10, calls), 10, 35)]
+    assert pages == [1, 2, 3, 4]
+
+    calls.clear()
+    pages = [page async for page, _ in collect_pages(_fetcher(25, 10, calls), 10, 1000)]
+    assert pages == [1, 2, 3] and sorted(calls) == [1, 2, 3]
@@ -0,0 +1,76 @@
+import pytest
+
+from mem0_mcp_server.ranking import fuse_results, merge_relations, rerank, result_items
+
+
+def _hits(*ids, score=0.5):
+    return [{"id": memory_id, "memory": memory_id, "score": score} for memory_id in ids]
+
+
+def test_rrf_floats_memories_found_by_several_queries():
+    fused = fuse_results([_hits("a", "b"), _hits("c", "b")], ["q1", "q2"], method="rrf")
+
+    assert [item["id"] for item in fused] == ["b", "a", "c"]
+    assert fused[0]["matched_queries"] == ["q1", "q2"]
+    assert fused[0]["score"] == round(1 / 62 + 1 / 62, 6)
+
+
+def test_max_keeps_each_memorys_best_score():
+    ranked = [
+        [{"id": "a", "score": 0.2}, {"id": "b", "score": 0.9}],
+        [{"id": "a", "score": 0.95}],
+    ]
+    fused = fuse_results(ranked, ["q1", "q2"], method="max", limit=1)
+
+    assert fused == [{"id": "a", "score": 0.95, "matched_queries": ["q1", "q2"]}]
+
+
+def test_unknown_fusion_methods_are_rejected():
+    with pytest.raises(ValueError, match="fusion must be one of"):
+        fuse_results([], [], method="sum")
+
+
+def test_relations_are_merged_without_duplicates():
+    relation = {"source": "alice", "relationship": "likes", "target": "tea"}
+    other = {"source": "bob", "relationship": "likes", "target": "tea"}
+
+    assert merge_relations([{"relations": [relation]}, {"relations": [relation, other]}, []]) == [
+        relation,
+        other,
+    ]
+
+
+def test_result_items_accepts_lists_and_wrapped_results():
+    assert result_items([{"id": 1}, "x"]) == [{"id": 1}]
+    assert result_items({"results": [{"id": 2}]}) == [{"id": 2}]
+    assert result_items({"message": "ok"}) == []
+
+
+def test_bm25_promotes_lexical_matches():
+    items = [
+        {"id": "vector", "memory": "likes hot drinks in winter", "score": 0.9},
+        {"id": "lexical", "memory": "drinks oolong tea every morning", "score": 0.8},
+    ]
+
+    assert rerank("oolong tea", items, 2, lexical_weight=0.0)[0]["id"] == "vector"
+    assert rerank("oolong tea", items, 2, lexical_weight=0.7)[0]["id"] == "lexical"
+
+
+def test_mmr_keeps_near_duplicates_from_crowding_out_the_rest():
+    items = [
+        {"id": "a", "memory": "alice likes green tea", "score": 0.9},
+        {"id": "a2", "memory": "alice likes green tea", "score": 0.89},
+        {"id": "b", "memory": "alice owns a bicycle", "score": 0.5},
+    ]
+
+    assert [item["id"] for item in rerank("alice", items, 2, diversity=0.0)] == ["a", "a2"]
+    assert [item["id"] for item in rerank("alice", items, 2, diversity=0.5)] == ["a", "b"]
+
+
+def test_rerank_limits_and_rescores():
+    items = _hits("a", "b", "c")
+    reranked = rerank("a", items, 2)
+
+    assert len(reranked) == 2
+    assert all(0.0 <= item["score"] <= 1.0 for item in reranked)
+    assert rerank("a", [], 3) == [] and rerank("a", items, 0) == []
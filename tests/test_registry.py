@@ -0,0 +1,82 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from mem0_mcp_server.registry import ClientRegistry
+
+pytestmark = pytest.mark.anyio
+
+
+class Factory:
+    def __init__(self, fail=False):
+        self.built = []
+        self.fail = fail
+
+    def __call__(self, api_key, pool):
+        if self.fail:
+            raise RuntimeError("invalid api key")
+        client = SimpleNamespace(api_key=api_key, async_client=httpx.AsyncClient())
+        self.built.append(client)
+        return client
+
+
+async def _run_blocking(func, *args):
+    await asyncio.sleep(0.01)  # let racing callers pile up behind the first build
+    return func(*args)
+
+
+async def _use(registry, api_key, hold=0.0):
+    async with registry.lease(api_key) as client:
+        await asyncio.sleep(hold)
+        return client
+
+
+async def test_each_key_is_built_once_even_when_first_calls_race():
+    factory = Factory()
+    registry = ClientRegistry(_run_blocking, factory=factory)
+
+    clients = await asyncio.gather(*(_use(registry, "k1") for _ in range(5)), _use(registry, "k2"))
+
+    assert len({id(client) for client in clients[:5]}) == 1
+    assert [client.api_key for client in factory.built] == ["k1", "k2"]
+    assert registry.stats()["builds"] == 2 and registry.stats()["live_clients"] == 2
+    await registry.aclose()
+
+
+async def test_failed_builds_reach_every_waiter_and_are_retried():
+    factory = Factory(fail=True)
+    registry = ClientRegistry(_run_blocking, factory=factory)
+
+    results = await asyncio.gather(*(_use(registry, "k") for _ in range(3)), return_exceptions=True)
+
+    assert [str(result) for result in results] == ["invalid api key"] * 3
+    assert registry.stats()["build_failures"] == 1 and registry.stats()["live_clients"] == 0
+    factory.fail = False
+    assert (await _use(registry, "k")).api_key == "k"
+
+
+async def test_evicted_clients_close_once_their_leases_end():
+    registry = ClientRegistry(_run_blocking, max_clients=1, factory=Factory())
+    async with registry.lease("k1") as first:
+        await _use(registry, "k2")
+        assert registry.stats()["evictions"] == 1
+        assert not first.async_client.is_closed  # still leased
+    assert first.async_client.is_closed
+
+    second = await _use(registry, "k1")
+    assert second is not first
+    await registry.aclose()
+    assert second.async_client.is_closed
+
+
+async def test_idle_clients_are_swept():
+    registry = ClientRegistry(_run_blocking, idle_ttl=0.01, factory=Factory())
+    idle = await _use(registry, "k1")
+    await asyncio.sleep(0.05)
+    await _use(registry, "k2")
+
+    assert idle.async_client.is_closed
+    assert registry.stats()["live_clients"] == 1
+    await registry.aclose()
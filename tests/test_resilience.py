@@ -0,0 +1,140 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from mem0_mcp_server import resilience
+from mem0_mcp_server.resilience import (
+    CircuitBreakers,
+    CircuitOpenError,
+    RetryPolicy,
+    hedged,
+    parse_timeouts,
+    retrying,
+    with_timeout,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+class Flaky:
+    """Fails with each of `errors` in turn, then answers `ok` after `delay` seconds."""
+
+    def __init__(self, *errors, delay=0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        await asyncio.sleep(self.delay)
+        return f"ok {self.calls}"
+
+
+def _transient(exc):
+    return isinstance(exc, httpx.TransportError)
+
+
+async def test_transient_failures_are_retried_until_attempts_run_out():
+    retried = []
+    call = Flaky(httpx.ConnectError("reset"), httpx.ConnectError("reset"))
+    policy = RetryPolicy(attempts=3, backoff=0.001)
+
+    assert await retrying(call, policy, _transient, lambda *args: retried.append(args[0])) == "ok 3"
+    assert retried == [1, 2]
+
+    call = Flaky(*[httpx.ConnectError("reset")] * 3)
+    with pytest.raises(httpx.ConnectError):
+        await retrying(call, policy, _transient)
+    assert call.calls == 3
+
+
+async def test_other_failures_are_not_retried():
+    call = Flaky(ValueError("bad request"))
+
+    with pytest.raises(ValueError):
+        await retrying(call, RetryPolicy(attempts=3), _transient)
+    assert call.calls == 1
+
+
+def test_backoff_is_capped_full_jitter():
+    policy = RetryPolicy(attempts=5, backoff=0.2, max_backoff=0.5)
+
+    assert all(0 <= policy.delay(attempt) <= 0.5 for attempt in range(1, 10) for _ in range(50))
+
+
+async def test_expired_timeouts_look_like_client_timeouts():
+    with pytest.raises(httpx.TimeoutException, match="within 0.01s"):
+        await with_timeout(asyncio.sleep(1), 0.01)
+    assert await with_timeout(asyncio.sleep(0, "done"), 0) == "done"
+    assert parse_timeouts("search_memories=5, get_memories=15,") == {
+        "search_memories": 5.0,
+        "get_memories": 15.0,
+    }
+    with pytest.raises(ValueError, match="tool=seconds"):
+        parse_timeouts("search_memories")
+
+
+async def test_a_slow_read_is_hedged_and_the_faster_copy_wins():
+    delays = [1.0, 0.0]
+    hedges = []
+
+    async def call():
+        await asyncio.sleep(delays.pop(0))
+        return len(delays)
+
+    assert await hedged(call, 0.01, lambda: hedges.append(True)) == 0
+    assert hedges == [True]
+
+
+async def test_a_fast_read_is_never_hedged_and_double_failures_raise():
+    hedges = []
+
+    assert await hedged(Flaky(), 0.5, lambda: hedges.append(True)) == "ok 1"
+    assert hedges == []
+
+    async def failing():
+        await asyncio.sleep(0.02)
+        raise httpx.ConnectError("down")
+
+    with pytest.raises(httpx.ConnectError):
+        await hedged(failing, 0.01)
+
+
+def test_breakers_open_per_tenant_and_let_one_probe_through(monkeypatch):
+    clock = SimpleNamespace(now=100.0)
+    monkeypatch.setattr(resilience, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    breakers = CircuitBreakers(threshold=2, cooldown=30.0)
+    breakers.record("a", ok=False)
+    breakers.record("a", ok=True)  # a success resets the count
+    breakers.record("a", ok=False)
+    breakers.check("a")
+    breakers.record("a", ok=False)
+
+    with pytest.raises(CircuitOpenError) as refused:
+        breakers.check("a")
+    assert refused.value.payload == {"error": "circuit_open", "retry_after": 30.0}
+    breakers.check("b")
+
+    clock.now += 30
+    breakers.check("a")  # the half-open probe
+    with pytest.raises(CircuitOpenError):
+        breakers.check("a")
+    breakers.record("a", ok=False)  # the probe failed: open for another cooldown
+    with pytest.raises(CircuitOpenError):
+        breakers.check("a")
+
+    clock.now += 30
+    breakers.check("a")
+    breakers.record("a", ok=True)
+    breakers.check("a")
+    assert breakers.stats() == {
+        "threshold": 2,
+        "cooldown": 30.0,
+        "open": 0,
+        "opened": 1,
+        "rejected": 3,
+    }
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import uuid
+
+import httpx
+import pytest
+
+from mem0_mcp_server import metrics, server, shaping
+from mem0_mcp_server.admission import AdmissionController, Limits
+from mem0_mcp_server.ingest import IngestQueue
+from mem0_mcp_server.scopes import tenant_of
+from mem0_mcp_server.warm import SessionWarmer
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def api_key(monkeypatch):
+    # a fresh key per test, so cached clients and breakers never leak between tests
+    key = f"m0-{uuid.uuid4().hex}"
+    monkeypatch.setattr(server, "ENV_API_KEY", key)
+    monkeypatch.setattr(server, "ENV_DEFAULT_USER_ID", "alice")
+    return key
+
+
+@pytest.fixture
+def ingest(monkeypatch):
+    # a queue per test, so its workers run on the test's event loop
+    queue = IngestQueue(
+        server._submit_add, retryable=server._is_transient, error_body=server._error_body
+    )
+    monkeypatch.setattr(server, "_INGEST", queue)
+    monkeypatch.setattr(server, "ENV_ASYNC_WRITES", True)
+    return queue
+
+
+async def _call(mcp, tool, **arguments):
+    content, _ = await mcp.call_tool(tool, arguments)
+    return json.loads(content[0].text)
+
+
+def _count(tool, outcome):
+    return metrics.TOOL_REQUESTS._values.get((tool, outcome), 0.0)
+
+
+async def test_throttled_calls_are_counted_without_orjson(monkeypatch, api_key):
+    monkeypatch.setattr(shaping, "orjson", None)
+    monkeypatch.setattr(server, "_ADMISSION", AdmissionController(Limits(rate=0.001, burst=1)))
+    mcp = server.create_server()
+    before = _count("list_sessions", "throttled")
+
+    assert "sessions" in await _call(mcp, "list_sessions")
+    refused = await _call(mcp, "list_sessions")
+
+    assert refused["error"] == "throttled"
+    assert _count("list_sessions", "throttled") == before + 1
+
+
+async def test_an_interrupted_import_resumes_without_adding_twice(
+    monkeypatch, tmp_path, api_key, fake_mem0
+):
+    monkeypatch.setattr(server, "ENV_TRANSFER_DIR", str(tmp_path))
+    monkeypatch.setattr(server, "ENV_IMPORT_BATCH", 3)
+    lines = [json.dumps({"memory": f"fact {i}", "user_id": "alice"}) for i in range(8)]
+    lines[1] = "not json"
+    (tmp_path / "in.ndjson").write_text("\n".join(lines) + "\n")
+    down = {"fact 4"}
+
+    def outage(request):
+        if request.method != "POST" or request.url.path != "/v1/memories/":
+            return None
+        if json.loads(request.content)["messages"][0]["content"] not in down:
+            return None
+        return httpx.Response(503, json={"detail": "unavailable"})
+
+    fake_mem0.fail = outage
+    mcp = server.create_server()
+
+    interrupted = await _call(mcp, "import_memories", file_name="in.ndjson")
+    assert interrupted["status"] == 503
+    assert "resume" in interrupted["detail"]
+    assert (tmp_path / "in.ndjson.import-checkpoint").exists()
+
+    down.clear()
+    summary = await _call(mcp, "import_memories", file_name="in.ndjson")
+
+    assert summary["resumed"] is True
+    assert (summary["imported"], summary["failed"]) == (7, 1)
+    assert summary["errors_file"] == "in.ndjson.import-errors"
+    assert sorted(fake_mem0.added) == sorted(f"fact {i}" for i in range(8) if i != 1)
+    assert not (tmp_path / "in.ndjson.import-checkpoint").exists()
+
+
+async def _settled(mcp, job_id):
+    for _ in range(100):
+        status = await _call(mcp, "get_add_status", job_id=job_id)
+        if status["status"] in ("succeeded", "failed"):
+            return status
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never settled")
+
+
+@pytest.mark.parametrize("upstream", [None, 400])
+async def test_queued_turns_count_as_ingested_only_once_stored(
+    monkeypatch, api_key, fake_mem0, ingest, upstream
+):
+    monkeypatch.setattr(server, "ENV_DELTA_MESSAGES", True)
+    if upstream is not None:
+        fake_mem0.fail = lambda request: (
+            httpx.Response(upstream, json={"detail": "rejected"})
+            if request.method == "POST" and request.url.path == "/v1/memories/"
+            else None
+        )
+    mcp = server.create_server()
+    history = [
+        {"role": "user", "content": "I like tea"},
+        {"role": "assistant", "content": "Noted"},
+    ]
+
+    queued = await _call(mcp, "add_memory", text="tea", messages=history)
+    settled = await _settled(mcp, queued["job_id"])
+    fake_mem0.fail = None
+    again = await _call(mcp, "add_memory", text="tea", messages=history)
+
+    if upstream is None:
+        assert settled["status"] == "succeeded"
+        assert again["status"] == "unchanged"
+    else:
+        assert settled["status"] == "failed"
+        assert again["status"] == "queued" and again["skipped_turns"] == 0
+        assert (await _settled(mcp, again["job_id"]))["status"] == "succeeded"
+
+
+@pytest.mark.parametrize(
+    ("tool", "arguments"),
+    [("delete_entities", {"agent_id": "bot"}), ("delete_all_memories", {"agent_id": "bot"})],
+)
+async def test_bulk_deletes_drop_the_reads_of_every_scope(
+    monkeypatch, api_key, fake_mem0, tool, arguments
+):
+    memory = {"id": "m1", "memory": "likes tea", "user_id": "alice", "agent_id": "bot"}
+    fake_mem0.memories["m1"] = memory
+    warmer = SessionWarmer(
+        tenant_of(api_key),
+        {},
+        frozenset({("user_id", "alice")}),
+        lambda: asyncio.sleep(0, {"results": [memory]}),
+        asyncio.Semaphore(1),
+    )
+    monkeypatch.setattr(server, "_WARMERS", {warmer})
+    mcp = server.create_server()
+
+    assert [item["id"] for item in (await _call(mcp, "get_memories"))["results"]] == ["m1"]
+    assert await warmer.current(1.0) is not None
+
+    await _call(mcp, tool, **arguments)
+
+    assert fake_mem0.memories == {}
+    assert (await _call(mcp, "get_memories"))["results"] == []
+    assert not warmer.contains("m1")
+
+
+async def test_filtered_deletes_list_their_targets_uncached(monkeypatch, api_key, fake_mem0):
+    monkeypatch.setattr(server, "ENV_PAGE_SIZE", 2)
+    monkeypatch.setattr(server, "ENV_BATCH_MAX_ITEMS", 3)
+    for i in range(5):
+        fake_mem0.memories[f"m{i}"] = {"id": f"m{i}", "memory": f"fact {i}", "user_id": "alice"}
+    streams = server._PAGE_CURSORS.stats()["streams"]
+    mcp = server.create_server()
+
+    listed = await _call(mcp, "delete_memories", filters={"user_id": "alice"}, dry_run=True)
+    again = await _call(mcp, "delete_memories", filters={"user_id": "alice"}, dry_run=True)
+
+    assert [match["id"] for match in listed["matches"]] == ["m0", "m1", "m2"]
+    assert "More than 3" in listed["detail"] and again == listed
+    assert fake_mem0.pages == [1, 2, 1, 2]  # nothing served from the cache or prefetched
+    assert server._PAGE_CURSORS.stats()["streams"] == streams
+
+    deleted = await _call(mcp, "delete_memories", filters={"user_id": "alice"})
+
+    assert (deleted["total"], deleted["succeeded"]) == (3, 3)
+    assert sorted(fake_mem0.memories) == ["m3", "m4"]
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+from mem0_mcp_server import sessions
+from mem0_mcp_server.sessions import SessionRegistry, SessionState
+
+
+class Session:
+    """Stands in for an MCP ServerSession: hashable and weakly referenceable."""
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(sessions, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def _state(clock, tenant="t", **config):
+    state = SessionState(tenant, "m0-secret", "alice", graph_default=False, config=config)
+    state.created = state.last_seen = clock.value
+    return state
+
+
+def test_states_are_kept_per_session_and_refreshed_on_use(clock):
+    registry = SessionRegistry()
+    first, second = Session(), Session()
+    registry.add(first, _state(clock, "t1"))
+    registry.add(second, _state(clock, "t2"))
+
+    clock.value += 5
+    assert registry.get(first).tenant == "t1"
+    assert registry.get(Session()) is None
+    assert [state.tenant for _, state in registry.items()] == ["t1", "t2"]
+    assert [session for session, _ in registry.items("t2")] == [second]
+
+
+def test_registry_stays_bounded_by_idle_time_and_size(clock):
+    registry = SessionRegistry(max_sessions=2, idle_ttl=60.0)
+    held = [Session() for _ in range(4)]
+    registry.add(held[0], _state(clock))
+    clock.value += 61
+    registry.add(held[1], _state(clock))  # sweeps the idle first session
+
+    clock.value += 1
+    registry.add(held[2], _state(clock))
+    clock.value += 1
+    registry.add(held[3], _state(clock))  # one over the cap: the least recently used goes
+
+    assert [registry.get(session) is not None for session in held] == [False, False, True, True]
+    assert registry.stats() == {"sessions": 2, "created": 4, "evicted": 2}
+
+
+def test_states_go_away_with_their_session(clock):
+    registry = SessionRegistry()
+    registry.add(Session(), _state(clock))
+
+    assert registry.stats()["sessions"] == 0
+
+
+def test_describe_reports_usage_without_secrets(clock):
+    state = _state(
+        clock, "0123456789abcdef", mem0_api_key="m0-secret", default_user_id="alice", graph=1
+    )
+    state.record("ok", 100, elapsed=0.5, upstream=0.4)
+    state.record("error", 20, elapsed=0.25, upstream=0.0)
+    clock.value += 2
+
+    assert state.flag("graph", False) is True and state.flag("compact", True) is True
+    assert state.describe() == {
+        "session": state.id,
+        "tenant": "01234567",
+        "age_seconds": 2.0,
+        "idle_seconds": 2.0,
+        "calls": 2,
+        "errors": 1,
+        "response_bytes": 120,
+        "busy_seconds": 0.75,
+        "upstream_seconds": 0.4,
+        "config": {"graph": 1},
+    }
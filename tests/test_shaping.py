@@ -0,0 +1,73 @@
+import copy
+
+import pytest
+
+from mem0_mcp_server import shaping
+from mem0_mcp_server.shaping import ResponseShape, dumps
+
+MEMORY = {
+    "id": "m1",
+    "memory": "likes green tea in the morning",
+    "score": 0.123456789,
+    "user_id": "alice",
+    "agent_id": None,
+    "categories": [],
+    "metadata": {},
+    "hash": "abc",
+    "stale": True,
+}
+
+
+def test_the_default_shape_returns_results_untouched():
+    result = {"results": [MEMORY]}
+
+    assert ResponseShape.build("search_memories").identity
+    assert ResponseShape.build("search_memories").apply(result) is result
+
+
+def test_fields_project_memories_but_keep_server_markers():
+    shape = ResponseShape.build("get_memories", fields=["memory"], max_chars=11)
+
+    assert shape.apply({"results": [MEMORY], "next_cursor": None}) == {
+        "results": [{"id": "m1", "memory": "likes green…", "truncated": True, "stale": True}],
+        "next_cursor": None,
+    }
+
+
+def test_compact_drops_empty_values_and_rounds_scores():
+    shape = ResponseShape.build("search_memories", compact=True)
+
+    assert shape.apply({"results": [MEMORY], "relations": []}) == {
+        "results": [
+            {
+                "id": "m1",
+                "memory": "likes green tea in the morning",
+                "score": 0.1235,
+                "stale": True,
+            }
+        ]
+    }
+    assert shape.apply({"id": "m1", "memory": "x", "hash": "h"}) == {"id": "m1", "memory": "x"}
+
+
+def test_shaping_never_mutates_the_cached_value():
+    result = {"results": [dict(MEMORY)]}
+    before = copy.deepcopy(result)
+
+    ResponseShape.build("search_memories", fields=["memory"], compact=True, max_chars=5).apply(
+        result
+    )
+
+    assert result == before
+
+
+@pytest.mark.parametrize("with_orjson", [True, False])
+def test_both_encoders_produce_the_same_text(monkeypatch, with_orjson):
+    if not with_orjson:
+        monkeypatch.setattr(shaping, "orjson", None)
+    elif shaping.orjson is None:
+        pytest.skip("orjson not installed")
+    value = {"b": "thé", "a": [1, 2**70, None]}
+
+    assert dumps(value, sort_keys=True) == '{"a":[1,1180591620717411303424,null],"b":"thé"}'
+    assert dumps({3: 0.5}) == '{"3":0.5}'
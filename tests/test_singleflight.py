@@ -0,0 +1,92 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+
+from mem0_mcp_server.singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_callers_share_one_call():
+    flight, calls, joins = SingleFlight(), [], []
+    release = asyncio.Event()
+
+    async def call():
+        calls.append(1)
+        await release.wait()
+        return {"results": []}
+
+    @contextmanager
+    def on_join():
+        joins.append("in")
+        yield
+        joins.append("out")
+
+    waiters = [asyncio.ensure_future(flight.do("key", call, on_join)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert len(calls) == 1
+    assert results[0] is results[1] is results[2]
+    assert joins == ["in", "in", "out", "out"]
+    assert flight.stats() == {
+        "in_flight": 0,
+        "leaders": 1,
+        "coalesced": 2,
+        "coalesced_ratio": 0.6667,
+    }
+
+
+async def test_later_calls_and_other_keys_start_their_own():
+    flight, calls = SingleFlight(), []
+
+    async def call():
+        calls.append(1)
+        return len(calls)
+
+    assert await flight.do("a", call) == 1
+    assert await flight.do("a", call) == 2
+    assert await asyncio.gather(flight.do("b", call), flight.do("c", call)) == [3, 4]
+
+
+async def test_cancelling_one_caller_does_not_cancel_the_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def call():
+        await release.wait()
+        return "done"
+
+    leader = asyncio.ensure_future(flight.do("key", call))
+    follower = asyncio.ensure_future(flight.do("key", call))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    assert await follower == "done"
+
+
+async def test_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        flight.do("key", call), flight.do("key", call), return_exceptions=True
+    )
+
+    assert [str(result) for result in results] == ["upstream down"] * 2
+
+
+def test_keys_depend_on_tenant_arguments_and_epoch():
+    make_key = SingleFlight.make_key
+    key = make_key("k", "search", (), {"query": "tea", "limit": 5}, 0)
+
+    assert key == make_key("k", "search", (), {"limit": 5, "query": "tea"}, 0)
+    assert key != make_key("k", "search", (), {"query": "tea", "limit": 5}, 1)
+    assert key != make_key("other", "search", (), {"query": "tea", "limit": 5}, 0)
+    assert "k:" not in key.split(":", 1)[1]
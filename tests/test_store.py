@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import pytest
+
+from mem0_mcp_server import store
+from mem0_mcp_server.store import LocalStore, simple_scope
+
+ALICE = frozenset({("user_id", "alice")})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(store, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+@pytest.fixture
+def local():
+    mirror = LocalStore(":memory:", max_age=300.0)
+    yield mirror
+    mirror.close()
+
+
+def _memory(memory_id, text, **scope):
+    return {"id": memory_id, "memory": text, "user_id": "alice", **scope}
+
+
+def test_only_plain_scope_conjunctions_are_served_locally():
+    assert simple_scope({"AND": [{"user_id": "alice"}, {"agent_id": "bot"}]}) == frozenset(
+        {("user_id", "alice"), ("agent_id", "bot")}
+    )
+    assert simple_scope({"AND": [{"user_id": "*"}]}) is None
+    assert simple_scope({"OR": [{"user_id": "alice"}]}) is None
+    assert simple_scope({"AND": [{"created_at": {"gte": "2024-01-01"}}]}) is None
+
+
+def test_rows_are_fresh_for_max_age_then_served_only_as_stale(clock, local):
+    local.record("t", [{**_memory("m1", "likes tea"), "score": 0.9}])
+
+    assert local.get("t", "m1") == _memory("m1", "likes tea")
+    assert local.get("other", "m1") is None
+
+    clock.value += 301
+    assert local.get("t", "m1") is None
+    assert local.get("t", "m1", allow_stale=True)["stale"] is True
+    assert (local.local_hits, local.stale_hits) == (1, 1)
+
+
+def test_rows_known_only_from_writes_are_never_served_fresh(clock, local):
+    local.record_add(
+        "t",
+        {"results": [{"id": "m1", "memory": "likes tea", "event": "ADD"}]},
+        {"user_id": "alice"},
+    )
+
+    assert local.get("t", "m1") is None
+    assert local.get("t", "m1", allow_stale=True)["memory"] == "likes tea"
+
+    local.record_add("t", {"results": [{"id": "m1", "event": "DELETE"}]}, {"user_id": "alice"})
+    assert local.get("t", "m1", allow_stale=True) is None
+
+
+def test_scopes_are_listed_locally_only_after_a_reconcile(clock, local):
+    local.record("t", [_memory("gone", "old"), _memory("m1", "likes tea")])
+    local.want_scope("t", ALICE)
+    assert local.list_scope("t", ALICE) is None
+
+    clock.value += 1
+    started_at = clock.value
+    clock.value += 1
+    local.record("t", [_memory("m2", "written mid-listing")])
+    local.replace_scope("t", ALICE, [_memory("m1", "likes tea")], started_at)
+
+    assert {m["id"] for m in local.list_scope("t", ALICE)} == {"m1", "m2"}
+    clock.value += 301
+    assert local.list_scope("t", ALICE) is None
+    assert {m["id"] for m in local.list_scope("t", ALICE, allow_stale=True)} == {"m1", "m2"}
+
+
+def test_reconcile_rotation_drops_scopes_nobody_lists(clock, local):
+    local.want_scope("t", ALICE)
+    assert local.scopes_due(60.0) == [("t", ALICE)]
+
+    local.replace_scope("t", ALICE, [], clock.value)
+    assert local.scopes_due(60.0) == []
+    clock.value += 61
+    assert local.scopes_due(60.0) == [("t", ALICE)]
+
+    clock.value += 3 * 300
+    assert local.scopes_due(60.0) == []
+    assert local.stats()["tracked_scopes"] == 0
+
+
+def test_outage_search_and_entities_skip_deleted_rows(clock, local):
+    local.record(
+        "t", [_memory("m1", "likes green tea"), _memory("m2", "plays chess", agent_id="bot")]
+    )
+    local.delete_scope("t", agent_id="bot")
+
+    found = local.search("t", "tea chess")
+    assert [(m["id"], m["stale"]) for m in found] == [("m1", True)]
+    assert local.entities("t") == [
+        {"type": "user", "name": "alice", "total_memories": 1, "stale": True}
+    ]
@@ -0,0 +1,111 @@
+import json
+
+from mem0_mcp_server.transfer import ExportFile, ImportProgress, read_records, unix_time
+
+REQUEST = {"filters": {"user_id": "alice"}, "page_size": 2}
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_export_writes_one_memory_per_line_and_removes_its_checkpoint(tmp_path):
+    export = ExportFile(tmp_path / "out" / "alice.ndjson", REQUEST)
+
+    assert export.open() is False
+    export.write_page(1, [{"id": "1"}, {"id": "2"}])
+    export.write_page(2, [{"id": "3"}])
+    export.finish()
+
+    assert _lines(export.path) == [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+    assert export.exported == 3 and not export.checkpoint.exists()
+
+
+def test_a_resumed_export_truncates_what_followed_the_checkpoint(tmp_path):
+    path = tmp_path / "alice.ndjson"
+    export = ExportFile(path, REQUEST)
+    export.open()
+    export.write_page(1, [{"id": "1"}, {"id": "2"}])
+    export.close()
+    with open(path, "ab") as torn:  # a page that was cut off before its checkpoint
+        torn.write(b'{"id": "3"}\n{"id": ')
+
+    resumed = ExportFile(path, REQUEST)
+    assert resumed.open() is True
+    assert (resumed.next_page, resumed.exported) == (2, 2)
+    resumed.write_page(2, [{"id": "3"}])
+    resumed.finish()
+
+    assert _lines(path) == [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+
+
+def test_exports_restart_for_another_request_or_without_resume(tmp_path):
+    path = tmp_path / "alice.ndjson"
+    export = ExportFile(path, REQUEST)
+    export.open()
+    export.write_page(1, [{"id": "1"}])
+    export.close()
+
+    other = ExportFile(path, {**REQUEST, "page_size": 5})
+    assert other.open() is False
+    other.close()
+    assert path.read_bytes() == b""
+
+    export = ExportFile(path, REQUEST)
+    export.open()
+    export.write_page(1, [{"id": "1"}])
+    export.close()
+    restarted = ExportFile(path, REQUEST)
+    assert restarted.open(resume=False) is False
+    assert restarted.next_page == 1
+    restarted.close()
+
+
+def test_import_progress_resumes_only_the_same_file(tmp_path):
+    path = tmp_path / "in.ndjson"
+    path.write_text('{"memory": "a"}\n{"memory": "b"}\n')
+    progress = ImportProgress(path)
+    progress.load()
+    progress.line, progress.done, progress.imported, progress.failed = 1, {3}, 2, 1
+    progress.save([{"line": 2, "error": "bad"}])
+
+    resumed = ImportProgress(path)
+    assert resumed.load() is True
+    assert (resumed.line, resumed.done, resumed.imported, resumed.failed) == (1, {3}, 2, 1)
+    assert _lines(resumed.errors) == [{"line": 2, "error": "bad"}]
+
+    assert ImportProgress(path).load(resume=False) is False
+    assert not resumed.errors.exists()
+
+    progress.save([{"line": 2, "error": "bad"}])
+    path.write_text('{"memory": "a"}\n')  # the file changed since
+    assert ImportProgress(path).load() is False
+
+
+def test_finished_imports_keep_the_errors_file_only_when_lines_failed(tmp_path):
+    path = tmp_path / "in.ndjson"
+    path.write_text('{"memory": "a"}\n')
+    progress = ImportProgress(path)
+    progress.load()
+    progress.failed = 1
+    progress.save([{"line": 1, "error": "bad"}])
+    progress.finish()
+
+    assert not progress.checkpoint.exists() and progress.errors.exists()
+    progress.failed = 0
+    progress.finish()
+    assert not progress.errors.exists()
+
+
+def test_read_records_skips_blank_and_handled_lines(tmp_path):
+    path = tmp_path / "in.ndjson"
+    path.write_text('{"memory": "a"}\n\nnot json\n{"memory": "b"}\n')
+
+    assert list(read_records(path)) == [(1, {"memory": "a"}), (3, None), (4, {"memory": "b"})]
+    assert list(read_records(path, start_line=3)) == [(4, {"memory": "b"})]
+
+
+def test_unix_time_parses_mem0_timestamps():
+    assert unix_time("1970-01-01T00:01:00Z") == 60
+    assert unix_time("1970-01-01T00:01:00+00:00") == 60
+    assert unix_time("yesterday") is None and unix_time(None) is None
@@ -0,0 +1,64 @@
+from mem0_mcp_server.versions import ScopeVersions
+
+ALICE = ("user_id", "alice")
+BOB = ("user_id", "bob")
+
+
+def test_bumps_change_only_the_written_scopes():
+    versions = ScopeVersions()
+    alice, bob = versions.version("t", ALICE), versions.version("t", BOB)
+    versions.bump("t", frozenset({ALICE}))
+
+    assert versions.version("t", ALICE) != alice
+    assert versions.version("t", BOB) == bob
+
+
+def test_tenant_bumps_change_every_scope_and_versions_never_repeat():
+    versions = ScopeVersions()
+    seen = {versions.version("t", ALICE)}
+    versions.bump("t", frozenset({ALICE}))
+    seen.add(versions.version("t", ALICE))
+    versions.bump("t")
+    seen.add(versions.version("t", ALICE))
+
+    assert len(seen) == 3
+    assert versions.version("t", BOB) not in (None, versions.version("other", BOB))
+    assert versions.version("t", BOB).split("-")[0] != ScopeVersions().version("t", BOB).split("-")[0]
+
+
+def test_folded_scopes_never_move_back():
+    versions = ScopeVersions(max_scopes=1)
+    versions.bump("t", frozenset({ALICE}))
+    alice = versions.version("t", ALICE)
+    versions.bump("t", frozenset({BOB}))  # folds ALICE into the tenant floor
+
+    assert int(versions.version("t", ALICE).split("-")[1]) >= int(alice.split("-")[1])
+    assert versions.stats()["scopes"] == 1
+
+
+class Session:
+    pass
+
+
+def test_subscribers_are_notified_of_their_scopes():
+    versions = ScopeVersions()
+    session = Session()
+    versions.subscribe(session, "t", ALICE, "mem0://users/alice/memories")
+
+    assert versions.bump("t", frozenset({BOB})) == []
+    assert versions.bump("other") == []
+    assert versions.bump("t", frozenset({ALICE})) == [(session, "mem0://users/alice/memories")]
+    assert versions.bump("t") == [(session, "mem0://users/alice/memories")]
+
+    versions.unsubscribe(session, "mem0://users/alice/memories")
+    assert versions.subscribed(session) == 0
+    assert versions.bump("t") == []
+
+
+def test_subscriptions_end_with_their_session():
+    versions = ScopeVersions()
+    session = Session()
+    versions.subscribe(session, "t", ALICE, "uri")
+    del session
+
+    assert versions.stats()["subscriptions"] == 0
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from mem0_mcp_server import warm
+from mem0_mcp_server.warm import SessionWarmer
+
+pytestmark = pytest.mark.anyio
+
+
+class Listing:
+    """Upstream listing whose fetches can be held open and counted."""
+
+    def __init__(self, *ids):
+        self.ids = list(ids)
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        ids = list(self.ids)
+        await self.release.wait()
+        return {"results": [{"id": memory_id, "memory": memory_id} for memory_id in ids]}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(warm, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def _warmer(fetch, **ages):
+    return SessionWarmer("t", {}, frozenset(), fetch, asyncio.Semaphore(1), **ages)
+
+
+async def test_the_snapshot_is_fetched_once_and_served_until_max_age(clock):
+    listing = Listing("m1")
+    warmer = _warmer(listing, refresh_after=60.0, max_age=600.0)
+    warmer.start()
+    warmer.start()
+
+    assert warmer.contains("m1") is False
+    assert (await warmer.current(1.0))["results"][0]["id"] == "m1"
+    assert warmer.memory("m1") == {"id": "m1", "memory": "m1"}
+    assert warmer.memory("m2") is None
+    assert listing.calls == 1
+
+    clock.value += 601
+    assert warmer.snapshot() is None
+    await warmer.aclose()
+
+
+async def test_an_aging_snapshot_is_served_while_it_refreshes(clock):
+    listing = Listing("m1")
+    warmer = _warmer(listing, refresh_after=60.0)
+    await warmer.current(1.0)
+    listing.ids = ["m1", "m2"]
+    listing.release.clear()
+
+    clock.value += 61
+    assert [m["id"] for m in warmer.snapshot()["results"]] == ["m1"]
+    listing.release.set()
+    await asyncio.sleep(0.01)
+
+    assert listing.calls == 2
+    assert warmer.contains("m2")
+    assert warmer.stats() == {"memories": 2, "fetches": 2, "hits": 2}
+    await warmer.aclose()
+
+
+async def test_a_fetch_started_before_a_write_is_discarded(clock):
+    listing = Listing("m1")
+    listing.release.clear()
+    warmer = _warmer(listing)
+    warmer.start()
+    await asyncio.sleep(0)
+
+    warmer.invalidate()  # a write lands while the listing is in flight
+    listing.release.set()
+    await asyncio.sleep(0.01)
+
+    assert warmer.contains("m1") is False
+    assert (await warmer.current(1.0))["results"][0]["id"] == "m1"
+    assert listing.calls == 2
+    await warmer.aclose()
+
+
+async def test_a_failed_prefetch_leaves_the_session_cold():
+    async def failing():
+        raise ConnectionError("unreachable")
+
+    warmer = _warmer(failing)
+
+    assert await warmer.current(1.0) is None
+    assert warmer.stats()["fetches"] == 0
+    await warmer.aclose()
+    warmer.start()
+    assert warmer.snapshot() is None